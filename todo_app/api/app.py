@@ -1,80 +1,158 @@
-from flask import Flask, request, jsonify
-import mysql.connector
-from mysql.connector import pooling, Error
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 from config import Config
+from repository import DuplicateError, create_repository
+from task_stats import PRIORITIES
+from export import FORMATS
+from passwords import HasherBusy, PasswordHasher
+from tokens import ACCESS, REFRESH, RevocationCache, TokenError, TokenSigner
+from werkzeug.http import http_date
+from datetime import date, datetime, timedelta
+import base64
+import gzip
+import json
 import os
+import secrets
+import threading
 
 load_dotenv()
 print("ENV DB_HOST:", os.getenv('DB_HOST'))
 
-app = Flask(__name__)
 
-# MySQL connection pooling setup
 
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST'),
-    'port': int(os.getenv('DB_PORT', 3306)),
-    'user': os.getenv('DB_USER'),
-    'password': os.getenv('DB_PASSWORD'),
-    'database': os.getenv('DB_NAME'),
-    'pool_name': "mypool",
-    'pool_size': 5,
-    'use_pure': True 
-}
+class ApiJSONProvider(DefaultJSONProvider):
+    """Serialize DATE columns as YYYY-MM-DD, the format the clients parse and send back."""
 
-# Connection Pool initialization
-db_pool = pooling.MySQLConnectionPool(**DB_CONFIG)
+    @staticmethod
+    def default(o):
+        if isinstance(o, date) and not isinstance(o, datetime):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
 
-if app.debug:
-    print("Connecting to DB as:", Config.DB_USER)
-    print("Using DB config:", DB_CONFIG)
 
+app = Flask(__name__)
+app.json = ApiJSONProvider(app)
 
+# Upper bound for a single page of GET /api/tasks
+MAX_PAGE_SIZE = 100
 
-def get_db_connection():
-    try:
-        return db_pool.get_connection()
-    except Error as e:
-        print(f"MySQL connection pool error: {e}")
-        return None
+# Upper bound on items in one /api/tasks/bulk request
+MAX_BULK_ITEMS = 500
+
+# Deleted-task tombstones are kept this long; older sync points get a full resync
+TOMBSTONE_RETENTION_DAYS = 30
+# How far /api/tasks/changes rewinds next_since to cover late-committing writes
+SYNC_OVERLAP_SECONDS = 5
+
+# JSON responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+# Storage backend picked by DB_BACKEND; routes only talk to the repository
+repo = create_repository(Config)
+
+if app.debug:
+    print("Using DB backend:", Config.DB_BACKEND)
+
+if not Config.AUTH_SECRET_KEY:
+    print("AUTH_SECRET_KEY is not set; session tokens will only be valid in this process")
+token_signer = TokenSigner(
+    Config.AUTH_SECRET_KEY or secrets.token_hex(32),
+    access_ttl=Config.ACCESS_TOKEN_TTL,
+    refresh_ttl=Config.REFRESH_TOKEN_TTL,
+)
+password_hasher = PasswordHasher(
+    Config.PASSWORD_ALGORITHM,
+    cost=Config.PASSWORD_COST,
+    workers=Config.PASSWORD_WORKERS,
+    max_pending=Config.PASSWORD_MAX_PENDING,
+    timeout=Config.PASSWORD_TIMEOUT,
+)
+revocations = RevocationCache(repo, sync_interval=Config.REVOCATION_SYNC_SECONDS)
+
+
+
+@app.after_request
+def gzip_response(response):
+    """Compress sizeable JSON bodies; task lists shrink several-fold."""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype != 'application/json'
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def handle_db_busy(e):
+    print(f"Database busy: {e}")
+    response = jsonify({'error': 'Server busy, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(Config.DB_POOL_RETRY_AFTER)
+    return response
+
+for busy_error in repo.busy_errors:
+    app.register_error_handler(busy_error, handle_db_busy)
+
+@app.errorhandler(HasherBusy)
+def handle_hasher_busy(e):
+    print(f"Password hashing queue full: {e}")
+    response = jsonify({'error': 'Server busy, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(Config.DB_POOL_RETRY_AFTER)
+    return response
+
+def handle_db_error(e):
+    print(f"Database error: {e}")
+    return jsonify({'error': 'DB connection failed'}), 500
+
+for db_error in repo.errors:
+    app.register_error_handler(db_error, handle_db_error)
 
 def initialize_db():
+    """Create or migrate the schema and purge expired rows; returns the schema version or None."""
     try:
-        conn = get_db_connection()
-        if conn:
-            cursor = conn.cursor()
-            # Ensure the database and tables are created once
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-            cursor.execute('''CREATE TABLE IF NOT EXISTS users (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(255),
-                email VARCHAR(255),
-                password VARCHAR(255),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
-
-            cursor.execute('''CREATE TABLE IF NOT EXISTS tasks (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT,
-                title VARCHAR(255),
-                description TEXT,
-                due_date VARCHAR(255),
-                priority VARCHAR(255),
-                completed BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )''')
-
-            conn.commit()
-            conn.close()
-    except Error as e:
+        return repo.initialize(timedelta(days=TOMBSTONE_RETENTION_DAYS))
+    except repo.errors + repo.busy_errors as e:
         print(f"DB Initialization error: {e}")
+    return None
+
+# Schema version reached by this process, None until bootstrap succeeds
+schema_version = None
+_bootstrap_lock = threading.Lock()
+
+def bootstrap_db():
+    """Run initialize_db once per process; request handlers never issue DDL."""
+    global schema_version
+    with _bootstrap_lock:
+        if schema_version is None:
+            schema_version = initialize_db()
+    return schema_version is not None
+
+@app.route('/api/health/live', methods=['GET'])
+def liveness():
+    return jsonify({'status': 'alive'}), 200
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness():
+    # Retries the bootstrap if the database was unreachable at startup
+    if not bootstrap_db():
+        return jsonify({'status': 'unavailable', 'error': 'Schema not initialized'}), 503
 
-@app.before_request
-def init_once():
-    initialize_db()
+    try:
+        repo.ping()
+    except repo.errors + repo.busy_errors as e:
+        return jsonify({'status': 'unavailable', 'error': str(e)}), 503
+    return jsonify({'status': 'ready', 'schema_version': schema_version}), 200
+
+@app.route('/api/health/pool', methods=['GET'])
+def pool_stats():
+    return jsonify(repo.pool_stats()), 200
 
 @app.route('/api/signup', methods=['POST'])
 def signup():
@@ -89,27 +167,12 @@ def signup():
     if password != confirm:
         return jsonify({'error': 'Passwords do not match'}), 400
 
-    hashed_password = generate_password_hash(password)
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'DB connection failed'}), 500
-
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT id FROM users WHERE username = %s OR email = %s", (username, email))
-    if cursor.fetchone():
-        conn.close()
-        return jsonify({'error': 'Username or email exists'}), 409
-
+    hashed_password = password_hasher.hash(password)
     try:
-        cursor.execute("INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
-                       (username, email, hashed_password))
-        conn.commit()
-        user_id = cursor.lastrowid
-        conn.close()
-        return jsonify({'id': user_id, 'username': username}), 201
-    except Error as e:
-        conn.close()
-        return jsonify({'error': str(e)}), 500
+        user_id = repo.create_user(username, email, hashed_password)
+    except DuplicateError:
+        return jsonify({'error': 'Username or email exists'}), 409
+    return jsonify({'id': user_id, 'username': username}), 201
 
 @app.route('/api/login', methods=['POST'])
 def login():
@@ -120,50 +183,241 @@ def login():
     if not username or not password:
         return jsonify({'error': 'Username and password required'}), 400
 
-    conn = get_db_connection()
-    if not conn:
-        return jsonify({'error': 'DB connection failed'}), 500
+    user = repo.find_login(username)
 
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-    user = cursor.fetchone()
-    conn.close()
-
-    if not user or not check_password_hash(user['password'], password):
+    if not user or not password_hasher.verify(password, user['password']):
         return jsonify({'error': 'Invalid credentials'}), 401
 
+    if password_hasher.needs_rehash(user['password']):
+        _rehash_password(user, password)
     user.pop('password')
-    return jsonify(user), 200
+    return jsonify({**user, **token_signer.issue_pair(_token_user(user))}), 200
+
+def _rehash_password(user, password):
+    """Store `password` under the configured algorithm and cost after a successful login.
+
+    Conditional on the old hash, so a password changed meanwhile is kept.
+    A failure only means the upgrade is retried on the next login.
+    """
+    try:
+        repo.replace_password_hash(user['id'], user['password'], password_hasher.hash(password))
+    except repo.errors + repo.busy_errors + (HasherBusy,) as e:
+        print(f"Password rehash for user {user['id']} failed: {e}")
+
+def _token_user(user):
+    """Profile fields embedded in session tokens, serialized as the JSON responses send them."""
+    created_at = user.get('created_at')
+    if isinstance(created_at, datetime):
+        created_at = http_date(created_at)
+    return {'id': user['id'], 'username': user['username'], 'email': user['email'],
+            'created_at': created_at}
+
+def _verified_claims(token, kind):
+    """Claims of a valid, unrevoked token, or None. Costs an HMAC, never a query."""
+    try:
+        claims = token_signer.verify(token, kind)
+    except TokenError:
+        return None
+    return None if revocations.is_revoked(claims) else claims
+
+def _bearer_token():
+    header = request.headers.get('Authorization', '')
+    return header[7:] if header.startswith('Bearer ') else None
+
+@app.route('/api/session', methods=['GET'])
+def get_session():
+    """The signed-in user, straight from the bearer access token."""
+    claims = _verified_claims(_bearer_token(), ACCESS)
+    if not claims:
+        return jsonify({'error': 'Invalid or expired token'}), 401
+    return jsonify({'user': claims['user'], 'expires_at': claims['exp']}), 200
+
+@app.route('/api/session/refresh', methods=['POST'])
+def refresh_session():
+    """Swap a refresh token for a new access token.
+
+    Used by the app at startup to restore a saved session: no password
+    check and no database read, just the HMAC and the revocation cache.
+    """
+    claims = _verified_claims((request.json or {}).get('refresh_token'), REFRESH)
+    if not claims:
+        return jsonify({'error': 'Invalid or expired token'}), 401
+    return jsonify({
+        'user': claims['user'],
+        'access_token': token_signer.issue(claims['user'], ACCESS),
+        'expires_in': token_signer.ttls[ACCESS],
+    }), 200
+
+@app.route('/api/session', methods=['DELETE'])
+def revoke_session():
+    """Log out: revoke the bearer access token and the refresh token in the body."""
+    revoked = 0
+    for token, kind in ((_bearer_token(), ACCESS), ((request.json or {}).get('refresh_token'), REFRESH)):
+        claims = _verified_claims(token, kind)
+        if claims:
+            revocations.revoke(claims)
+            revoked += 1
+    return jsonify({'revoked': revoked}), 200
 
 @app.route('/api/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT id, username, email, created_at FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-    conn.close()
-
+    user = repo.get_user(user_id)
     return jsonify(user or {'error': 'User not found'}), 200 if user else 404
 
+@app.route('/api/users/<int:user_id>/stats', methods=['GET'])
+def get_user_stats(user_id):
+    """Task totals for the profile screen.
+
+    On MySQL these are read from the user's user_task_stats counters,
+    maintained by every task write (see task_stats.py), so at most one row
+    per priority is read however many tasks the user has.
+    """
+    return jsonify(repo.user_stats(user_id)), 200
+
+def _parse_completed(value):
+    """Accept the 0/1 and true/false spellings the clients send for `completed`.
+
+    Query strings carry them as text, JSON bodies as booleans or numbers.
+    """
+    spelling = str(value).lower()
+    if spelling in ('1', 'true'):
+        return 1
+    if spelling in ('0', 'false'):
+        return 0
+    raise ValueError(f"Invalid completed value: {value}")
+
+def _parse_due_date(value):
+    """A YYYY-MM-DD `due_date` as a date; '' and null mean no due date."""
+    if value in (None, ''):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid due_date, expected YYYY-MM-DD: {value}")
+
+def _encode_cursor(task):
+    """Opaque keyset cursor pointing just past `task` in (created_at, id) order."""
+    created_at = task['created_at']
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, task['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
 @app.route('/api/tasks', methods=['GET'])
 def get_tasks():
+    """List a user's tasks.
+
+    Without `limit` the full list is returned as before. With `limit` (and
+    optionally the `cursor` from a previous page) one page is returned as
+    `{'tasks': [...], 'next_cursor': ...}`, walking (created_at, id) with a
+    keyset predicate so each page costs the same no matter how deep it is.
+    """
     user_id = request.args.get('user_id')
     completed = request.args.get('completed')
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
 
     if not user_id:
         return jsonify({'error': 'User ID required'}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    try:
+        completed = _parse_completed(completed) if completed is not None else None
+        after = _decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # Fetch one extra row to learn whether another page exists.
+    tasks = repo.list_tasks(user_id, completed, after, None if limit is None else limit + 1)
+
+    if limit is None:
+        return jsonify(tasks), 200
+
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = _encode_cursor(tasks[-1])
+    return jsonify({'tasks': tasks, 'next_cursor': next_cursor}), 200
+
+@app.route('/api/tasks/changes', methods=['GET'])
+def get_task_changes():
+    """Tasks created or updated, and ids deleted, since a previous sync.
+
+    `since` is the `next_since` returned by the previous call. Without it, or
+    when it predates the tombstone retention window, every task is returned
+    with `full_resync: true` and the client should replace its copy.
+    `next_since` lags the server clock by SYNC_OVERLAP_SECONDS so rows from
+    transactions that commit late are sent again rather than missed; merging
+    a change twice is harmless.
+    """
+    user_id = request.args.get('user_id', type=int)
+    since = request.args.get('since')
+    if not user_id:
+        return jsonify({'error': 'User ID required'}), 400
+    try:
+        since = datetime.fromisoformat(since) if since else None
+    except ValueError:
+        return jsonify({'error': 'Invalid since timestamp'}), 400
+
+    now, tasks, deleted, full_resync = repo.task_changes(
+        user_id, since, timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    )
+
+    return jsonify({
+        'tasks': tasks,
+        'deleted': deleted,
+        'full_resync': full_resync,
+        'next_since': (now - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+    }), 200
+
+@app.route('/api/tasks/export', methods=['GET'])
+def export_tasks():
+    """Stream all of a user's tasks as NDJSON (default), a JSON array or CSV.
+
+    Rows are read from an open cursor in batches and encoded as they arrive,
+    so memory stays flat however many tasks the user has. The query runs
+    before the response starts, so pool and query errors still get proper
+    status codes; the connection is held until the stream ends.
+    """
+    user_id = request.args.get('user_id')
+    completed = request.args.get('completed')
+    export_format = request.args.get('format', 'ndjson')
 
-    if completed is not None:
-        cursor.execute("SELECT * FROM tasks WHERE user_id = %s AND completed = %s", (user_id, int(completed)))
-    else:
-        cursor.execute("SELECT * FROM tasks WHERE user_id = %s", (user_id,))
+    if not user_id:
+        return jsonify({'error': 'User ID required'}), 400
+    if export_format not in FORMATS:
+        return jsonify({'error': f"Format must be one of {', '.join(FORMATS)}"}), 400
 
-    tasks = cursor.fetchall()
-    conn.close()
-    return jsonify(tasks), 200
+    if completed is not None:
+        try:
+            completed = _parse_completed(completed)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    mimetype, extension, encode = FORMATS[export_format]
+    rows = repo.export_tasks(user_id, completed)
+
+    def generate():
+        try:
+            yield from encode(rows, app.json.dumps)
+        finally:
+            rows.close()
+
+    response = Response(generate(), mimetype=mimetype)
+    # A generator that never starts (HEAD, or a client gone before the first
+    # chunk) is closed without running its finally; this releases the rows anyway
+    response.call_on_close(rows.close)
+    response.headers['Content-Disposition'] = f'attachment; filename="tasks.{extension}"'
+    return response
 
 @app.route('/api/tasks', methods=['POST'])
 def add_task():
@@ -171,78 +425,69 @@ def add_task():
     required_fields = ['user_id', 'title']
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'User ID and title required'}), 400
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(""" 
-        INSERT INTO tasks (user_id, title, description, due_date, priority, completed)
-        VALUES (%s, %s, %s, %s, %s, %s)
-    """, (
-        data['user_id'], data['title'], data.get('description'),
-        data.get('due_date'), data.get('priority', 'Low'), data.get('completed', 0)
-    ))
-
-    conn.commit()
-    task_id = cursor.lastrowid
-    cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-    task = cursor.fetchone()
-    conn.close()
-
+    if data.get('priority', 'Low') not in PRIORITIES:
+        return jsonify({'error': 'Invalid priority'}), 400
+    try:
+        due_date = _parse_due_date(data.get('due_date'))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'field': 'due_date'}), 400
+    try:
+        completed = _parse_completed(data.get('completed', 0))
+    except ValueError as e:
+        return jsonify({'error': str(e), 'field': 'completed'}), 400
+
+    task = repo.create_task(data['user_id'], {
+        'title': data['title'],
+        'description': data.get('description'),
+        'due_date': due_date,
+        'priority': data.get('priority', 'Low'),
+        'completed': completed,
+    })
     return jsonify(task), 201
 
 @app.route('/api/tasks/<int:task_id>', methods=['GET'])
 def get_task(task_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-    task = cursor.fetchone()
-    conn.close()
+    task = repo.get_task(task_id)
     return jsonify(task or {'error': 'Task not found'}), 200 if task else 404
 
+def _request_user_id(data=None):
+    """Owner id sent with a mutation, as a query parameter or in the JSON body."""
+    user_id = request.args.get('user_id', type=int)
+    if user_id is None and data:
+        user_id = data.get('user_id')
+    return user_id
+
 @app.route('/api/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
     data = request.json
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-    if not cursor.fetchone():
-        conn.close()
-        return jsonify({'error': 'Task not found'}), 404
-
-    updates, params = [], []
-    for field in ['title', 'description', 'due_date', 'priority', 'completed']:
-        if field in data:
-            updates.append(f"{field} = %s")
-            params.append(data[field])
-
-    if not updates:
-        conn.close()
+    if 'priority' in data and data['priority'] not in PRIORITIES:
+        return jsonify({'error': 'Invalid priority'}), 400
+
+    fields = {field: data[field] for field in ['title', 'description', 'priority'] if field in data}
+    if 'completed' in data:
+        try:
+            fields['completed'] = _parse_completed(data['completed'])
+        except ValueError as e:
+            return jsonify({'error': str(e), 'field': 'completed'}), 400
+    if 'due_date' in data:
+        # The edit screens send '' for "no due date"; DATE columns need NULL
+        try:
+            fields['due_date'] = _parse_due_date(data['due_date'])
+        except ValueError as e:
+            return jsonify({'error': str(e), 'field': 'due_date'}), 400
+
+    if not fields:
         return jsonify({'error': 'No fields to update'}), 400
 
-    params.append(task_id)
-    cursor.execute(f"UPDATE tasks SET {', '.join(updates)} WHERE id = %s", params)
-    conn.commit()
-
-    cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-    updated_task = cursor.fetchone()
-    conn.close()
+    updated_task = repo.update_task(task_id, _request_user_id(data), fields)
+    if updated_task is None:
+        return jsonify({'error': 'Task not found'}), 404
     return jsonify(updated_task), 200
 
 @app.route('/api/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM tasks WHERE id = %s", (task_id,))
-    if not cursor.fetchone():
-        conn.close()
+    if not repo.delete_task(task_id, _request_user_id()):
         return jsonify({'error': 'Task not found'}), 404
-
-    cursor.execute("DELETE FROM tasks WHERE id = %s", (task_id,))
-    conn.commit()
-    conn.close()
     return jsonify({'message': 'Task deleted'}), 200
 
 @app.route('/api/tasks/completion/<int:task_id>', methods=['PATCH'])
@@ -250,20 +495,106 @@ def update_task_completion(task_id):
     completed = request.json.get('completed')
     if completed is None:
         return jsonify({'error': 'Completed status required'}), 400
+    try:
+        completed = _parse_completed(completed)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-    if not cursor.fetchone():
-        conn.close()
+    if not repo.set_completion(task_id, _request_user_id(request.json), completed):
         return jsonify({'error': 'Task not found'}), 404
+    # Only `completed` changed, so echo it back instead of re-reading the row
+    return jsonify({'id': task_id, 'completed': completed}), 200
 
-    cursor.execute("UPDATE tasks SET completed = %s WHERE id = %s", (int(completed), task_id))
-    conn.commit()
-    cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-    task = cursor.fetchone()
-    conn.close()
-    return jsonify(task), 200
+def _bulk_payload(key):
+    """Validate a bulk request body; returns (user_id, items, error response)."""
+    data = request.json or {}
+    user_id, items = data.get('user_id'), data.get(key)
+    if not user_id:
+        return None, None, (jsonify({'error': 'User ID required'}), 400)
+    if not isinstance(items, list) or not items:
+        return None, None, (jsonify({'error': f"'{key}' must be a non-empty list"}), 400)
+    if len(items) > MAX_BULK_ITEMS:
+        return None, None, (jsonify({'error': f"At most {MAX_BULK_ITEMS} items per request"}), 400)
+    return user_id, items, None
+
+@app.route('/api/tasks/bulk', methods=['POST'])
+def bulk_create_tasks():
+    """Create many tasks in one transaction.
+
+    Body: {'user_id': 1, 'tasks': [{'title': ..., 'priority': ...}, ...]}.
+    Invalid items are reported and skipped; results follow request order.
+    """
+    user_id, items, error = _bulk_payload('tasks')
+    if error:
+        return error
+
+    results, rows, row_indexes = [None] * len(items), [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get('title'):
+            results[index] = {'index': index, 'status': 'error', 'error': 'Title required'}
+        elif item.get('priority', 'Low') not in PRIORITIES:
+            results[index] = {'index': index, 'status': 'error', 'error': 'Invalid priority'}
+        else:
+            try:
+                due_date = _parse_due_date(item.get('due_date'))
+            except ValueError as e:
+                results[index] = {'index': index, 'status': 'error', 'error': str(e), 'field': 'due_date'}
+                continue
+            rows.append((item['title'], item.get('description'), due_date,
+                         item.get('priority', 'Low'), int(bool(item.get('completed', 0)))))
+            row_indexes.append(index)
+
+    if rows:
+        task_ids = repo.create_tasks(user_id, rows)
+        for index, task_id in zip(row_indexes, task_ids):
+            results[index] = {'index': index, 'status': 'created', 'id': task_id}
+
+    return jsonify({'results': results}), 200
+
+@app.route('/api/tasks/bulk/completion', methods=['PATCH'])
+def bulk_update_task_completion():
+    """Set completion on many tasks in one transaction.
+
+    Body: {'user_id': 1, 'updates': [{'id': 3, 'completed': true}, ...]}.
+    """
+    user_id, items, error = _bulk_payload('updates')
+    if error:
+        return error
+    if not all(isinstance(item, dict) and isinstance(item.get('id'), int) and 'completed' in item
+               for item in items):
+        return jsonify({'error': "Each update needs an integer 'id' and 'completed'"}), 400
+
+    ids_by_value = {0: [], 1: []}
+    for item in items:
+        ids_by_value[int(bool(item['completed']))].append(item['id'])
+    found = repo.set_completions(user_id, ids_by_value)
+
+    results = [
+        {'id': item['id'], 'status': 'updated', 'completed': int(bool(item['completed']))}
+        if item['id'] in found else {'id': item['id'], 'status': 'not_found'}
+        for item in items
+    ]
+    return jsonify({'results': results}), 200
+
+@app.route('/api/tasks/bulk', methods=['DELETE'])
+def bulk_delete_tasks():
+    """Delete many tasks in one transaction. Body: {'user_id': 1, 'ids': [3, 4]}."""
+    user_id, task_ids, error = _bulk_payload('ids')
+    if error:
+        return error
+    if not all(isinstance(task_id, int) for task_id in task_ids):
+        return jsonify({'error': "'ids' must be integers"}), 400
+
+    found = repo.delete_tasks(user_id, task_ids)
+
+    results = [
+        {'id': task_id, 'status': 'deleted' if task_id in found else 'not_found'}
+        for task_id in task_ids
+    ]
+    return jsonify({'results': results}), 200
+
+# Bootstrap at import so each gunicorn worker migrates before serving traffic
+bootstrap_db()
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -3,8 +3,46 @@ from dotenv import load_dotenv
 load_dotenv()  # Load .env variables into the environment
 
 class Config:
+    # Storage backend: 'mysql' (the server configured below) or 'sqlite', an
+    # embedded database file at SQLITE_PATH. SQLITE_BUSY_TIMEOUT is how many
+    # seconds a write waits for the file's write lock before getting a 503.
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'todo_app.db')
+    SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', '5'))
+
     DB_HOST = os.getenv('DB_HOST', None)
     DB_PORT = os.getenv('DB_PORT', '3306')
     DB_USER = os.getenv('DB_USER', None)
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'todo_app')
+
+    # Connection pool: idle connections kept, extra connections allowed under
+    # load, seconds a request waits for a connection before getting a 503,
+    # seconds after which a connection is replaced, and seconds idle after
+    # which a connection is pinged (and replaced if dropped) before reuse.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', '5'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+    DB_POOL_PING_AFTER = float(os.getenv('DB_POOL_PING_AFTER', '30'))
+    DB_POOL_RETRY_AFTER = int(os.getenv('DB_POOL_RETRY_AFTER', '1'))
+    # Use the C extension unless DB_USE_PURE=true
+    DB_USE_PURE = os.getenv('DB_USE_PURE', 'False').lower() == 'true'
+
+    # Session tokens: HMAC key shared by every worker (set it in production;
+    # a random per-process key invalidates tokens on restart), lifetimes in
+    # seconds, and how often each worker pulls new revocations.
+    AUTH_SECRET_KEY = os.getenv('AUTH_SECRET_KEY', None)
+    ACCESS_TOKEN_TTL = int(os.getenv('ACCESS_TOKEN_TTL', '900'))
+    REFRESH_TOKEN_TTL = int(os.getenv('REFRESH_TOKEN_TTL', str(30 * 24 * 3600)))
+    REVOCATION_SYNC_SECONDS = float(os.getenv('REVOCATION_SYNC_SECONDS', '5'))
+
+    # Password hashing: scrypt, pbkdf2 or bcrypt; cost is the algorithm's work
+    # factor (blank for its default). Hashes run in PASSWORD_WORKERS processes
+    # per API worker (0 hashes inline), with at most PASSWORD_MAX_PENDING
+    # queued before signups and logins get a 503.
+    PASSWORD_ALGORITHM = os.getenv('PASSWORD_ALGORITHM', 'scrypt')
+    PASSWORD_COST = int(os.getenv('PASSWORD_COST') or 0) or None
+    PASSWORD_WORKERS = int(os.getenv('PASSWORD_WORKERS', '2'))
+    PASSWORD_MAX_PENDING = int(os.getenv('PASSWORD_MAX_PENDING', '32'))
+    PASSWORD_TIMEOUT = float(os.getenv('PASSWORD_TIMEOUT', '10'))
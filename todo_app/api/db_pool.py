@@ -0,0 +1,206 @@
+"""Bounded, instrumented MySQL connection pool for the Todo API.
+
+`mysql.connector.pooling` fails immediately when every connection is checked
+out and cannot grow under bursts. This pool keeps up to `size` idle
+connections, lets up to `max_overflow` extra connections exist while busy, and
+makes callers wait at most `timeout` seconds for a free slot before raising
+`PoolTimeout`. Connections older than `recycle` seconds are replaced on
+checkout so the server's `wait_timeout` never closes one under us, and ones
+idle for more than `ping_after` seconds are pinged first: a connection the
+server dropped (restart, failover, network blip) is replaced by a fresh one
+instead of failing the request.
+
+Each connection keeps the statements prepared on it through
+`execute_prepared`, so a hot query is parsed once per connection rather
+than once per request. A connection is used by one thread at a time, so
+its cursors are never shared between threads.
+"""
+import queue
+import threading
+import time
+
+import mysql.connector
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+    pass
+
+
+class PooledConnection:
+    """Proxy for a checked-out connection; `close()` returns it to the pool."""
+
+    def __init__(self, pool, raw, created, statements):
+        self._pool = pool
+        self._raw = raw
+        self._created = created
+        self._statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def execute_prepared(self, sql, params=()):
+        """Execute `sql` as a server-side prepared statement and return its dict cursor.
+
+        The statement is prepared the first time this connection sees `sql`
+        and re-executed after that. Meant for fixed query texts; fetch every
+        row before the next query on this connection.
+        """
+        try:
+            cursor, sql = self._statements[sql]
+        except KeyError:
+            cursor = self._raw.cursor(prepared=True, dictionary=True)
+            self._statements[sql] = (cursor, sql)
+            with self._pool._lock:
+                self._pool._stats['statements_prepared'] += 1
+        # The cursor re-prepares unless handed the very string object it last ran
+        cursor.execute(sql, params)
+        return cursor
+
+    def close(self):
+        if self._raw is not None:
+            self._pool._release(self._raw, self._created, self._statements)
+            self._raw = None
+
+    def discard(self):
+        """Close the connection instead of returning it to the pool.
+
+        For connections that must not be reused as they are, e.g. with an
+        unbuffered result left unread.
+        """
+        if self._raw is not None:
+            self._pool._release(self._raw, self._created, self._statements, keep=False)
+            self._raw = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    def __init__(self, size=5, max_overflow=0, timeout=5.0, recycle=3600, ping_after=30, **connect_args):
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+        self.connect_args = connect_args
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size + max_overflow)
+        self._lock = threading.Lock()
+        self._stats = {
+            'in_use': 0,
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'checkout_failures': 0,
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'connections_reconnected': 0,
+            'statements_prepared': 0,
+        }
+
+    def connection(self):
+        """Check out a connection, blocking up to `timeout` seconds for a free slot."""
+        if not self._slots.acquire(blocking=False):
+            start = time.monotonic()
+            acquired = self._slots.acquire(timeout=self.timeout)
+            waited = time.monotonic() - start
+            with self._lock:
+                self._stats['waits'] += 1
+                self._stats['wait_time_total'] += waited
+                if not acquired:
+                    self._stats['checkout_failures'] += 1
+            if not acquired:
+                raise PoolTimeout(f"No database connection available after {self.timeout}s")
+
+        try:
+            raw, created, statements = self._checkout_raw()
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._stats['checkout_failures'] += 1
+            raise
+
+        with self._lock:
+            self._stats['in_use'] += 1
+            self._stats['checkouts'] += 1
+        return PooledConnection(self, raw, created, statements)
+
+    def _checkout_raw(self):
+        while True:
+            try:
+                raw, created, released, statements = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            now = time.monotonic()
+            if self.recycle and now - created > self.recycle:
+                self._discard(raw)
+                with self._lock:
+                    self._stats['connections_recycled'] += 1
+                continue
+            if self.ping_after is not None and now - released > self.ping_after:
+                try:
+                    raw.ping()
+                except mysql.connector.Error:
+                    # Dropped while idle; its prepared statements went with it
+                    self._discard(raw)
+                    with self._lock:
+                        self._stats['connections_reconnected'] += 1
+                    continue
+            return raw, created, statements
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self.connect_args)
+        with self._lock:
+            self._stats['connections_created'] += 1
+        return raw, time.monotonic(), {}
+
+    def _release(self, raw, created, statements, keep=True):
+        try:
+            if not keep:
+                self._discard(raw)
+                return
+            if raw.in_transaction:
+                raw.rollback()
+            # Overflow connections are closed instead of kept idle
+            if self._idle.qsize() < self.size:
+                self._idle.put((raw, created, time.monotonic(), statements))
+            else:
+                self._discard(raw)
+        except mysql.connector.Error:
+            self._discard(raw)
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._slots.release()
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except mysql.connector.Error:
+            pass
+
+    def close(self):
+        """Close the idle connections; checked-out ones close when released."""
+        self.size = 0
+        while True:
+            try:
+                raw = self._idle.get_nowait()[0]
+            except queue.Empty:
+                return
+            self._discard(raw)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'size': self.size,
+            'max_overflow': self.max_overflow,
+            'timeout': self.timeout,
+            'idle': self._idle.qsize(),
+            'avg_wait_time': stats['wait_time_total'] / stats['waits'] if stats['waits'] else 0.0,
+        })
+        return stats
@@ -0,0 +1,87 @@
+"""Streaming encoders for task exports.
+
+Each encoder turns an iterator of row dicts into an iterator of text chunks,
+so an export is written out while rows are still arriving from the
+database. Only one fetch batch and one output chunk are held in memory,
+however many tasks are exported.
+"""
+import csv
+
+# Rows pulled from the cursor per fetchmany() call
+FETCH_BATCH_SIZE = 500
+# Encoded output is buffered up to about this many characters per chunk
+CHUNK_SIZE = 64 * 1024
+
+# Column order of CSV exports
+CSV_COLUMNS = ('id', 'title', 'description', 'due_date', 'priority', 'completed', 'created_at', 'updated_at')
+
+
+def iter_rows(cursor, batch_size=FETCH_BATCH_SIZE):
+    """Rows of an executed, unbuffered cursor, fetched `batch_size` at a time."""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def _chunked(pieces, chunk_size=CHUNK_SIZE):
+    """Join small strings into chunks of about `chunk_size` characters."""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def encode_ndjson(rows, dumps):
+    """One JSON object per line."""
+    return _chunked(dumps(row) + '\n' for row in rows)
+
+
+def encode_json(rows, dumps):
+    """A JSON array, written element by element."""
+    def pieces():
+        yield '['
+        for index, row in enumerate(rows):
+            yield (',' if index else '') + dumps(row)
+        yield ']\n'
+    return _chunked(pieces())
+
+
+class _LineBuffer:
+    """File-like target for csv.writer that hands each written line back."""
+
+    def write(self, line):
+        return line
+
+
+def encode_csv(rows, dumps=None):
+    """A header line, then one line per row in CSV_COLUMNS order."""
+    writer = csv.writer(_LineBuffer())
+
+    def pieces():
+        yield writer.writerow(CSV_COLUMNS)
+        for row in rows:
+            yield writer.writerow([_csv_value(row.get(column)) for column in CSV_COLUMNS])
+    return _chunked(pieces())
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+# format name -> (mimetype, file extension, encoder)
+FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson', encode_ndjson),
+    'json': ('application/json', 'json', encode_json),
+    'csv': ('text/csv', 'csv', encode_csv),
+}
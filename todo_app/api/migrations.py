@@ -0,0 +1,253 @@
+"""Versioned schema migrations for the Todo API database.
+
+Every migration is a numbered list of statements. `run_migrations` applies the
+ones newer than the version recorded in `schema_migrations`, in order, and
+records each version as soon as its statements succeed. MySQL commits DDL
+implicitly, so a migration that fails halfway must be fixed forward by hand;
+keep each one small.
+
+`run_migrations_locked` wraps the runner in a MySQL named lock so several
+gunicorn workers starting at once migrate exactly once between them.
+
+Run `python migrations.py` to migrate the database configured in `.env`, or
+`python migrations.py --explain` to check that the hot task queries are served
+by the composite indexes.
+"""
+from mysql.connector import Error
+
+MIGRATIONS = [
+    (1, "initial users and tasks tables", [
+        '''CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(255),
+            email VARCHAR(255),
+            password VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''',
+        '''CREATE TABLE IF NOT EXISTS tasks (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT,
+            title VARCHAR(255),
+            description TEXT,
+            due_date VARCHAR(255),
+            priority VARCHAR(255),
+            completed BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )''',
+    ]),
+    (2, "typed due_date and priority columns", [
+        # Older databases created by services/database.py stored priority as INT 0-3.
+        "ALTER TABLE tasks MODIFY priority VARCHAR(255)",
+        "UPDATE tasks SET priority = ELT(priority + 1, 'Low', 'Medium', 'High', 'Urgent') "
+        "WHERE priority IN ('0', '1', '2', '3')",
+        "UPDATE tasks SET priority = 'Low' "
+        "WHERE priority IS NULL OR priority NOT IN ('Low', 'Medium', 'High', 'Urgent')",
+        "ALTER TABLE tasks MODIFY priority ENUM('Low', 'Medium', 'High', 'Urgent') NOT NULL DEFAULT 'Low'",
+        "UPDATE tasks SET due_date = NULL WHERE due_date NOT REGEXP '^[0-9]{4}-[0-9]{2}-[0-9]{2}$'",
+        "ALTER TABLE tasks MODIFY due_date DATE NULL",
+    ]),
+    (3, "composite indexes for task list queries", [
+        "CREATE INDEX idx_tasks_user_completed_due ON tasks (user_id, completed, due_date)",
+        "CREATE INDEX idx_tasks_user_created ON tasks (user_id, created_at)",
+    ]),
+    (4, "updated_at row versions and delete tombstones for delta sync", [
+        "ALTER TABLE tasks ADD COLUMN updated_at TIMESTAMP(6) NOT NULL "
+        "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)",
+        "CREATE INDEX idx_tasks_user_updated ON tasks (user_id, updated_at)",
+        '''CREATE TABLE IF NOT EXISTS task_tombstones (
+            task_id INT PRIMARY KEY,
+            user_id INT NOT NULL,
+            deleted_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+            INDEX idx_tombstones_user_deleted (user_id, deleted_at)
+        )''',
+    ]),
+    (5, "covering index for per-user task stats", [
+        "CREATE INDEX idx_tasks_user_stats ON tasks (user_id, completed, priority, due_date)",
+    ]),
+    (6, "per-user task counters maintained on write", [
+        # One row per (user, priority); see task_stats.py for how they are kept current
+        '''CREATE TABLE IF NOT EXISTS user_task_stats (
+            user_id INT NOT NULL,
+            priority ENUM('Low', 'Medium', 'High', 'Urgent') NOT NULL,
+            total INT NOT NULL DEFAULT 0,
+            completed INT NOT NULL DEFAULT 0,
+            overdue INT NOT NULL DEFAULT 0,
+            overdue_as_of DATE NOT NULL,
+            PRIMARY KEY (user_id, priority)
+        )''',
+        "INSERT INTO user_task_stats (user_id, priority, total, completed, overdue, overdue_as_of) "
+        "SELECT user_id, priority, COUNT(*), SUM(completed), "
+        "COALESCE(SUM(completed = 0 AND due_date < CURDATE()), 0), CURDATE() "
+        "FROM tasks GROUP BY user_id, priority",
+    ]),
+    (7, "revoked session tokens", [
+        '''CREATE TABLE IF NOT EXISTS revoked_tokens (
+            jti CHAR(32) PRIMARY KEY,
+            expires_at DATETIME NOT NULL,
+            revoked_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+            INDEX idx_revoked_tokens_revoked (revoked_at)
+        )''',
+    ]),
+    (8, "unique usernames and emails", [
+        # Users tables created by the old services/database.py have no email
+        # column; MySQL has no ADD COLUMN IF NOT EXISTS, so build the ALTER
+        # (or a no-op) from information_schema and run it as a statement
+        "SET @add_users_email = (SELECT IF(COUNT(*) = 0, "
+        "'ALTER TABLE users ADD COLUMN email VARCHAR(255) NULL AFTER username', 'DO 0') "
+        "FROM information_schema.columns WHERE table_schema = DATABASE() "
+        "AND table_name = 'users' AND column_name = 'email')",
+        "PREPARE add_users_email FROM @add_users_email",
+        "EXECUTE add_users_email",
+        "DEALLOCATE PREPARE add_users_email",
+        # Check-then-insert signups could race; keep the oldest account and
+        # suffix the later duplicates with their id so the indexes can be built
+        "UPDATE users u JOIN (SELECT username, MIN(id) AS keep_id FROM users "
+        "GROUP BY username HAVING COUNT(*) > 1) d ON u.username = d.username AND u.id <> d.keep_id "
+        "SET u.username = CONCAT(u.username, '#', u.id)",
+        "UPDATE users u JOIN (SELECT email, MIN(id) AS keep_id FROM users "
+        "GROUP BY email HAVING COUNT(*) > 1) d ON u.email = d.email AND u.id <> d.keep_id "
+        "SET u.email = CONCAT(u.email, '#', u.id)",
+        "ALTER TABLE users ADD UNIQUE INDEX uq_users_username (username), "
+        "ADD UNIQUE INDEX uq_users_email (email)",
+    ]),
+]
+
+# Name of the MySQL advisory lock held while migrating
+MIGRATION_LOCK = 'todo_app_schema_migrations'
+
+# Queries on the request path that must never fall back to a full table scan,
+# with the index EXPLAIN is expected to report for each of them.
+HOT_QUERIES = {
+    'login_lookup': (
+        "SELECT id, username, email, password, created_at FROM users WHERE username = %s",
+        ('someone',),
+        'uq_users_username',
+    ),
+    'tasks_page': (
+        "SELECT * FROM tasks WHERE user_id = %s ORDER BY created_at, id LIMIT 11",
+        (1,),
+        'idx_tasks_user_created',
+    ),
+    'tasks_by_completion': (
+        "SELECT * FROM tasks WHERE user_id = %s AND completed = %s",
+        (1, 0),
+        'idx_tasks_user_completed_due',
+    ),
+    'task_changes': (
+        "SELECT * FROM tasks WHERE user_id = %s AND updated_at > %s",
+        (1, '2025-01-01 00:00:00'),
+        'idx_tasks_user_updated',
+    ),
+    'overdue_tasks': (
+        "SELECT id FROM tasks WHERE user_id = %s AND completed = 0 AND due_date < CURDATE()",
+        (1,),
+        'idx_tasks_user_completed_due',
+    ),
+    'user_stats': (
+        "SELECT completed, priority, COUNT(*), SUM(due_date < CURDATE()) "
+        "FROM tasks WHERE user_id = %s GROUP BY completed, priority",
+        (1,),
+        'idx_tasks_user_stats',
+    ),
+    'stats_counters': (
+        "SELECT priority, total, completed, overdue FROM user_task_stats WHERE user_id = %s",
+        (1,),
+        'PRIMARY',
+    ),
+}
+
+
+def current_version(conn):
+    cursor = conn.cursor()
+    cursor.execute('''CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        description VARCHAR(255),
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''')
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def run_migrations(conn):
+    """Apply pending migrations on `conn` and return the resulting schema version."""
+    version = current_version(conn)
+    cursor = conn.cursor()
+    for number, description, statements in MIGRATIONS:
+        if number <= version:
+            continue
+        print(f"Applying migration {number}: {description}")
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+            (number, description)
+        )
+        conn.commit()
+        version = number
+    cursor.close()
+    return version
+
+
+def run_migrations_locked(conn, timeout=30):
+    """run_migrations under MIGRATION_LOCK; waits up to `timeout` seconds for other workers."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, timeout))
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        raise Error(msg=f"Timed out waiting for migration lock {MIGRATION_LOCK}")
+    try:
+        return run_migrations(conn)
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+        cursor.fetchone()
+        cursor.close()
+
+
+def explain_hot_queries(conn):
+    """Return {query name: index chosen by the optimizer} for HOT_QUERIES."""
+    cursor = conn.cursor(dictionary=True)
+    used = {}
+    for name, (query, params, _) in HOT_QUERIES.items():
+        cursor.execute(f"EXPLAIN {query}", params)
+        used[name] = cursor.fetchall()[0]['key']
+    cursor.close()
+    return used
+
+
+def check_hot_query_indexes(conn):
+    """Return a list of problems; empty when every hot query uses its index."""
+    problems = []
+    for name, key in explain_hot_queries(conn).items():
+        expected = HOT_QUERIES[name][2]
+        if key != expected:
+            problems.append(f"{name}: expected index {expected}, EXPLAIN reports {key}")
+    return problems
+
+
+if __name__ == '__main__':
+    import sys
+    import mysql.connector
+    from config import Config
+
+    connection = mysql.connector.connect(
+        host=Config.DB_HOST,
+        port=int(Config.DB_PORT),
+        user=Config.DB_USER,
+        password=Config.DB_PASSWORD,
+        database=Config.DB_NAME,
+    )
+    try:
+        print(f"Schema version: {run_migrations_locked(connection)}")
+        if '--explain' in sys.argv:
+            failures = check_hot_query_indexes(connection)
+            for failure in failures:
+                print(failure)
+            sys.exit(1 if failures else 0)
+    except Error as e:
+        print(f"Migration error: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
@@ -0,0 +1,392 @@
+"""Repository backed by a MySQL server through the API's ConnectionPool.
+
+Schema changes are versioned in migrations.py and per-user counters are
+maintained with task_stats.py, both in the same transaction as the writes.
+The fixed-text lookups run as prepared statements (see
+PooledConnection.execute_prepared), parsed once per pooled connection.
+"""
+from datetime import timedelta
+
+from mysql.connector import Error, IntegrityError, HAVE_CEXT, errorcode
+from mysql.connector.constants import ClientFlag
+
+from db_pool import ConnectionPool, PoolTimeout
+from export import iter_rows
+from migrations import run_migrations_locked
+from repository import DuplicateError, Repository, RowStream
+from task_stats import count_tasks, move_task, read_stats, reconcile
+
+
+def _placeholders(count):
+    return ', '.join(['%s'] * count)
+
+
+def _task_scope(task_id, user_id):
+    """WHERE clause for one task, restricted to its owner when the caller sent one."""
+    if user_id is None:
+        return "id = %s", [task_id]
+    return "id = %s AND user_id = %s", [task_id, user_id]
+
+
+def _locked_task_ids(cursor, user_id, task_ids):
+    """Ids among `task_ids` owned by `user_id`, row-locked until commit."""
+    cursor.execute(
+        f"SELECT id FROM tasks WHERE user_id = %s AND id IN ({_placeholders(len(task_ids))}) FOR UPDATE",
+        [user_id] + list(task_ids)
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _record_tombstones(cursor, user_id, task_ids):
+    """Remember deleted task ids so /api/tasks/changes can report them"""
+    cursor.execute(
+        "INSERT INTO task_tombstones (task_id, user_id) VALUES "
+        + ', '.join(['(%s, %s)'] * len(task_ids))
+        + " ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)",
+        [value for task_id in task_ids for value in (task_id, user_id)]
+    )
+
+
+# Columns whose changes move a task between user_task_stats counters
+STATS_FIELDS = ('due_date', 'priority', 'completed')
+
+GET_USER_SQL = "SELECT id, username, email, created_at FROM users WHERE id = %s"
+FIND_LOGIN_SQL = "SELECT id, username, email, password, created_at FROM users WHERE username = %s"
+GET_TASK_SQL = "SELECT * FROM tasks WHERE id = %s"
+
+
+def _fetch_one(cursor):
+    """First row of a prepared cursor; the rest are read so the connection is free again."""
+    rows = cursor.fetchall()
+    return rows[0] if rows else None
+
+
+class MySQLRepository(Repository):
+    busy_errors = (PoolTimeout,)
+    errors = (Error,)
+
+    def __init__(self, pool, database):
+        self.pool = pool
+        self.database = database
+
+    @classmethod
+    def connect(cls, host, port, user, password, database, use_pure=False, **pool_options):
+        """Repository on a new ConnectionPool; `pool_options` are ConnectionPool's size, timeout etc."""
+        pool = ConnectionPool(
+            host=host,
+            port=int(port),
+            user=user,
+            password=password,
+            database=database,
+            # Report matched rather than changed rows so UPDATE rowcount means "found"
+            client_flags=[ClientFlag.FOUND_ROWS],
+            # Fall back to the pure-Python driver where the C extension isn't built
+            use_pure=use_pure or not HAVE_CEXT,
+            **pool_options
+        )
+        return cls(pool, database)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls.connect(
+            config.DB_HOST, config.DB_PORT, config.DB_USER, config.DB_PASSWORD, config.DB_NAME,
+            use_pure=config.DB_USE_PURE,
+            size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_POOL_MAX_OVERFLOW,
+            timeout=config.DB_POOL_TIMEOUT,
+            recycle=config.DB_POOL_RECYCLE,
+            ping_after=config.DB_POOL_PING_AFTER,
+        )
+
+    def connection(self):
+        """Check out a pooled connection; raises PoolTimeout when the pool stays exhausted."""
+        return self.pool.connection()
+
+    def initialize(self, retention):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            # Ensure the database exists, then bring the schema up to date
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+            version = run_migrations_locked(conn)
+            cursor.execute(
+                "DELETE FROM task_tombstones WHERE deleted_at < NOW(6) - INTERVAL %s SECOND",
+                (int(retention.total_seconds()),)
+            )
+            cursor.execute("DELETE FROM revoked_tokens WHERE expires_at < NOW()")
+            conn.commit()
+            cursor.close()
+            return version
+
+    def ping(self):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+
+    def pool_stats(self):
+        return self.pool.stats()
+
+    def close(self):
+        self.pool.close()
+
+    def create_user(self, username, email, password_hash):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            # The UNIQUE indexes on username and email are the existence check
+            try:
+                cursor.execute("INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
+                               (username, email, password_hash))
+            except IntegrityError as e:
+                if e.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                raise DuplicateError("Username or email exists")
+            conn.commit()
+            return cursor.lastrowid
+
+    def get_user(self, user_id):
+        with self.connection() as conn:
+            return _fetch_one(conn.execute_prepared(GET_USER_SQL, (user_id,)))
+
+    def find_login(self, username):
+        with self.connection() as conn:
+            return _fetch_one(conn.execute_prepared(FIND_LOGIN_SQL, (username,)))
+
+    def replace_password_hash(self, user_id, old_hash, new_hash):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE users SET password = %s WHERE id = %s AND password = %s",
+                (new_hash, user_id, old_hash)
+            )
+            conn.commit()
+
+    def delete_user(self, user_id):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for table in ('tasks', 'task_tombstones', 'user_task_stats'):
+                cursor.execute(f"DELETE FROM {table} WHERE user_id = %s", (user_id,))
+            cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
+            conn.commit()
+
+    def _task_query(self, user_id, completed, after):
+        where, params = ["user_id = %s"], [user_id]
+        if completed is not None:
+            where.append("completed = %s")
+            params.append(completed)
+        if after:
+            after_created_at, after_id = after
+            where.append("(created_at > %s OR (created_at = %s AND id > %s))")
+            params.extend([after_created_at, after_created_at, after_id])
+        return f"SELECT * FROM tasks WHERE {' AND '.join(where)} ORDER BY created_at, id", params
+
+    def list_tasks(self, user_id, completed=None, after=None, limit=None):
+        query, params = self._task_query(user_id, completed, after)
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        with self.connection() as conn:
+            # At most eight query shapes (filter, cursor and limit on or off)
+            return conn.execute_prepared(query, params).fetchall()
+
+    def task_changes(self, user_id, since, retention):
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT NOW(6) AS now")
+            now = cursor.fetchone()['now']
+            full_resync = since is None or since < now - retention
+
+            if full_resync:
+                cursor.execute("SELECT * FROM tasks WHERE user_id = %s", (user_id,))
+                tasks, deleted = cursor.fetchall(), []
+            else:
+                cursor.execute("SELECT * FROM tasks WHERE user_id = %s AND updated_at > %s", (user_id, since))
+                tasks = cursor.fetchall()
+                cursor.execute(
+                    "SELECT task_id FROM task_tombstones WHERE user_id = %s AND deleted_at > %s", (user_id, since)
+                )
+                deleted = [row['task_id'] for row in cursor.fetchall()]
+        return now, tasks, deleted, full_resync
+
+    def export_tasks(self, user_id, completed=None):
+        query, params = self._task_query(user_id, completed, None)
+        conn = self.connection()
+        try:
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            cursor.execute(query, params)
+        except Error:
+            conn.close()
+            raise
+
+        def close():
+            if conn.unread_result:
+                # The client left before the last row (or the stream never
+                # started). Closing the cursor or rolling back would first
+                # read every remaining row off the wire, so stop the query on
+                # the server and drop the connection instead.
+                self._kill_query(conn.connection_id)
+                conn.discard()
+                return
+            cursor.close()
+            conn.close()
+        return RowStream(iter_rows(cursor), close)
+
+    def _kill_query(self, connection_id):
+        """Abort the statement running on another connection; best effort."""
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("KILL QUERY %s", (connection_id,))
+        except (Error, PoolTimeout) as e:
+            print(f"Could not stop query on connection {connection_id}: {e}")
+
+    def get_task(self, task_id):
+        with self.connection() as conn:
+            return _fetch_one(conn.execute_prepared(GET_TASK_SQL, (task_id,)))
+
+    def create_task(self, user_id, fields):
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                INSERT INTO tasks (user_id, title, description, due_date, priority, completed)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, (
+                user_id, fields['title'], fields.get('description'),
+                fields.get('due_date'), fields.get('priority', 'Low'), fields.get('completed', 0)
+            ))
+            task_id = cursor.lastrowid
+            count_tasks(cursor, "id = %s", [task_id])
+            conn.commit()
+            return _fetch_one(conn.execute_prepared(GET_TASK_SQL, (task_id,)))
+
+    def update_task(self, task_id, user_id, fields):
+        where, where_params = _task_scope(task_id, user_id)
+        updates = [f"{field} = %s" for field in fields]
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+
+            if any(field in fields for field in STATS_FIELDS):
+                if not move_task(cursor, where, where_params, fields):
+                    return None
+
+            # rowcount counts matched rows (FOUND_ROWS), so 0 means the task doesn't exist
+            cursor.execute(f"UPDATE tasks SET {', '.join(updates)} WHERE {where}",
+                           list(fields.values()) + where_params)
+            if cursor.rowcount == 0:
+                return None
+
+            task = _fetch_one(conn.execute_prepared(GET_TASK_SQL, (task_id,)))
+            conn.commit()
+            return task
+
+    def set_completion(self, task_id, user_id, completed):
+        where, params = _task_scope(task_id, user_id)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if not move_task(cursor, where, params, {'completed': completed}):
+                return False
+            cursor.execute(f"UPDATE tasks SET completed = %s WHERE {where}", [completed] + params)
+            conn.commit()
+            return True
+
+    def delete_task(self, task_id, user_id):
+        where, params = _task_scope(task_id, user_id)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            # Locks the task before anything reads it for the counters, and
+            # finds nothing to tombstone when there is no such task
+            cursor.execute(
+                f"INSERT INTO task_tombstones (task_id, user_id) SELECT id, user_id FROM tasks WHERE {where} "
+                "FOR UPDATE ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)",
+                params
+            )
+            if cursor.rowcount == 0:
+                return False
+            count_tasks(cursor, where, params, -1)
+            cursor.execute(f"DELETE FROM tasks WHERE {where}", params)
+            conn.commit()
+            return True
+
+    def create_tasks(self, user_id, rows):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            # The snapshot predates the INSERT, so the read below sees this
+            # user's new rows but none committed meanwhile by other requests
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+            cursor.execute(
+                "INSERT INTO tasks (user_id, title, description, due_date, priority, completed) VALUES "
+                + ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(rows)),
+                [value for row in rows for value in (user_id,) + tuple(row)]
+            )
+            # lastrowid is the first id; the rest need not follow it one by one
+            # (interleaved AUTO_INCREMENT locking, auto_increment_increment > 1)
+            cursor.execute(
+                "SELECT id FROM tasks WHERE user_id = %s AND id >= %s ORDER BY id LIMIT %s",
+                (user_id, cursor.lastrowid, len(rows))
+            )
+            task_ids = [row[0] for row in cursor.fetchall()]
+            count_tasks(cursor, f"user_id = %s AND id IN ({_placeholders(len(task_ids))})",
+                        [user_id] + task_ids)
+            conn.commit()
+        return task_ids
+
+    def set_completions(self, user_id, ids_by_value):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            found = _locked_task_ids(cursor, user_id, ids_by_value[0] + ids_by_value[1])
+            ids_by_value = {value: [i for i in ids if i in found] for value, ids in ids_by_value.items()}
+            changed = sorted(found)
+            if changed:
+                scope = f"user_id = %s AND id IN ({_placeholders(len(changed))})"
+                count_tasks(cursor, scope, [user_id] + changed, -1)
+            for completed, task_ids in ids_by_value.items():
+                if task_ids:
+                    cursor.execute(
+                        f"UPDATE tasks SET completed = %s WHERE user_id = %s AND id IN ({_placeholders(len(task_ids))})",
+                        [completed, user_id] + task_ids
+                    )
+            if changed:
+                count_tasks(cursor, scope, [user_id] + changed)
+            conn.commit()
+            return found
+
+    def delete_tasks(self, user_id, task_ids):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            found = _locked_task_ids(cursor, user_id, task_ids)
+            if found:
+                scope = f"user_id = %s AND id IN ({_placeholders(len(found))})"
+                count_tasks(cursor, scope, [user_id] + sorted(found), -1)
+                cursor.execute(f"DELETE FROM tasks WHERE {scope}", [user_id] + sorted(found))
+                _record_tombstones(cursor, user_id, sorted(found))
+            conn.commit()
+            return found
+
+    def user_stats(self, user_id):
+        with self.connection() as conn:
+            return read_stats(conn, user_id)
+
+    def reconcile_stats(self, user_ids=None):
+        with self.connection() as conn:
+            return reconcile(conn, user_ids)
+
+    def revoke_token(self, jti, expires_at):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT IGNORE INTO revoked_tokens (jti, expires_at) VALUES (%s, FROM_UNIXTIME(%s))",
+                (jti, expires_at)
+            )
+            conn.commit()
+
+    def revoked_tokens(self, since=None, overlap_seconds=0):
+        query = "SELECT jti, UNIX_TIMESTAMP(expires_at), revoked_at FROM revoked_tokens WHERE expires_at > NOW()"
+        params = ()
+        if since is not None:
+            query += " AND revoked_at > %s"
+            params = (since - timedelta(seconds=overlap_seconds),)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            conn.commit()
+        return [(jti, int(expires_at), revoked_at) for jti, expires_at, revoked_at in rows]
@@ -0,0 +1,125 @@
+"""Password hashing for the API, with a configurable algorithm and cost.
+
+Supported algorithms and what "cost" means for each:
+
+- scrypt (default): the N work factor, 32768 by default
+- pbkdf2: PBKDF2-SHA256 iterations, 600000 by default
+- bcrypt: log2 rounds, 12 by default; needs the optional bcrypt package
+
+scrypt and pbkdf2 hashes use werkzeug's format, so hashes stored by older
+versions of the API keep verifying. `needs_rehash` reports hashes made with
+another algorithm or cost, so login can upgrade them after a cost change.
+
+Hashing runs in a small process pool (`PasswordHasher`), apart from the
+request threads. Request threads only wait for their own result, and at
+most `max_pending` hashes may be queued before callers get HasherBusy.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    import bcrypt
+except ImportError:
+    bcrypt = None
+
+DEFAULT_COSTS = {'scrypt': 32768, 'pbkdf2': 600000, 'bcrypt': 12}
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue stays full for longer than the hasher's timeout."""
+    pass
+
+
+def _werkzeug_method(algorithm, cost):
+    if algorithm == 'scrypt':
+        return f"scrypt:{cost}:8:1"
+    return f"pbkdf2:sha256:{cost}"
+
+
+def hash_password(password, algorithm='scrypt', cost=None):
+    cost = cost or DEFAULT_COSTS[algorithm]
+    if algorithm == 'bcrypt':
+        if bcrypt is None:
+            raise RuntimeError("PASSWORD_ALGORITHM=bcrypt needs the bcrypt package")
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=cost)).decode()
+    if algorithm not in DEFAULT_COSTS:
+        raise ValueError(f"Unknown password algorithm: {algorithm}")
+    return generate_password_hash(password, method=_werkzeug_method(algorithm, cost))
+
+
+def verify_password(password, hashed):
+    if hashed.startswith('$2'):
+        if bcrypt is None:
+            raise RuntimeError("Verifying bcrypt hashes needs the bcrypt package")
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+    return check_password_hash(hashed, password)
+
+
+def needs_rehash(hashed, algorithm='scrypt', cost=None):
+    """True when `hashed` wasn't made with `algorithm` at `cost`."""
+    cost = cost or DEFAULT_COSTS[algorithm]
+    if hashed.startswith('$2'):
+        return algorithm != 'bcrypt' or int(hashed.split('$')[2]) != cost
+    if algorithm == 'bcrypt':
+        return True
+    return hashed.split('$', 1)[0] != _werkzeug_method(algorithm, cost)
+
+
+class PasswordHasher:
+    """Hash and verify passwords in a bounded pool of worker processes.
+
+    The pool starts on first use, so every gunicorn worker gets its own
+    after forking. With `workers=0` hashing runs inline on the caller's
+    thread instead, which is handy for scripts.
+    """
+
+    def __init__(self, algorithm='scrypt', cost=None, workers=2, max_pending=32, timeout=10.0):
+        if algorithm not in DEFAULT_COSTS:
+            raise ValueError(f"Unknown password algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.cost = cost or DEFAULT_COSTS[algorithm]
+        self.workers = workers
+        self.timeout = timeout
+        self._pending = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # Never fork a threaded server process; spawn clean interpreters
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._pending.acquire(timeout=self.timeout):
+            raise HasherBusy(f"More than the allowed password hashes queued for {self.timeout}s")
+        try:
+            return self._pool().submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HasherBusy(f"Password hash took longer than {self.timeout}s")
+        finally:
+            self._pending.release()
+
+    def hash(self, password):
+        return self._run(hash_password, password, self.algorithm, self.cost)
+
+    def verify(self, password, hashed):
+        return self._run(verify_password, password, hashed)
+
+    def needs_rehash(self, hashed):
+        return needs_rehash(hashed, self.algorithm, self.cost)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,182 @@
+"""Storage interface behind the API routes.
+
+The routes validate requests and shape responses; everything that touches
+the database goes through a Repository. Two backends implement it:
+
+- MySQLRepository (mysql_repository.py): the pooled MySQL server setup
+- SQLiteRepository (sqlite_repository.py): an embedded database file in WAL
+  mode, for small deployments and local load tests with no DB server
+
+Pick one with DB_BACKEND=mysql|sqlite. Each method is one transaction.
+Task rows are dicts with the tasks table's columns; DATE and TIMESTAMP
+columns come back as date and datetime objects on both backends.
+"""
+from abc import ABC, abstractmethod
+
+
+class DuplicateError(Exception):
+    """Raised when a write would break a UNIQUE constraint."""
+    pass
+
+
+class RowStream:
+    """Rows of a query that is already running, released by `close()` or exhaustion."""
+
+    def __init__(self, rows, close):
+        self._rows = rows
+        self._close = close
+
+    def __iter__(self):
+        try:
+            yield from self._rows
+        finally:
+            self.close()
+
+    def close(self):
+        if self._close is not None:
+            close, self._close = self._close, None
+            close()
+
+
+class Repository(ABC):
+    # Exceptions meaning "busy, retry shortly" (answered with 503) and any
+    # other storage failure (answered with 500)
+    busy_errors = ()
+    errors = ()
+
+    @abstractmethod
+    def initialize(self, retention):
+        """Create or migrate the schema and return its version.
+
+        Also purges expired token revocations and tombstones older than the
+        `retention` timedelta.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def ping(self):
+        """Raise one of `errors` unless the database answers."""
+        raise NotImplementedError
+
+    def pool_stats(self):
+        return {}
+
+    def close(self):
+        """Release the backend's connections."""
+        pass
+
+    # Users
+
+    @abstractmethod
+    def create_user(self, username, email, password_hash):
+        """Insert a user and return the id; DuplicateError when the username or email is taken."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user(self, user_id):
+        """id, username, email and created_at of a user, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_login(self, username):
+        """Like get_user plus the password hash, looked up by username."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def replace_password_hash(self, user_id, old_hash, new_hash):
+        """Swap the hash only if it is still `old_hash`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_user(self, user_id):
+        """Remove a user with all their tasks and bookkeeping rows."""
+        raise NotImplementedError
+
+    # Tasks. `user_id=None` on single-task writes means "whoever owns it".
+
+    @abstractmethod
+    def list_tasks(self, user_id, completed=None, after=None, limit=None):
+        """Tasks in (created_at, id) order, starting after the `after` pair when given."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def task_changes(self, user_id, since, retention):
+        """(now, tasks, deleted ids, full_resync) for a delta sync from `since`.
+
+        A full resync, returning every task, happens when `since` is None or
+        older than the `retention` timedelta of delete tombstones.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_tasks(self, user_id, completed=None):
+        """RowStream over the tasks in (created_at, id) order, fetched incrementally."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_task(self, task_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_task(self, user_id, fields):
+        """Insert a task from title, description, due_date, priority and completed; returns the row."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_task(self, task_id, user_id, fields):
+        """Apply `fields` and return the updated row, or None when there is no such task."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_completion(self, task_id, user_id, completed):
+        """True when the task exists."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_task(self, task_id, user_id):
+        """Delete and tombstone a task; True when it existed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_tasks(self, user_id, rows):
+        """Insert (title, description, due_date, priority, completed) rows; returns their ids in order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_completions(self, user_id, ids_by_value):
+        """Apply {0: [ids], 1: [ids]} to the user's tasks; returns the set of ids found."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_tasks(self, user_id, task_ids):
+        """Delete and tombstone the user's tasks among `task_ids`; returns the set of ids found."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def user_stats(self, user_id):
+        """Totals, overdue count and per-priority breakdown, as task_stats.stats_payload builds them."""
+        raise NotImplementedError
+
+    # Session token revocations
+
+    @abstractmethod
+    def revoke_token(self, jti, expires_at):
+        """Record a revoked token id until `expires_at` (a Unix timestamp)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def revoked_tokens(self, since=None, overlap_seconds=0):
+        """(jti, expires_at, revoked_at) of unexpired revocations made after `since` - overlap."""
+        raise NotImplementedError
+
+
+def create_repository(config):
+    """The backend named by config.DB_BACKEND; only that backend's driver is imported."""
+    backend = (config.DB_BACKEND or 'mysql').lower()
+    if backend == 'sqlite':
+        from sqlite_repository import SQLiteRepository
+        return SQLiteRepository(config.SQLITE_PATH, busy_timeout=config.SQLITE_BUSY_TIMEOUT)
+    if backend == 'mysql':
+        from mysql_repository import MySQLRepository
+        return MySQLRepository.from_config(config)
+    raise ValueError(f"Unknown DB_BACKEND: {config.DB_BACKEND}")
@@ -0,0 +1,363 @@
+"""Repository backed by an embedded SQLite database file.
+
+Meant for small deployments and local load tests: no server to run, and a
+query is a library call instead of a network round trip. The file is opened
+in WAL mode, so readers never block the single writer. Every thread gets
+its own connection, with a cache of prepared statements. Writes take the
+write lock up front (BEGIN IMMEDIATE), so a busy database shows up as
+DatabaseBusy after `busy_timeout` seconds and never as a mid-transaction
+deadlock.
+
+Timestamps are stored as UTC text with microseconds, which sorts in time
+order, and dates as YYYY-MM-DD. Stats are computed with one GROUP BY over
+idx_tasks_user_stats. Without a network round trip that is cheap enough
+that this backend keeps no counter table.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+from export import iter_rows
+from repository import DuplicateError, Repository, RowStream
+from task_stats import stats_payload
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+-- AUTOINCREMENT so a deleted task's id, still in its tombstone, is never reused
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    title TEXT NOT NULL,
+    description TEXT,
+    due_date DATE CHECK (due_date IS NULL OR date(due_date) IS due_date),
+    priority TEXT NOT NULL DEFAULT 'Low' CHECK (priority IN ('Low', 'Medium', 'High', 'Urgent')),
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_created ON tasks (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_updated ON tasks (user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_stats ON tasks (user_id, completed, priority, due_date);
+CREATE TABLE IF NOT EXISTS task_tombstones (
+    task_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_user_deleted ON task_tombstones (user_id, deleted_at);
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti TEXT PRIMARY KEY,
+    expires_at INTEGER NOT NULL,
+    revoked_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_revoked_tokens_revoked ON revoked_tokens (revoked_at);
+"""
+
+# Prepared statements kept per connection; the bulk endpoints' IN lists add variants
+STATEMENT_CACHE_SIZE = 256
+
+TASK_COLUMNS = ('title', 'description', 'due_date', 'priority', 'completed')
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' ', timespec='microseconds'))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter('TIMESTAMP', lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter('DATE', lambda raw: date.fromisoformat(raw.decode()))
+
+
+class DatabaseBusy(Exception):
+    """Raised when the write lock stays taken for longer than the busy timeout."""
+    pass
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _placeholders(count):
+    return ', '.join(['?'] * count)
+
+
+def _task_scope(task_id, user_id):
+    if user_id is None:
+        return "id = ?", [task_id]
+    return "id = ? AND user_id = ?", [task_id, user_id]
+
+
+class SQLiteRepository(Repository):
+    busy_errors = (DatabaseBusy,)
+    errors = (sqlite3.Error,)
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = 0
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                # Transactions are opened explicitly below
+                isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            conn.row_factory = _dict_row
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Durable at checkpoints rather than on every commit; safe with WAL
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._local.conn = conn
+            with self._lock:
+                self._connections += 1
+        return conn
+
+    @contextmanager
+    def _transaction(self, write=True):
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e) or 'busy' in str(e):
+                raise DatabaseBusy(str(e))
+            raise
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def initialize(self, retention):
+        with self._transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()['user_version']
+            if version < SCHEMA_VERSION:
+                for statement in SCHEMA.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                version = SCHEMA_VERSION
+            conn.execute("DELETE FROM task_tombstones WHERE deleted_at < ?", (_now() - retention,))
+            conn.execute("DELETE FROM revoked_tokens WHERE expires_at < ?", (int(time.time()),))
+        return version
+
+    def ping(self):
+        self._connection().execute("SELECT 1").fetchone()
+
+    def pool_stats(self):
+        with self._lock:
+            return {'backend': 'sqlite', 'connections_created': self._connections}
+
+    def close(self):
+        """Close the calling thread's connection; other threads' close as they exit."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def create_user(self, username, email, password_hash):
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (username, email, password, created_at) VALUES (?, ?, ?, ?)",
+                    (username, email, password_hash, _now())
+                )
+                return cursor.lastrowid
+        except sqlite3.IntegrityError as e:
+            if 'UNIQUE' not in str(e):
+                raise
+            raise DuplicateError("Username or email exists")
+
+    def get_user(self, user_id):
+        return self._connection().execute(
+            "SELECT id, username, email, created_at FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+
+    def find_login(self, username):
+        return self._connection().execute(
+            "SELECT id, username, email, password, created_at FROM users WHERE username = ?", (username,)
+        ).fetchone()
+
+    def replace_password_hash(self, user_id, old_hash, new_hash):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE users SET password = ? WHERE id = ? AND password = ?", (new_hash, user_id, old_hash)
+            )
+
+    def delete_user(self, user_id):
+        with self._transaction() as conn:
+            for table in ('tasks', 'task_tombstones'):
+                conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+
+    def _task_query(self, user_id, completed, after):
+        where, params = ["user_id = ?"], [user_id]
+        if completed is not None:
+            where.append("completed = ?")
+            params.append(completed)
+        if after:
+            after_created_at, after_id = after
+            where.append("(created_at > ? OR (created_at = ? AND id > ?))")
+            params.extend([after_created_at, after_created_at, after_id])
+        return f"SELECT * FROM tasks WHERE {' AND '.join(where)} ORDER BY created_at, id", params
+
+    def list_tasks(self, user_id, completed=None, after=None, limit=None):
+        query, params = self._task_query(user_id, completed, after)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._connection().execute(query, params).fetchall()
+
+    def task_changes(self, user_id, since, retention):
+        now = _now()
+        full_resync = since is None or since < now - retention
+        # One read transaction, so tasks and tombstones come from the same snapshot
+        with self._transaction(write=False) as conn:
+            if full_resync:
+                tasks = conn.execute("SELECT * FROM tasks WHERE user_id = ?", (user_id,)).fetchall()
+                deleted = []
+            else:
+                tasks = conn.execute(
+                    "SELECT * FROM tasks WHERE user_id = ? AND updated_at > ?", (user_id, since)
+                ).fetchall()
+                deleted = [row['task_id'] for row in conn.execute(
+                    "SELECT task_id FROM task_tombstones WHERE user_id = ? AND deleted_at > ?", (user_id, since)
+                )]
+        return now, tasks, deleted, full_resync
+
+    def export_tasks(self, user_id, completed=None):
+        query, params = self._task_query(user_id, completed, None)
+        cursor = self._connection().execute(query, params)
+        return RowStream(iter_rows(cursor), cursor.close)
+
+    def get_task(self, task_id):
+        return self._connection().execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+
+    def create_task(self, user_id, fields):
+        now = _now()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO tasks (user_id, title, description, due_date, priority, completed, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (user_id, fields['title'], fields.get('description'), fields.get('due_date'),
+                 fields.get('priority', 'Low'), int(bool(fields.get('completed', 0))), now, now)
+            )
+            return conn.execute("SELECT * FROM tasks WHERE id = ?", (cursor.lastrowid,)).fetchone()
+
+    def update_task(self, task_id, user_id, fields):
+        where, params = _task_scope(task_id, user_id)
+        updates = [f"{field} = ?" for field in fields] + ["updated_at = ?"]
+        with self._transaction() as conn:
+            cursor = conn.execute(f"UPDATE tasks SET {', '.join(updates)} WHERE {where}",
+                                  list(fields.values()) + [_now()] + params)
+            if cursor.rowcount == 0:
+                return None
+            return conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+
+    def set_completion(self, task_id, user_id, completed):
+        where, params = _task_scope(task_id, user_id)
+        with self._transaction() as conn:
+            cursor = conn.execute(f"UPDATE tasks SET completed = ?, updated_at = ? WHERE {where}",
+                                  [completed, _now()] + params)
+            return cursor.rowcount > 0
+
+    def delete_task(self, task_id, user_id):
+        where, params = _task_scope(task_id, user_id)
+        with self._transaction() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO task_tombstones (task_id, user_id, deleted_at) "
+                f"SELECT id, user_id, ? FROM tasks WHERE {where}",
+                [_now()] + params
+            )
+            return conn.execute(f"DELETE FROM tasks WHERE {where}", params).rowcount > 0
+
+    def create_tasks(self, user_id, rows):
+        now = _now()
+        with self._transaction() as conn:
+            # One prepared statement, re-executed per row inside the transaction
+            return [
+                conn.execute(
+                    "INSERT INTO tasks (user_id, title, description, due_date, priority, completed, "
+                    "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (user_id,) + tuple(row) + (now, now)
+                ).lastrowid
+                for row in rows
+            ]
+
+    def _owned_ids(self, conn, user_id, task_ids):
+        return {row['id'] for row in conn.execute(
+            f"SELECT id FROM tasks WHERE user_id = ? AND id IN ({_placeholders(len(task_ids))})",
+            [user_id] + list(task_ids)
+        )}
+
+    def set_completions(self, user_id, ids_by_value):
+        now = _now()
+        with self._transaction() as conn:
+            found = self._owned_ids(conn, user_id, ids_by_value[0] + ids_by_value[1])
+            for completed, task_ids in ids_by_value.items():
+                task_ids = [task_id for task_id in task_ids if task_id in found]
+                if task_ids:
+                    conn.execute(
+                        f"UPDATE tasks SET completed = ?, updated_at = ? "
+                        f"WHERE user_id = ? AND id IN ({_placeholders(len(task_ids))})",
+                        [completed, now, user_id] + task_ids
+                    )
+            return found
+
+    def delete_tasks(self, user_id, task_ids):
+        now = _now()
+        with self._transaction() as conn:
+            found = self._owned_ids(conn, user_id, task_ids)
+            if found:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO task_tombstones (task_id, user_id, deleted_at) VALUES (?, ?, ?)",
+                    [(task_id, user_id, now) for task_id in sorted(found)]
+                )
+                conn.execute(
+                    f"DELETE FROM tasks WHERE user_id = ? AND id IN ({_placeholders(len(found))})",
+                    [user_id] + sorted(found)
+                )
+            return found
+
+    def user_stats(self, user_id):
+        rows = self._connection().execute(
+            "SELECT priority, COUNT(*) AS total, SUM(completed) AS completed, "
+            "SUM(completed = 0 AND due_date < ?) AS overdue FROM tasks WHERE user_id = ? GROUP BY priority",
+            (date.today(), user_id)
+        ).fetchall()
+        return stats_payload(user_id, [
+            (row['priority'], row['total'], row['completed'], row['overdue'] or 0) for row in rows
+        ])
+
+    def revoke_token(self, jti, expires_at):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO revoked_tokens (jti, expires_at, revoked_at) VALUES (?, ?, ?)",
+                (jti, expires_at, _now())
+            )
+
+    def revoked_tokens(self, since=None, overlap_seconds=0):
+        query = "SELECT jti, expires_at, revoked_at FROM revoked_tokens WHERE expires_at > ?"
+        params = [int(time.time())]
+        if since is not None:
+            query += " AND revoked_at > ?"
+            params.append(since - timedelta(seconds=overlap_seconds))
+        return [(row['jti'], row['expires_at'], row['revoked_at'])
+                for row in self._connection().execute(query, params)]
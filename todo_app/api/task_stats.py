@@ -0,0 +1,203 @@
+"""Per-user task counters kept in the `user_task_stats` table.
+
+Each (user, priority) row holds total, completed and overdue counts, so the
+stats endpoint reads at most four primary-key rows however many tasks a user
+has. Every write in mysql_repository.py adjusts the rows in its own
+transaction. Bulk writes use `count_tasks`: once with sign -1 over the
+affected tasks before they change and once with +1 afterwards. Single-task
+updates use `move_task`, which locks the task and applies both halves in one
+statement, so counting costs them one round trip.
+
+Overdue is the one count that moves without a write, when midnight passes.
+Writes only adjust it on rows already counted for today (`overdue_as_of`);
+`read_stats` recounts it from idx_tasks_user_stats the first time a user's
+stats are read on a new day.
+
+`reconcile` recounts everything from the tasks table and repairs rows that
+drifted, e.g. writes made by an older deployment that did not maintain the
+counters. Run `python task_stats.py [user_id ...]` from cron to repair all
+users, or just the ones given.
+"""
+# Values accepted by the tasks.priority ENUM column
+PRIORITIES = ('Low', 'Medium', 'High', 'Urgent')
+
+# Adds `sign` times the counts of the tasks matching a WHERE clause. The rows
+# are read by the same transaction, so callers lock them first.
+COUNT_TASKS_SQL = """
+    INSERT INTO user_task_stats (user_id, priority, total, completed, overdue, overdue_as_of)
+    SELECT user_id, priority, %s * COUNT(*), %s * SUM(completed),
+           %s * COALESCE(SUM(completed = 0 AND due_date < CURDATE()), 0), CURDATE()
+    FROM tasks WHERE {where} GROUP BY user_id, priority
+    ON DUPLICATE KEY UPDATE
+        user_task_stats.total = user_task_stats.total + VALUES(total),
+        user_task_stats.completed = user_task_stats.completed + VALUES(completed),
+        user_task_stats.overdue = IF(user_task_stats.overdue_as_of = CURDATE(),
+                                     user_task_stats.overdue + VALUES(overdue),
+                                     user_task_stats.overdue)
+"""
+
+# Moves one task from the counters of its current values to those of its new
+# values. The join yields a -1 row read from the task and a +1 row built from
+# the new values (or the current ones for fields not being changed); FOR
+# UPDATE locks the task until commit, so it doubles as the existence check.
+MOVE_TASK_SQL = """
+    INSERT INTO user_task_stats (user_id, priority, total, completed, overdue, overdue_as_of)
+    SELECT user_id, IF(step < 0, priority, {priority}), step,
+           step * IF(step < 0, completed, {completed}),
+           step * COALESCE(IF(step < 0, completed, {completed}) = 0
+                           AND IF(step < 0, due_date, {due_date}) < CURDATE(), 0),
+           CURDATE()
+    FROM tasks CROSS JOIN (SELECT -1 AS step UNION ALL SELECT 1) AS steps
+    WHERE {where} FOR UPDATE
+    ON DUPLICATE KEY UPDATE
+        user_task_stats.total = user_task_stats.total + VALUES(total),
+        user_task_stats.completed = user_task_stats.completed + VALUES(completed),
+        user_task_stats.overdue = IF(user_task_stats.overdue_as_of = CURDATE(),
+                                     user_task_stats.overdue + VALUES(overdue),
+                                     user_task_stats.overdue)
+"""
+
+REFRESH_OVERDUE_SQL = """
+    UPDATE user_task_stats s SET
+        s.overdue = (SELECT COUNT(*) FROM tasks t
+                     WHERE t.user_id = s.user_id AND t.completed = 0
+                       AND t.priority = s.priority AND t.due_date < CURDATE()),
+        s.overdue_as_of = CURDATE()
+    WHERE s.user_id = %s
+"""
+
+# Recount of one user's tasks, served from idx_tasks_user_stats
+RECOUNT_SQL = """
+    SELECT priority, COUNT(*), SUM(completed), COALESCE(SUM(completed = 0 AND due_date < CURDATE()), 0)
+    FROM tasks WHERE user_id = %s GROUP BY priority
+"""
+
+
+def count_tasks(cursor, where, params, sign=1):
+    """Add (sign=1) or remove (sign=-1) the tasks matching `where` from their owners' counters."""
+    cursor.execute(COUNT_TASKS_SQL.format(where=where), [sign, sign, sign] + list(params))
+
+
+def move_task(cursor, where, params, changes):
+    """Re-file the task matching `where` under the priority, completed and due_date in `changes`.
+
+    Must run before the write itself. Returns False when no task matches.
+    """
+    expressions, args = {}, {}
+    for field, placeholder in (('priority', '%s'), ('completed', '%s'), ('due_date', 'CAST(%s AS DATE)')):
+        if field in changes:
+            expressions[field], args[field] = placeholder, [changes[field]]
+        else:
+            expressions[field], args[field] = field, []
+    cursor.execute(
+        MOVE_TASK_SQL.format(where=where, **expressions),
+        args['priority'] + args['completed'] + args['completed'] + args['due_date'] + list(params)
+    )
+    # One row per step; with FOUND_ROWS even a no-op upsert counts
+    return cursor.rowcount > 0
+
+
+def stats_payload(user_id, rows):
+    """Endpoint payload from (priority, total, completed, overdue) rows."""
+    by_priority = {priority: {'total': 0, 'completed': 0, 'pending': 0} for priority in PRIORITIES}
+    stats = {'user_id': user_id, 'total': 0, 'completed': 0, 'pending': 0, 'overdue': 0}
+    for priority, total, completed, overdue in rows:
+        total, completed = int(total), int(completed)
+        stats['total'] += total
+        stats['completed'] += completed
+        stats['pending'] += total - completed
+        stats['overdue'] += int(overdue)
+        by_priority[priority]['total'] += total
+        by_priority[priority]['completed'] += completed
+        by_priority[priority]['pending'] += total - completed
+    stats['by_priority'] = by_priority
+    return stats
+
+
+def read_stats(conn, user_id):
+    """A user's stats from their counter rows, recounting overdue once per day."""
+    cursor = conn.cursor()
+    query = ("SELECT priority, total, completed, overdue, overdue_as_of = CURDATE() "
+             "FROM user_task_stats WHERE user_id = %s")
+    cursor.execute(query, (user_id,))
+    rows = cursor.fetchall()
+    if not all(fresh for *_, fresh in rows):
+        cursor.execute(REFRESH_OVERDUE_SQL, (user_id,))
+        conn.commit()
+        cursor.execute(query, (user_id,))
+        rows = cursor.fetchall()
+    cursor.close()
+    return stats_payload(user_id, [row[:4] for row in rows])
+
+
+def reconcile(conn, user_ids=None):
+    """Recount counters from the tasks table; returns the ids of users that had drifted.
+
+    Each user is repaired in its own short transaction, with their tasks
+    share-locked so concurrent writes wait rather than race the recount.
+    """
+    cursor = conn.cursor()
+    if user_ids is None:
+        cursor.execute("SELECT user_id FROM tasks UNION SELECT user_id FROM user_task_stats")
+        user_ids = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+
+    repaired = []
+    try:
+        for user_id in user_ids:
+            cursor.execute(RECOUNT_SQL + " LOCK IN SHARE MODE", (user_id,))
+            expected = {row[0]: (int(row[1]), int(row[2]), int(row[3])) for row in cursor.fetchall()}
+            cursor.execute(
+                "SELECT priority, total, completed, overdue, overdue_as_of = CURDATE() "
+                "FROM user_task_stats WHERE user_id = %s FOR UPDATE",
+                (user_id,)
+            )
+            actual = {}
+            for priority, total, completed, overdue, fresh in cursor.fetchall():
+                if total or completed or overdue:
+                    # A stale overdue count is expected; read_stats refreshes it
+                    stale = not fresh and priority in expected
+                    actual[priority] = (total, completed, expected[priority][2] if stale else overdue)
+
+            if actual != expected:
+                cursor.execute("DELETE FROM user_task_stats WHERE user_id = %s", (user_id,))
+                if expected:
+                    cursor.execute(
+                        "INSERT INTO user_task_stats "
+                        "(user_id, priority, total, completed, overdue, overdue_as_of) VALUES "
+                        + ', '.join(['(%s, %s, %s, %s, %s, CURDATE())'] * len(expected)),
+                        [value for priority, counts in expected.items()
+                         for value in (user_id, priority) + counts]
+                    )
+                repaired.append(user_id)
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return repaired
+
+
+if __name__ == '__main__':
+    import sys
+    import mysql.connector
+    from mysql.connector import Error
+    from config import Config
+
+    connection = mysql.connector.connect(
+        host=Config.DB_HOST,
+        port=int(Config.DB_PORT),
+        user=Config.DB_USER,
+        password=Config.DB_PASSWORD,
+        database=Config.DB_NAME,
+    )
+    try:
+        only = [int(arg) for arg in sys.argv[1:]] or None
+        drifted = reconcile(connection, only)
+        print(f"Repaired task counters for {len(drifted)} user(s): {drifted}")
+    except Error as e:
+        print(f"Reconcile error: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
@@ -0,0 +1,134 @@
+"""Signed, expiring session tokens and the revocation cache behind them.
+
+A token is `base64url(claims).base64url(HMAC-SHA256(claims))`. Claims carry
+the user's public profile, so checking a token or renewing an access token
+costs one HMAC and a dictionary lookup: no password hash and no query.
+
+Revoked token ids live in the `revoked_tokens` table. Every worker keeps an
+in-memory copy and pulls new rows at most once per `sync_interval` seconds,
+so a revocation reaches all workers within that interval while checks stay
+off the database.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+
+# Revocations committed this long before the last sync are fetched again,
+# covering transactions that committed out of revoked_at order
+SYNC_OVERLAP_SECONDS = 5
+
+
+class TokenError(Exception):
+    """Raised for tokens that are malformed, forged, expired or of the wrong kind."""
+    pass
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class TokenSigner:
+    def __init__(self, secret, access_ttl=900, refresh_ttl=30 * 24 * 3600):
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+        self.ttls = {ACCESS: access_ttl, REFRESH: refresh_ttl}
+
+    def _sign(self, payload):
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def issue(self, user, kind):
+        """Token of `kind` for `user`, a dict with the profile fields to embed."""
+        claims = {
+            'sub': user['id'],
+            'typ': kind,
+            'exp': int(time.time()) + self.ttls[kind],
+            'jti': secrets.token_hex(16),
+            'user': user,
+        }
+        payload = json.dumps(claims, separators=(',', ':')).encode()
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def issue_pair(self, user):
+        return {
+            'access_token': self.issue(user, ACCESS),
+            'refresh_token': self.issue(user, REFRESH),
+            'expires_in': self.ttls[ACCESS],
+        }
+
+    def verify(self, token, kind):
+        """Claims of a valid, unexpired token of `kind`; raises TokenError otherwise."""
+        try:
+            encoded_payload, encoded_signature = token.split('.')
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except (AttributeError, ValueError) as e:
+            raise TokenError(f"Malformed token: {e}")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise TokenError("Bad token signature")
+
+        claims = json.loads(payload)
+        if claims.get('typ') != kind:
+            raise TokenError(f"Expected an {kind} token")
+        if claims.get('exp', 0) <= time.time():
+            raise TokenError("Token expired")
+        return claims
+
+
+class RevocationCache:
+    """In-memory set of revoked token ids, mirrored from the revoked_tokens table.
+
+    `repo` is the app's Repository. When a sync fails the cache keeps
+    answering from what it already has.
+    """
+
+    def __init__(self, repo, sync_interval=5.0):
+        self._repo = repo
+        self.sync_interval = sync_interval
+        self._revoked = {}
+        self._synced_at = None
+        self._watermark = None
+        self._lock = threading.Lock()
+
+    def revoke(self, claims):
+        """Revoke the token `claims` came from, until it would have expired anyway."""
+        self._repo.revoke_token(claims['jti'], claims['exp'])
+        with self._lock:
+            self._revoked[claims['jti']] = claims['exp']
+
+    def is_revoked(self, claims):
+        self._sync_if_due()
+        return claims['jti'] in self._revoked
+
+    def _sync_if_due(self):
+        now = time.monotonic()
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+                return
+            # Whatever happens below, don't retry before the next interval
+            self._synced_at = now
+            try:
+                self._sync()
+            except Exception as e:
+                print(f"Revocation cache sync failed: {e}")
+
+    def _sync(self):
+        rows = self._repo.revoked_tokens(self._watermark, SYNC_OVERLAP_SECONDS)
+        for jti, expires_at, revoked_at in rows:
+            self._revoked[jti] = expires_at
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+        cutoff = time.time()
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= cutoff]:
+            del self._revoked[jti]
@@ -0,0 +1,120 @@
+"""Peak Python memory of a full task export: buffered list vs streaming encoders.
+
+The default stand-in seeds an in-memory SQLite table and compares
+`fetchall()` + one `json.dumps` (what GET /api/tasks does) with the
+api/export.py encoders fed from `fetchmany` batches, for each format.
+
+With `--mysql` it runs the Flask app in-process against the database in
+api/.env instead: it seeds a throwaway user through POST /api/tasks/bulk,
+then compares GET /api/tasks with GET /api/tasks/export, and deletes the
+user afterwards. The pure-Python driver is used so tracemalloc sees the
+driver's allocations too.
+
+    cd todo_app && python benchmarks/bench_export_memory.py [rows] [--mysql]
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+os.environ['DB_USE_PURE'] = 'true'
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from export import FORMATS, iter_rows  # noqa: E402
+
+PRIORITIES = ('Low', 'Medium', 'High', 'Urgent')
+
+
+def task_row(i, user_id=1):
+    return {
+        'user_id': user_id, 'title': f"Task {i}", 'description': "Something to do " * 4,
+        'due_date': (date(2025, 1, 1) + timedelta(days=i % 365)).isoformat(),
+        'priority': PRIORITIES[i % 4], 'completed': i % 3 == 0,
+    }
+
+
+def measure(label, run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<24} peak {peak / 2**20:8.2f} MiB  {elapsed * 1000:8.1f} ms  {size / 2**20:8.2f} MiB out")
+
+
+def sqlite_standin(count):
+    conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.row_factory = lambda cursor, row: {col[0]: value for col, value in zip(cursor.description, row)}
+    conn.execute("""CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY, user_id INT, title TEXT, description TEXT, due_date DATE,
+        priority TEXT, completed INT, created_at TIMESTAMP, updated_at TIMESTAMP)""")
+    now = datetime(2025, 5, 15, 15, 59, 47)
+    conn.executemany(
+        "INSERT INTO tasks (user_id, title, description, due_date, priority, completed, created_at, updated_at) "
+        "VALUES (:user_id, :title, :description, :due_date, :priority, :completed, :created_at, :created_at)",
+        ({**task_row(i), 'created_at': now + timedelta(seconds=i)} for i in range(count))
+    )
+
+    def dumps(row):
+        return json.dumps(row, default=str)
+
+    def buffered():
+        rows = conn.execute("SELECT * FROM tasks ORDER BY created_at, id").fetchall()
+        return len(json.dumps(rows, default=str))
+
+    def streamed(encode):
+        def run():
+            cursor = conn.execute("SELECT * FROM tasks ORDER BY created_at, id")
+            return sum(len(chunk) for chunk in encode(iter_rows(cursor), dumps))
+        return run
+
+    measure("fetchall + json.dumps", buffered)
+    for name, (_, _, encode) in FORMATS.items():
+        measure(f"streamed {name}", streamed(encode))
+
+
+def mysql(count):
+    os.environ['DB_BACKEND'] = 'mysql'
+    import app as api
+
+    client = api.app.test_client()
+    name = f"bench_{uuid.uuid4().hex[:8]}"
+    user_id = client.post('/api/signup', json={
+        'username': name, 'email': f"{name}@example.com",
+        'password': 'bench', 'confirm_password': 'bench'
+    }).json['id']
+    try:
+        for offset in range(0, count, api.MAX_BULK_ITEMS):
+            batch = [task_row(i, user_id) for i in range(offset, min(count, offset + api.MAX_BULK_ITEMS))]
+            client.post('/api/tasks/bulk', json={'user_id': user_id, 'tasks': batch})
+
+        measure("GET /api/tasks", lambda: len(client.get(
+            '/api/tasks', query_string={'user_id': user_id}).get_data()))
+        for export_format in FORMATS:
+            def streamed():
+                response = client.get('/api/tasks/export', query_string={
+                    'user_id': user_id, 'format': export_format}, buffered=False)
+                size = sum(len(chunk) for chunk in response.response)
+                response.close()
+                return size
+            measure(f"export {export_format}", streamed)
+    finally:
+        api.repo.delete_user(user_id)
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    count = int(args[0]) if args else 50000
+    if '--mysql' in sys.argv:
+        mysql(count)
+    else:
+        sqlite_standin(count)
+
+
+if __name__ == '__main__':
+    main()
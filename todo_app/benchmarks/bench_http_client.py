@@ -0,0 +1,97 @@
+"""Requests per second and latency of the HTTP client against a local stub API.
+
+Starts a keep-alive HTTP/1.1 stub serving a 100-task GET /api/tasks page
+(gzipped when asked) and hits it from a few threads, either the old way
+(module-level requests.get, a new connection per call) or through the
+session ApiService now uses (sized keep-alive pool, retries, gzip).
+
+    cd todo_app && python benchmarks/bench_http_client.py [plain|session|both] [requests] [threads]
+"""
+import gzip
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config import Config  # noqa: E402
+from services.http_session import build_session  # noqa: E402
+
+TASKS = json.dumps({
+    'tasks': [
+        {'id': i, 'user_id': 1, 'title': f"Task {i}", 'description': "Something to do " * 4,
+         'priority': 'Medium', 'due_date': '2025-06-01', 'completed': 0,
+         'created_at': 'Thu, 15 May 2025 15:59:47 GMT'}
+        for i in range(100)
+    ],
+    'next_cursor': None,
+}).encode()
+TASKS_GZIP = gzip.compress(TASKS, compresslevel=5)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this Nagle stalls keep-alive replies
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = TASKS_GZIP if gzipped else TASKS
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, get, url, total, threads):
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        response = get(url, params={'user_id': 1, 'limit': 100}, timeout=(3.05, 10))
+        response.json()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    print(f"{label:<8} {total / wall:8.0f} req/s  p50 {statistics.median(latencies) * 1000:6.2f} ms"
+          f"  p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.2f} ms")
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'both'
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/tasks"
+
+    if mode in ('plain', 'both'):
+        run('plain', requests.get, url, total, threads)
+    if mode in ('session', 'both'):
+        run('session', build_session(Config.API_CONFIG).get, url, total, threads)
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
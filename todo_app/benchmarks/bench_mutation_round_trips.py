@@ -0,0 +1,94 @@
+"""Count MySQL round trips and latency per task mutation route.
+
+Runs the Flask app in-process against the database configured in api/.env and
+wraps every pooled connection's `cmd_query` (which the pure-Python driver uses
+for statements, COMMIT and ROLLBACK alike) and the prepared-statement commands
+with a counter.
+
+    cd todo_app && python benchmarks/bench_mutation_round_trips.py [iterations]
+
+Expected counts: a title-only PUT takes 3 round trips (UPDATE, read-back,
+COMMIT). Keeping the per-user counters (task_stats.py) costs one more
+statement, which also locks the task: 4 for a PUT that changes priority,
+completed or due_date, and 3 for PATCH. DELETE takes 4 (tombstone, counters,
+DELETE, COMMIT). The original check-then-write routes used 4 for PUT and PATCH
+and 3 for DELETE, with no counters or tombstones to maintain. Run it on an
+older checkout to compare.
+"""
+import os
+import sys
+import time
+import uuid
+
+# Count round trips on the pure-Python driver, where COMMIT also goes through cmd_query
+os.environ['DB_USE_PURE'] = 'true'
+os.environ['DB_BACKEND'] = 'mysql'
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import app as api  # noqa: E402
+
+round_trips = 0
+
+# Connection methods that each cost one round trip
+COUNTED_COMMANDS = ('cmd_query', 'cmd_stmt_prepare', 'cmd_stmt_execute', 'cmd_stmt_reset')
+
+
+def _counted(command):
+    def counted(*args, **kwargs):
+        global round_trips
+        round_trips += 1
+        return command(*args, **kwargs)
+    return counted
+
+
+def _counting_connect(connect):
+    def wrapper():
+        raw, *rest = connect()
+        for name in COUNTED_COMMANDS:
+            setattr(raw, name, _counted(getattr(raw, name)))
+        return (raw, *rest)
+    return wrapper
+
+
+def measure(label, iterations, request):
+    global round_trips
+    round_trips = 0
+    start = time.perf_counter()
+    for i in range(iterations):
+        response = request(i)
+        assert response.status_code == 200, (label, response.status_code, response.json)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {round_trips / iterations:5.1f} round trips/request"
+          f"  {elapsed / iterations * 1000:7.2f} ms/request")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    api.repo.pool._connect = _counting_connect(api.repo.pool._connect)
+    client = api.app.test_client()
+
+    name = f"bench_{uuid.uuid4().hex[:8]}"
+    user = client.post('/api/signup', json={
+        'username': name, 'email': f"{name}@example.com",
+        'password': 'bench', 'confirm_password': 'bench'
+    }).json
+    user_id = user['id']
+    task_ids = [
+        client.post('/api/tasks', json={'user_id': user_id, 'title': f"task {i}"}).json['id']
+        for i in range(iterations)
+    ]
+
+    measure("PUT /api/tasks/<id>", iterations, lambda i: client.put(
+        f"/api/tasks/{task_ids[i]}", json={'user_id': user_id, 'title': f"renamed {i}"}))
+    measure("PUT /api/tasks/<id> priority", iterations, lambda i: client.put(
+        f"/api/tasks/{task_ids[i]}", json={'user_id': user_id, 'priority': 'High'}))
+    measure("PATCH /api/tasks/completion", iterations, lambda i: client.patch(
+        f"/api/tasks/completion/{task_ids[i]}", json={'user_id': user_id, 'completed': True}))
+    measure("DELETE /api/tasks/<id>", iterations, lambda i: client.delete(
+        f"/api/tasks/{task_ids[i]}", query_string={'user_id': user_id}))
+
+    api.repo.delete_user(user_id)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Login throughput at several password hashing costs, inline vs the process pool.
+
+Simulates a login storm: `threads` request threads each verify passwords
+back to back, while one more thread keeps serving a cheap request (a small
+JSON encode) and records its latency. Inline, every request thread can be
+hashing at once and the hashes compete with other requests for the API
+worker's CPU; with PasswordHasher at most `workers` hashes run at a time,
+in separate processes. Results depend heavily on the core count.
+
+    cd todo_app && python benchmarks/bench_password_hashing.py [algorithm] [logins] [threads] [workers]
+
+Costs tried per algorithm are in COSTS; use the algorithm's default cost as
+the baseline when picking PASSWORD_COST.
+"""
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from passwords import PasswordHasher, hash_password  # noqa: E402
+
+COSTS = {
+    'scrypt': (8192, 16384, 32768),
+    'pbkdf2': (150000, 300000, 600000),
+    'bcrypt': (10, 11, 12),
+}
+PAYLOAD = {'tasks': [{'id': i, 'title': f"Task {i}", 'completed': i % 2} for i in range(50)]}
+
+
+def run(label, hasher, hashed, logins, threads):
+    stop = threading.Event()
+    cheap = []
+
+    def cheap_requests():
+        while not stop.is_set():
+            start = time.perf_counter()
+            json.dumps(PAYLOAD)
+            cheap.append(time.perf_counter() - start)
+            time.sleep(0.001)
+
+    background = threading.Thread(target=cheap_requests)
+    background.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        assert all(pool.map(lambda _: hasher.verify('correct horse', hashed), range(logins)))
+    wall = time.perf_counter() - start
+    stop.set()
+    background.join()
+
+    cheap.sort()
+    print(f"{label:<28} {logins / wall:7.1f} logins/s"
+          f"  cheap request p50 {statistics.median(cheap) * 1000:6.2f} ms"
+          f"  p99 {cheap[int(len(cheap) * 0.99)] * 1000:7.2f} ms")
+
+
+def main():
+    algorithm = sys.argv[1] if len(sys.argv) > 1 else 'scrypt'
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 2
+
+    for cost in COSTS[algorithm]:
+        hashed = hash_password('correct horse', algorithm, cost)
+        run(f"{algorithm} {cost} inline", PasswordHasher(algorithm, cost, workers=0), hashed, logins, threads)
+        pooled = PasswordHasher(algorithm, cost, workers=workers, max_pending=logins)
+        pooled.verify('warm up', hashed)
+        run(f"{algorithm} {cost} pool x{workers}", pooled, hashed, logins, threads)
+        pooled.shutdown()
+
+
+if __name__ == '__main__':
+    main()
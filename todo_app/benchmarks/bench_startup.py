@@ -0,0 +1,74 @@
+"""Time-to-first-frame of the Todo app.
+
+Starts the app in fresh processes, so every run pays cold import and KV costs.
+Each run records when imports finish, when build() returns and when the
+first frame is drawn, then quits. The parent reports the median of each.
+
+    cd todo_app && python benchmarks/bench_startup.py [runs]
+
+Whichever session file is in the working directory is used, so run once
+logged out and once with a saved session to cover both paths.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(HERE)
+# The app logs to stdout too; the child's result line starts with this
+MARKER = 'STARTUP_MARKS '
+
+
+def child():
+    start = time.perf_counter()
+    sys.path.insert(0, APP_DIR)
+    os.chdir(APP_DIR)
+
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    import main
+
+    imported = time.perf_counter()
+    marks = {'imports': imported - start}
+
+    class StartupApp(main.TodoApp):
+        def build(self):
+            root = super().build()
+            marks['build'] = time.perf_counter() - start
+            return root
+
+        def on_start(self):
+            def first_frame(*args):
+                Window.unbind(on_flip=first_frame)
+                marks['first_frame'] = time.perf_counter() - start
+                marks['screens_built'] = len(self.sm.screen_names)
+                print(MARKER + json.dumps(marks), flush=True)
+                Clock.schedule_once(lambda dt: self.stop(), 0)
+            Window.bind(on_flip=first_frame)
+
+    StartupApp().run()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child'], capture_output=True, text=True, check=True
+        ).stdout
+        line = next(line for line in output.splitlines() if line.startswith(MARKER))
+        results.append(json.loads(line[len(MARKER):]))
+
+    for key in ('imports', 'build', 'first_frame'):
+        print(f"{key:<12} median {statistics.median(r[key] for r in results) * 1000:8.1f} ms")
+    print(f"screens built before first frame: {results[-1]['screens_built']}")
+
+
+if __name__ == '__main__':
+    if '--child' in sys.argv:
+        child()
+    else:
+        main()
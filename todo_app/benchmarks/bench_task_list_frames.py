@@ -0,0 +1,103 @@
+"""Frame times while scrolling a task list of 10k tasks.
+
+Opens a window with either the virtualized TaskListView or the old layout
+(one TaskItemView per task in a BoxLayout inside a ScrollView), scrolls from
+top to bottom over a fixed number of frames and reports frame time
+percentiles, build time and how many task rows exist.
+
+    cd todo_app && python benchmarks/bench_task_list_frames.py [recycle|legacy] [tasks]
+"""
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+from kivy.metrics import dp  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.scrollview import ScrollView  # noqa: E402
+from kivymd.app import MDApp  # noqa: E402
+
+SCROLL_FRAMES = 600
+PRIORITIES = ('Low', 'Medium', 'High', 'Urgent')
+
+
+def fake_tasks(count):
+    return [
+        {'id': i, 'user_id': 1, 'title': f"Task {i}", 'description': f"Description of task {i}",
+         'due_date': '2025-06-01', 'priority': PRIORITIES[i % 4], 'completed': 0}
+        for i in range(1, count + 1)
+    ]
+
+
+class FrameBenchApp(MDApp):
+    def __init__(self, mode, count, **kwargs):
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.count = count
+        self.frame_times = []
+
+    def build(self):
+        Builder.load_file(os.path.join(os.path.dirname(__file__), '..', 'views', 'kv', 'task_item_view.kv'))
+        tasks = fake_tasks(self.count)
+        start = time.perf_counter()
+        if self.mode == 'recycle':
+            from views.widgets.task_list import TaskListView
+            self.list_view = Builder.load_string('''
+TaskListView:
+    RecycleBoxLayout:
+        orientation: 'vertical'
+        spacing: dp(12)
+        default_size: None, dp(100)
+        default_size_hint: 1, None
+        size_hint_y: None
+        height: self.minimum_height
+''')
+            assert isinstance(self.list_view, TaskListView)
+            self.list_view.set_tasks(tasks)
+        else:
+            from views.widgets.task_item import TaskItemView
+            self.list_view = ScrollView()
+            layout = BoxLayout(orientation='vertical', spacing=dp(12), size_hint_y=None)
+            layout.bind(minimum_height=layout.setter('height'))
+            for task in tasks:
+                layout.add_widget(TaskItemView(
+                    task_id=task['id'], title=task['title'], description=task['description'],
+                    due_date=task['due_date'], priority=task['priority'], completed=False
+                ))
+            self.list_view.add_widget(layout)
+        self.build_time = time.perf_counter() - start
+        Clock.schedule_once(self.start_scrolling, 1)
+        return self.list_view
+
+    def start_scrolling(self, dt):
+        self.frame = 0
+        Clock.schedule_interval(self.scroll_step, 0)
+
+    def scroll_step(self, dt):
+        if self.frame:
+            self.frame_times.append(dt * 1000)
+        self.frame += 1
+        self.list_view.scroll_y = max(0.0, 1 - self.frame / SCROLL_FRAMES)
+        if self.frame > SCROLL_FRAMES:
+            self.report()
+            self.stop()
+            return False
+
+    def report(self):
+        from views.widgets.task_item import TaskItemView
+        rows = sum(1 for widget in self.list_view.walk() if isinstance(widget, TaskItemView))
+        times = sorted(self.frame_times)
+        print(f"mode={self.mode} tasks={self.count} rows_alive={rows} build={self.build_time * 1000:.0f} ms")
+        print(f"frame ms: median={statistics.median(times):.2f}"
+              f" p95={times[int(len(times) * 0.95)]:.2f} max={times[-1]:.2f}"
+              f" over {len(times)} frames")
+
+
+if __name__ == '__main__':
+    mode = sys.argv[1] if len(sys.argv) > 1 else 'recycle'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    FrameBenchApp(mode, count).run()
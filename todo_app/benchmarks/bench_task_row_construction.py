@@ -0,0 +1,57 @@
+"""Per-row construction time and memory of TaskItemView.
+
+Builds rows the way a list page does, outside the RecycleView, and reports
+average construction time, Python memory allocated per row (tracemalloc) and
+how many Clock events the rows left scheduled.
+
+    cd todo_app && python benchmarks/bench_task_row_construction.py [rows]
+
+Run it on an older checkout to compare; rows there scheduled a deferred
+_after_init each and rebuilt the priority color maps on every priority change.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.lang import Builder  # noqa: E402
+from kivymd.app import MDApp  # noqa: E402
+
+PRIORITIES = ('Low', 'Medium', 'High', 'Urgent')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    MDApp()  # KivyMD widgets need a running app for theme_cls
+    Builder.load_file(os.path.join(os.path.dirname(__file__), '..', 'views', 'kv', 'task_item_view.kv'))
+    from views.widgets.task_item import TaskItemView
+
+    # Warm up: first construction pays for KV rule compilation and font loading
+    TaskItemView(task_id=0, title="warm up", priority="Low")
+
+    events_before = len(Clock.get_events())
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = [
+        TaskItemView(
+            task_id=i, title=f"Task {i}", description=f"Description of task {i}",
+            due_date='2025-06-01', priority=PRIORITIES[i % 4], completed=False
+        )
+        for i in range(1, count + 1)
+    ]
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    events = len(Clock.get_events()) - events_before
+
+    print(f"rows={len(rows)}")
+    print(f"construction: {elapsed / count * 1000:.3f} ms/row")
+    print(f"memory: {allocated / count / 1024:.1f} KiB/row")
+    print(f"clock events left scheduled: {events}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Cold import cost report, built on `python -X importtime`.
+
+Imports the given modules (by default every screen and the task controller)
+in a fresh interpreter with Kivy's argument parsing and console log off, then
+prints the slowest imports by cumulative time and whether the modules that
+should load lazily were pulled in anyway.
+
+    cd todo_app && python benchmarks/import_time_report.py [module ...]
+        [--top N] [--save report.json] [--compare report.json]
+
+Save a report before a change and compare against it afterwards to track
+cold import cost locally.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    'views.screens.login_screen',
+    'views.screens.signup_screen',
+    'views.screens.home_screen',
+    'views.screens.add_task_screen',
+    'views.screens.edit_task_screen',
+    'views.screens.profile_screen',
+    'views.screens.completed_tasks_screen',
+    'views.screens.loading_screen',
+    'controllers.task_controller',
+]
+
+# Should only be imported on first use, through views.lazy_widgets
+LAZY_MODULES = ['kivymd.uix.pickers', 'kivymd.uix.menu', 'kivymd.uix.dialog', 'kivymd.toast']
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure(modules):
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    code = '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr.strip().splitlines()[-1])
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            imports[name] = {'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000}
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--save')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+
+    imports = measure(args.modules)
+    # Top-level modules only, so packages aren't counted twice
+    total = sum(v['cumulative_ms'] for k, v in imports.items() if '.' not in k)
+    print(f"{len(imports)} modules imported, {total:.1f} ms total\n")
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    ranked = sorted(imports.items(), key=lambda item: item[1]['cumulative_ms'], reverse=True)
+    for name, times in ranked[:args.top]:
+        print(f"{times['cumulative_ms']:14.1f} {times['self_ms']:9.1f}  {name}")
+
+    print("\nDeferred modules:")
+    for name in LAZY_MODULES:
+        state = f"IMPORTED ({imports[name]['cumulative_ms']:.1f} ms)" if name in imports else "deferred"
+        print(f"  {name:<22} {state}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nTotal vs {args.compare}: {baseline['total_ms']:.1f} ms -> {total:.1f} ms")
+        dropped = sorted(set(baseline['imports']) - set(imports))
+        added = sorted(set(imports) - set(baseline['imports']))
+        print(f"  {len(dropped)} modules no longer imported, {len(added)} newly imported")
+        for name in added:
+            print(f"  + {name}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'modules': args.modules, 'total_ms': total, 'imports': imports}, f, indent=2)
+        print(f"\nSaved report to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
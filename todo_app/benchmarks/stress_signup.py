@@ -0,0 +1,78 @@
+"""Hammer POST /api/signup from many threads and check that duplicates never get in.
+
+Runs the Flask app in-process against the database in api/.env, on either
+DB_BACKEND. Every name is signed up `attempts` times concurrently, half of
+them reusing the email with a different username, so both UNIQUE indexes
+are raced. Each name must
+end with exactly one 201 and one users row; everything else must be a 409.
+The accounts are deleted afterwards. Exits non-zero on any violation.
+
+    cd todo_app && python benchmarks/stress_signup.py [names] [attempts] [threads]
+"""
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Cheap hashes, so the run stresses the insert path rather than the hasher
+os.environ.setdefault('PASSWORD_ALGORITHM', 'pbkdf2')
+os.environ.setdefault('PASSWORD_COST', '1000')
+os.environ.setdefault('PASSWORD_WORKERS', '0')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import app as api  # noqa: E402
+
+
+def main():
+    names = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    attempts = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+
+    prefix = f"stress_{uuid.uuid4().hex[:6]}"
+    jobs = []
+    for n in range(names):
+        for attempt in range(attempts):
+            # Odd attempts take a fresh username but collide on the email
+            username = f"{prefix}_{n}" if attempt % 2 == 0 else f"{prefix}_{n}_alt{attempt}"
+            jobs.append((n, username, f"{prefix}_{n}@example.com"))
+
+    def signup(job):
+        n, username, email = job
+        response = api.app.test_client().post('/api/signup', json={
+            'username': username, 'email': email, 'password': 'pw', 'confirm_password': 'pw'
+        })
+        return n, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(signup, jobs))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for _, status in results)
+    created = Counter(n for n, status in results if status == 201)
+    users = [api.repo.find_login(f"{prefix}_{n}") for n in range(names)]
+    users += [api.repo.find_login(f"{prefix}_{n}_alt{attempt}")
+              for n in range(names) for attempt in range(1, attempts, 2)]
+    rows_per_email = Counter(user['email'] for user in users if user)
+
+    problems = []
+    if set(statuses) - {201, 409}:
+        problems.append(f"unexpected statuses: {dict(statuses)}")
+    problems += [f"name {n}: {created[n]} signups succeeded" for n in range(names) if created[n] != 1]
+    problems += [f"{email}: {count} rows" for email, count in rows_per_email.items() if count != 1]
+
+    print(f"{len(jobs)} signups in {elapsed:.2f}s ({len(jobs) / elapsed:.0f}/s) with {threads} threads:"
+          f" {dict(statuses)}")
+    for problem in problems:
+        print(problem)
+
+    for user in users:
+        if user:
+            api.repo.delete_user(user['id'])
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
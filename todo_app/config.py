@@ -8,6 +8,17 @@ class Config:
         'base_url': os.environ.get('API_BASE_URL', 'https://bastrado.co'),
         'retry_attempts': 3,
         'retry_backoff_factor': 0.5,
+        'retry_jitter': 0.25,  # Backoff is randomized by +/- 25%
+        'pool_maxsize': 8,  # Keep-alive connections kept per host (UI loads + sync thread)
+        'connect_timeout': 3.05,
+        # Read timeouts in seconds per kind of endpoint; 'timeout' covers anything else
+        'timeouts': {
+            'auth': 15,
+            'read': 10,
+            'write': 10,
+            'sync': 20,
+            'bulk': 30,
+        },
         'timeout': 30
     }
 
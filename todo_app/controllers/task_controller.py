@@ -1,7 +1,8 @@
-from kivymd.uix.dialog import MDDialog
+from views.lazy_widgets import MDDialog
 from kivymd.uix.button import MDFlatButton, MDRaisedButton
 from kivy.clock import Clock
-from views.widgets.task_item import TaskItemView
+from utils.background import BackgroundLoader
+import json
 import logging
 from datetime import datetime, timedelta
 
@@ -12,15 +13,27 @@ class TaskController:
         self.app = app
         self.home_view = home_view
         self.model = api_service  # ApiService instance
+        self.store = api_service.store  # LocalTaskStore holding the outbox of unsynced changes
+        self.cache = api_service.cache  # In-memory tasks the screens read from, written through to the store
         self.home_view.controller = self
         self.current_filter = None
         self.completed_tasks_view = None  # Will be set later
-        self.prevent_double_loading = False  # Flag to prevent double loading
         self.dialog = None  # Store reference to active dialog
+        self.loader = BackgroundLoader()  # Shared by the task screens for their loads
 
         # Schedule cleanup every hour
         Clock.schedule_interval(self.check_and_prompt_task_cleanup, 3600)
 
+        # Refresh the lists when background sync brings in server changes
+        self.model.sync.add_listener(
+            lambda: Clock.schedule_once(lambda dt: self.reload_all_task_views())
+        )
+
+    def _queue_change(self, op, task_id, payload=None):
+        """Record a local mutation for the sync engine and wake it up"""
+        self.store.enqueue(self._current_user_id(), op, task_id, payload)
+        self.model.sync.request_sync()
+
     def set_completed_tasks_view(self, view):
         self.completed_tasks_view = view
 
@@ -38,13 +51,11 @@ class TaskController:
             'completed': False
         }
 
-        result = self.model.add_task(data)
-        if "error" in result:
-            logger.error(f"Failed to add task: {result['error']}")
-            return False
-        else:
-            self.prevent_double_loading = True
-            return True
+        # Saved locally right away; the sync engine swaps in the server id later
+        task_id = self.store.next_local_id()
+        self.cache.upsert_task(dict(data, id=task_id, completed=0, created_at=None))
+        self._queue_change('create', task_id, data)
+        return True
 
     def save_task(self):
         title = self.screen.ids.title_input.text
@@ -60,55 +71,37 @@ class TaskController:
         return self.create_task(title, description, due_date, priority)
 
     def load_uncompleted_tasks(self):
-        if not self.app.current_user:
-            return
-
-        user_id = self.app.current_user.id
-
-        def load_in_thread():
-            tasks = self.model.get_tasks(user_id=user_id, completed=False)
-            Clock.schedule_once(lambda dt: self._display_tasks(tasks, self.home_view))
-
-        import threading
-        threading.Thread(target=load_in_thread).start()
+        self.load_tasks(completed=False, target_view=self.home_view)
 
     def load_completed_tasks(self):
-        if not self.app.current_user or not self.completed_tasks_view:
-            return
-
-        user_id = self.app.current_user.id
-
-        def load_in_thread():
-            tasks = self.model.get_tasks(user_id=user_id, completed=True)
-            Clock.schedule_once(lambda dt: self._display_tasks(tasks, self.completed_tasks_view))
-
-        import threading
-        threading.Thread(target=load_in_thread).start()
+        if self.completed_tasks_view:
+            self.load_tasks(completed=True, target_view=self.completed_tasks_view)
 
     def load_tasks(self, completed=None, target_view=None):
         if not self.app.current_user:
             return
 
         user_id = self.app.current_user.id
-
-        def load_in_thread():
-            tasks = self.model.get_tasks(user_id=user_id, completed=completed)
-            Clock.schedule_once(lambda dt: self._display_tasks(tasks, target_view or self.home_view))
-
-        import threading
-        threading.Thread(target=load_in_thread).start()
+        view = target_view or self.home_view
+        # Same channel as the screen's own paging, so only the newest load is shown
+        self.loader.submit(
+            view.name, ('all', user_id, completed),
+            lambda: self.cache.get_tasks(user_id, completed=completed),
+            lambda tasks: self._display_tasks(tasks, view)
+        )
 
     def reload_all_task_views(self):
-        self.load_uncompleted_tasks()
-        if self.completed_tasks_view:
-            self.load_completed_tasks()
+        """Bring both lists up to date with the cache, e.g. after sync merged server changes"""
+        for view in (self.home_view, self.completed_tasks_view):
+            if view and hasattr(view, 'refresh_tasks'):
+                view.refresh_tasks()
 
     def get_all_tasks(self):
         if not self.app.current_user:
             return []
 
         user_id = self.app.current_user.id
-        tasks = self.model.get_tasks(user_id=user_id)
+        tasks = self.cache.get_tasks(user_id)
         logger.debug(f"All tasks: {len(tasks)} items")
         return tasks
 
@@ -116,57 +109,69 @@ class TaskController:
         if not view:
             return
 
-        if hasattr(view, 'on_tasks_data_loaded'):
-            view.on_tasks_data_loaded(tasks)
-            return
-
-        view.clear_tasks()
+        view.on_tasks_data_loaded(tasks)
         if not tasks:
             view.show_empty_message()
-            return
 
-        for task in tasks:
-            task_widget = TaskItemView(
-                task_id=task['id'],
-                title=task['title'],
-                description=task.get('description', ''),
-                priority=task.get('priority', ''),
-                completed=bool(task.get('completed', 0)),
-                due_date=task.get('due_date', ''),
-                controller=self
-            )
-            view.add_task_widget(task_widget)
+    def _current_user_id(self):
+        return self.app.current_user.id if self.app.current_user else None
 
     def toggle_task_completion(self, task_id, completed):
-        result = self.model.update_task_completion(task_id, completed)
-        if result:
-            self.reload_all_task_views()
-            return True
-        else:
+        task = self.cache.get_task(task_id)
+        if not task:
             logger.error(f"Error updating task completion for task ID: {task_id}")
             return False
 
+        task['completed'] = int(bool(completed))
+        self.cache.upsert_task(task)
+        # The row removes itself and each list re-pages from the cache when shown
+        self._queue_change('completion', task_id, {'completed': bool(completed)})
+        return True
+
     def delete_task(self, task_id):
-        if self.model.delete_task(task_id):
-            self.reload_all_task_views()
-            return True
-        else:
+        if not self.cache.get_task(task_id):
             logger.error(f"Error deleting task ID: {task_id}")
             return False
 
+        self.cache.delete_task(task_id)
+        self._queue_change('delete', task_id)
+        return True
+
+    def delete_tasks(self, task_ids):
+        """Delete several tasks; the sync engine sends them as one bulk request"""
+        for task_id in task_ids:
+            self.cache.delete_task(task_id)
+            self._queue_change('delete', task_id)
+        self.reload_all_task_views()
+        return True
+
+    def set_tasks_completion(self, task_ids, completed):
+        """Mark several tasks completed/uncompleted; synced as one bulk request"""
+        for task_id in task_ids:
+            task = self.cache.get_task(task_id)
+            if not task:
+                continue
+            task['completed'] = int(bool(completed))
+            self.cache.upsert_task(task)
+            self._queue_change('completion', task_id, {'completed': bool(completed)})
+        self.reload_all_task_views()
+        return True
+
     def update_task(self, task_id, title, description, due_date, priority):
+        task = self.cache.get_task(task_id)
+        if not task:
+            logger.error(f"Failed to update task ID: {task_id}")
+            return False
+
         data = {
             'title': title,
             'description': description,
             'due_date': due_date,
             'priority': priority
         }
-        result = self.model.update_task(task_id, data)
-        if result:
-            return True
-        else:
-            logger.error(f"Failed to update task ID: {task_id}")
-            return False
+        self.cache.upsert_task(dict(task, **data))
+        self._queue_change('update', task_id, dict(data, user_id=self._current_user_id()))
+        return True
 
     def filter_tasks(self, filter_type):
         self.current_filter = None if filter_type == "all" else filter_type
@@ -196,8 +201,7 @@ class TaskController:
         self.dialog.open()
 
     def edit_task(self, task_id):
-        tasks = self.get_tasks_sync()
-        task_data = next((t for t in tasks if t["id"] == task_id), None)
+        task_data = self.cache.get_task(task_id)
         if not task_data:
             logger.error(f"Task with ID {task_id} not found")
             return
@@ -212,10 +216,39 @@ class TaskController:
             return []
 
         user_id = self.app.current_user.id
-        return self.model.get_tasks(user_id=user_id, completed=completed)
+        return self.cache.get_tasks(user_id, completed=completed)
+
+    def get_tasks_page(self, completed=None, limit=10, cursor=None):
+        """Read one page of tasks from the local store; returns (tasks, next_cursor)."""
+        if not self.app.current_user:
+            return [], None
+
+        user_id = self.app.current_user.id
+        # The cursor is the last row's sort key, so rows removed from the
+        # screen since (toggled, deleted) don't shift the next page
+        tasks, next_after = self.cache.get_page(
+            user_id, completed=completed, limit=limit, after=json.loads(cursor) if cursor else None
+        )
+        return tasks, json.dumps(next_after) if next_after else None
+
+    def get_task_counts(self):
+        """Total/completed/pending counts straight from the cache indexes"""
+        if not self.app.current_user:
+            return {'total': 0, 'completed': 0, 'pending': 0}
+        return self.cache.counts(self.app.current_user.id)
+
+    def refresh_if_stale(self):
+        """Serve cached tasks as-is, but start a sync once they are older than the cache TTL"""
+        user_id = self._current_user_id()
+        if user_id is not None and self.cache.is_stale(user_id):
+            self.model.sync.request_sync()
 
     def invalidate_cache(self):
-        self.prevent_double_loading = False
+        """Forget the in-memory tasks and pull from the server again"""
+        user_id = self._current_user_id()
+        if user_id is not None:
+            self.cache.invalidate(user_id)
+            self.model.sync.request_sync()
 
     # ⏰ Scheduled method to check for old completed tasks
     def check_and_prompt_task_cleanup(self, dt):
@@ -236,32 +269,35 @@ class TaskController:
             except Exception as e:
                 logger.error(f"Invalid date format for task {task['id']}: {e}")
 
-        for task in old_tasks:
-            self.prompt_task_deletion(task)
+        if old_tasks:
+            self.prompt_task_deletion(old_tasks)
 
-    # 📢 Show a dialog asking if the user wants to delete an old completed task
-    def prompt_task_deletion(self, task):
-        task_id = task['id']
-        task_title = task['title']
+    # 📢 Show one dialog asking if the user wants to delete all old completed tasks
+    def prompt_task_deletion(self, tasks):
+        task_ids = [task['id'] for task in tasks]
+        if len(tasks) == 1:
+            text = f"The task '{tasks[0]['title']}' was completed over 24 hours ago.\nDelete it?"
+        else:
+            text = f"{len(tasks)} tasks were completed over 24 hours ago.\nDelete them?"
 
         if self.dialog:
             self.dialog.dismiss()
 
-        def delete_task_now(*args):
-            self.delete_task(task_id)
+        def delete_tasks_now(*args):
+            self.delete_tasks(task_ids)
             self.dialog.dismiss()
             self.dialog = None
 
-        def keep_task(*args):
+        def keep_tasks(*args):
             self.dialog.dismiss()
             self.dialog = None
 
         self.dialog = MDDialog(
-            title="Delete Old Task",
-            text=f"The task '{task_title}' was completed over 24 hours ago.\nDelete it?",
+            title="Delete Old Tasks",
+            text=text,
             buttons=[
-                MDFlatButton(text="KEEP", on_release=keep_task),
-                MDRaisedButton(text="DELETE", on_release=delete_task_now),
+                MDFlatButton(text="KEEP", on_release=keep_tasks),
+                MDRaisedButton(text="DELETE", on_release=delete_tasks_now),
             ],
         )
         self.dialog.open()
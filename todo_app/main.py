@@ -1,33 +1,27 @@
 from kivymd.app import MDApp
-from kivy.uix.screenmanager import ScreenManager
 from kivy.core.window import Window
-from kivy.lang import Builder
 from kivy.config import Config
 from kivy.clock import Clock
 from kivy.properties import ObjectProperty, BooleanProperty
 import os
 import json
 import logging
+import time
 from kivy.logger import Logger as KivyLogger
 import sys
 # Models
 from models.user import User
 from models.task import Task
 
-# Views (Screens)
-from views.screens.login_screen import LoginScreen
-from views.screens.signup_screen import SignupScreen
-from views.screens.home_screen import HomeView
-from views.screens.add_task_screen import AddTaskView
-from views.screens.profile_screen import ProfileScreen
-from views.screens.completed_tasks_screen import CompletedTasksView
-from views.screens.loading_screen import LoadingScreen  
-from views.screens.edit_task_screen import EditTaskScreen
+# Views: screens are imported and built on first navigation
+from views.widgets.lazy_screen_manager import LazyScreenManager
 # Controllers and Services
 from controllers.login_controller import LoginController
 from controllers.signup_controller import SignupController
 from controllers.task_controller import TaskController
 from services.api_service import ApiService
+from services.async_api_service import AsyncApiService
+from utils.async_bridge import AsyncioBridge
 from kivy.utils import platform
 
 if platform == "android":
@@ -60,29 +54,15 @@ class TodoApp(MDApp):
         super().__init__(**kwargs)
 
         self.api_service = ApiService()
-
-        # Load KV files
-        kv_files = [
-            'task_item_view.kv',
-            'side_bar_view.kv',
-            'edit_task_screen.kv',
-            'home_screen.kv',
-            'login_screen.kv',
-            'signup_screen.kv',
-            'add_task_screen.kv',
-            'profile_screen.kv',
-            'completed_tasks_screen.kv',
-            'loading_screen.kv'
-        ]
-        kv_directory = os.path.join(os.path.dirname(__file__), 'views', 'kv')
-        for kv_file in kv_files:
-            try:
-                kv_path = os.path.join(kv_directory, kv_file)
-                if kv_path not in Builder.files:
-                    Builder.load_file(kv_path)
-            except Exception as e:
-                print(f"Error loading {kv_file}: {str(e)}")
-                raise
+        # Concurrent reads run as coroutines on one loop thread instead of a thread each
+        self.async_api = AsyncApiService()
+        self.async_bridge = AsyncioBridge()
+        self.login_controller = None
+        self.signup_controller = None
+        self.task_controller = None
+        # {'access_token', 'refresh_token', 'access_expires_at'} of the signed-in user
+        self.tokens = None
+        self._token_refresh = None
 
     def build(self):
         self.theme_cls.primary_palette = "Blue"
@@ -95,67 +75,151 @@ class TodoApp(MDApp):
         logger.info(f"Running on platform: {platform}")
     
 
-        self.sm = ScreenManager()
-
-        # Create screen instances
-        self.login_screen = LoginScreen(name='login')
-        self.signup_screen = SignupScreen(name='signup')
-        self.home_screen = HomeView(name='home')
-        self.add_task_screen = AddTaskView(name='add_task')
-        self.edit_task_screen = EditTaskScreen(name='edit_task')
-        self.profile_screen = ProfileScreen(name='profile')
-        self.completed_tasks_screen = CompletedTasksView(name='completed_tasks')
-        self.loading_screen = LoadingScreen(name='loading')
-
-        # Add screens
-        self.sm.add_widget(self.login_screen)
-        self.sm.add_widget(self.signup_screen)
-        self.sm.add_widget(self.home_screen)
-        self.sm.add_widget(self.add_task_screen)
-        self.sm.add_widget(self.edit_task_screen)
-        self.sm.add_widget(self.profile_screen)
-        self.sm.add_widget(self.completed_tasks_screen)
-        self.sm.add_widget(self.loading_screen)
-
+        self.sm = LazyScreenManager()
+        self._register_screens()
 
         self.task = Task()
 
-        logger.info("Initializing controllers")
-
-        # Initialize controllers
-        self.login_controller = LoginController(app=self, view=self.login_screen,api=self.api_service)
-        self.signup_controller = SignupController(app=self, view=self.signup_screen,api=self.api_service)
-        self.task_controller = TaskController(app=self, home_view=self.home_screen, api_service=self.api_service)
-        self.completed_tasks_screen.controller = self.task_controller
-        self.add_task_screen.controller = self.task_controller
-        self.task_controller.set_completed_tasks_view(self.completed_tasks_screen)
-        self.task_controller.view = self.add_task_screen  
-        self.profile_screen.controller = self.task_controller
-
-        self.signup_screen.controller = self.signup_controller
-
-        logger.info("Checking for existing session")
-
-        # Auto-login if session exists
+        # Auto-login from the cached profile; the server copy is fetched off the UI thread
         logger.info("Checking for existing session")
-        user_id = self.load_session()
-        if user_id:
+        session = self.load_session()
+        if session and session.get("user") and session.get("tokens"):
+            # Signed session tokens: trust the saved profile until the server
+            # rejects the refresh token, and skip the get_user round trip
+            logger.info(f"Restoring token session for user ID: {session['user_id']}")
+            self.login_user(session["user"], tokens=session["tokens"])
+        elif session:
+            user_id = session.get("user_id")
+            cached_user = session.get("user")
             logger.info(f"Found session for user ID: {user_id}")
-            user_data = self.api_service.get_user(user_id)
-            if user_data:
-                logger.info("User data retrieved, logging in")
-                Clock.schedule_once(lambda dt: self.task_controller.load_completed_tasks(), 1)
-                self.login_user(user_data)
-                self.sm.current = "home"
+            if cached_user:
+                self.login_user(cached_user)
             else:
-                logger.warning("User data not found, going to loading screen")
                 self.sm.current = "loading"
+            have_cached = bool(cached_user)
+            self.async_bridge.submit(
+                self.async_api.get_user(user_id),
+                lambda user_data: self._on_session_restored(user_id, user_data, have_cached)
+            )
         else:
             logger.info("No session found, going to login screen")
             self.sm.current = "login"
 
         return self.sm
 
+    def _register_screens(self):
+        register = self.sm.register
+        register('login', 'views.screens.login_screen:LoginScreen', ['login_screen.kv'],
+                 setup=self._setup_login)
+        register('signup', 'views.screens.signup_screen:SignupScreen', ['signup_screen.kv'],
+                 setup=self._setup_signup)
+        register('home', 'views.screens.home_screen:HomeView',
+                 ['task_item_view.kv', 'side_bar_view.kv', 'home_screen.kv'], setup=self._setup_home)
+        register('add_task', 'views.screens.add_task_screen:AddTaskView', ['add_task_screen.kv'],
+                 setup=self._setup_add_task)
+        register('edit_task', 'views.screens.edit_task_screen:EditTaskScreen', ['edit_task_screen.kv'])
+        register('profile', 'views.screens.profile_screen:ProfileScreen', ['profile_screen.kv'],
+                 setup=self._attach_task_controller)
+        register('completed_tasks', 'views.screens.completed_tasks_screen:CompletedTasksView',
+                 ['task_item_view.kv', 'completed_tasks_screen.kv'], setup=self._setup_completed_tasks)
+        register('loading', 'views.screens.loading_screen:LoadingScreen', ['loading_screen.kv'])
+
+    # Screen setup callbacks, run by LazyScreenManager right after a screen is built
+
+    def _setup_login(self, screen):
+        self.login_controller = LoginController(app=self, view=screen, api=self.api_service)
+
+    def _setup_signup(self, screen):
+        self.signup_controller = SignupController(app=self, view=screen, api=self.api_service)
+        screen.controller = self.signup_controller
+
+    def _setup_home(self, screen):
+        logging.getLogger(__name__).info("Initializing task controller")
+        self.task_controller = TaskController(app=self, home_view=screen, api_service=self.api_service)
+
+    def _attach_task_controller(self, screen):
+        # The task controller is created with the home screen
+        self.sm.get_screen('home')
+        screen.controller = self.task_controller
+
+    def _setup_add_task(self, screen):
+        self._attach_task_controller(screen)
+        self.task_controller.view = screen
+
+    def _setup_completed_tasks(self, screen):
+        self._attach_task_controller(screen)
+        self.task_controller.set_completed_tasks_view(screen)
+
+    def _on_session_restored(self, user_id, user_data, have_cached):
+        logger = logging.getLogger(__name__)
+        if have_cached:
+            # Already signed in from the cache; refresh the profile unless the user moved on
+            if user_data and self.current_user and self.current_user.id == user_id:
+                self.current_user = User.from_dict(user_data)
+                self.save_session(user_data)
+            return
+        if user_data:
+            logger.info("User data retrieved, logging in")
+            self.login_user(user_data)
+        else:
+            logger.warning("User data not found, going to login screen")
+            self.sm.current = "login"
+
+    def _tokens_from(self, payload):
+        """Session tokens from a login or refresh response, or None"""
+        if not payload.get("access_token"):
+            return None
+        return {
+            "access_token": payload["access_token"],
+            # A refresh response renews the access token only
+            "refresh_token": payload.get("refresh_token") or (self.tokens or {}).get("refresh_token"),
+            "access_expires_at": time.time() + payload.get("expires_in", 0),
+        }
+
+    def _set_tokens(self, tokens):
+        """Use `tokens` for API calls and renew the access token a minute before it expires"""
+        self.tokens = tokens
+        access_token = tokens["access_token"] if tokens else None
+        self.api_service.set_access_token(access_token)
+        self.async_api.set_access_token(access_token)
+        if self._token_refresh is not None:
+            self._token_refresh.cancel()
+            self._token_refresh = None
+        if tokens and tokens.get("refresh_token"):
+            delay = max(0, tokens.get("access_expires_at", 0) - time.time() - 60)
+            self._token_refresh = Clock.schedule_once(self._refresh_access_token, delay)
+
+    def _refresh_access_token(self, dt=None):
+        self._token_refresh = None
+        if not self.tokens:
+            return
+        refresh_token = self.tokens["refresh_token"]
+        self.async_bridge.submit(
+            self.async_api.refresh_session(refresh_token),
+            lambda result: self._on_session_refreshed(refresh_token, result)
+        )
+
+    def _on_session_refreshed(self, refresh_token, result):
+        logger = logging.getLogger(__name__)
+        if not self.tokens or self.tokens.get("refresh_token") != refresh_token:
+            return  # Logged out or in again meanwhile
+        if "error" in result:
+            if result.get("status") == 401:
+                logger.warning("Saved session was rejected, going to login screen")
+                self.logout_user()
+            else:
+                # Offline: keep the session and try again later
+                self._token_refresh = Clock.schedule_once(self._refresh_access_token, 60)
+            return
+        self._set_tokens(self._tokens_from(result))
+        if self.current_user and self.current_user.id == result["user"]["id"]:
+            self.current_user = User.from_dict(result["user"])
+            self.save_session(result["user"])
+
+    def on_stop(self):
+        self.api_service.sync.stop()
+        self.async_bridge.stop(cleanup=self.async_api.aclose())
+
     def check_session(self, dt):
         from threading import Thread
         Thread(target=self._do_session_check).start()
@@ -163,7 +227,7 @@ class TodoApp(MDApp):
     def _do_session_check(self):
         import time
         time.sleep(1.5)
-        is_logged_in = self.login_controller.is_logged_in()
+        is_logged_in = self.is_authenticated
         Clock.schedule_once(lambda dt: self.navigate_to('home' if is_logged_in else 'login'), 0)
 
     def navigate_to(self, screen_name):
@@ -176,10 +240,21 @@ class TodoApp(MDApp):
         if os.path.exists("user_session.json"):
             with open("user_session.json", "r") as f:
                 session = json.load(f)
-                return session.get("user_id")
+                return session if session.get("user_id") else None
         return None
 
-    def login_user(self, user_data):
+    def save_session(self, user_data):
+        """Remember the user and their profile so the next start can skip the network"""
+        session_data = {
+            "user_id": user_data.get("id"),
+            "user": {key: user_data.get(key) for key in ("id", "username", "email", "created_at")},
+        }
+        if self.tokens:
+            session_data["tokens"] = self.tokens
+        with open("user_session.json", "w") as f:
+            json.dump(session_data, f)
+
+    def login_user(self, user_data, tokens=None):
         logger = logging.getLogger(__name__)
         logger.info(f"Setting up user session")
         
@@ -190,14 +265,13 @@ class TodoApp(MDApp):
         
         self.current_user = User.from_dict(user_data)
         self.is_authenticated = True
+        self._set_tokens(tokens or self._tokens_from(user_data))
+        self.api_service.sync.start(self.current_user.id)
         
         # Save session
         try:
-            with open("user_session.json", "w") as f:
-                import json
-                session_data = {"user_id": self.current_user.id}
-                json.dump(session_data, f)
-                logger.info(f"Saved session for user ID: {self.current_user.id}")
+            self.save_session(user_data)
+            logger.info(f"Saved session for user ID: {self.current_user.id}")
         except Exception as e:
             logger.error(f"Failed to save session: {str(e)}")
         
@@ -205,6 +279,14 @@ class TodoApp(MDApp):
         return True
 
     def logout_user(self):
+        self.api_service.sync.stop()
+        if self.tokens:
+            self.async_bridge.submit(
+                self.async_api.revoke_session(self.tokens["access_token"], self.tokens["refresh_token"])
+            )
+            self._set_tokens(None)
+        if self.current_user:
+            self.api_service.cache.invalidate(self.current_user.id)
         self.current_user = None
         self.is_authenticated = False
         if os.path.exists("user_session.json"):
@@ -1,37 +1,38 @@
 import requests
 import os
-import json
 import logging
 from config import Config
+from services.local_store import LocalTaskStore
+from services.task_cache import TaskCache
+from services.sync_engine import SyncEngine
+from services.http_session import build_session
 from utils.exceptions import AuthenticationError, NetworkError, APIError
 # Setup logger
 
 logger = logging.getLogger(__name__)
 
+# Failures that say nothing about the request itself: the server is down or
+# overloaded, timed out, or wants a fresh session. Writes failing with these
+# are worth retrying unchanged.
+RETRYABLE_STATUSES = (401, 408, 429)
+
+
+def _retryable(status):
+    return status >= 500 or status in RETRYABLE_STATUSES
+
+
 class ApiService:
-    def __init__(self, config=Config.API_CONFIG, timeout=30):  
+    def __init__(self, config=Config.API_CONFIG):
         self.base_url = config['base_url']
-        self.session = requests.Session()
-        self.users_file = "users.json"
-        self.tasks_file = "tasks.json"
-        self.timeout = timeout
-        self._ensure_data_files()
+        self.config = config
+        self.session = build_session(config)
+        # Offline-first: screens read the local store, the sync engine talks to the API
+        self.store = LocalTaskStore(self._get_absolute_path("tasks.db"))
+        self.cache = TaskCache(self.store)
+        self.sync = SyncEngine(self, self.store, self.cache)
         # Log initialization
         logger.info(f"ApiService initialized with base URL: {self.base_url}")
 
-    def _ensure_data_files(self):
-        """Ensure necessary data files exist for offline fallback"""
-        try:
-            # Implement the missing method
-            for file_path in [self.users_file, self.tasks_file]:
-                file_path = self._get_absolute_path(file_path)
-                if not os.path.exists(file_path):
-                    with open(file_path, "w") as f:
-                        json.dump([], f)
-                    logger.info(f"Created file: {file_path}")
-        except Exception as e:
-            logger.error(f"Error ensuring data files: {str(e)}")
-
     def _get_absolute_path(self, file_name):
         """Get the absolute path for a file considering the platform"""
         try:
@@ -51,12 +52,29 @@ class ApiService:
         return abs_path
 
 
+    def set_access_token(self, token):
+        """Send `token` as the bearer token from now on; None stops sending one"""
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+        else:
+            self.session.headers.pop('Authorization', None)
+
+    def _timeout(self, kind):
+        """(connect, read) timeout for a kind of endpoint from API_CONFIG['timeouts']"""
+        read = self.config.get('timeouts', {}).get(kind, self.config.get('timeout', 30))
+        return (self.config.get('connect_timeout', read), read)
+
     def _handle_connection_error(self, e, fallback=None):
         """Handle connection errors with proper logging"""
         logger.error(f"API connection error: {str(e)}")
         if fallback is not None:
             return fallback
-        return {"error": f"Network error: {str(e)}"}
+        return {"error": f"Network error: {str(e)}", "retryable": True}
+
+    def _write_failed(self, response, message):
+        """Error result for a write the server answered without success"""
+        status = response.status_code
+        return {"error": message, "status": status, "retryable": _retryable(status)}
 
     def authenticate_user(self, username, password):
         """Authenticate user with the API"""
@@ -97,7 +115,7 @@ class ApiService:
             payload = {"username": username, "password": password}
             logger.debug(f"Sending POST request to {url} with data {payload}")
 
-            response = requests.post(url, json=payload, timeout=self.timeout)
+            response = self.session.post(url, json=payload, timeout=self._timeout('auth'))
             logger.debug(f"Received response: {response.status_code} - {response.text}")
 
             if response.status_code == 401:
@@ -126,7 +144,7 @@ class ApiService:
         }
         try:
             logger.info(f"Attempting to register user: {username}")
-            response = self.session.post(url, json=data, timeout=10)
+            response = self.session.post(url, json=data, timeout=self._timeout('auth'))
             
             if response.status_code == 201:
                 logger.info("Registration successful")
@@ -142,7 +160,7 @@ class ApiService:
         url = f"{self.base_url}/api/users/{user_id}"
         try:
             logger.info(f"Getting user with ID: {user_id}")
-            response = self.session.get(url, timeout=10)
+            response = self.session.get(url, timeout=self._timeout('read'))
             
             if response.status_code == 200:
                 return response.json()
@@ -153,37 +171,86 @@ class ApiService:
             logger.error(f"Error getting user: {str(e)}")
             return None
 
-    def get_tasks(self, user_id, completed=None):
-        """Get tasks for a user"""
-        url = f"{self.base_url}/api/tasks/{user_id}"
+    def get_user_stats(self, user_id):
+        """Task totals, overdue count and per-priority breakdown; None on failure"""
+        url = f"{self.base_url}/api/users/{user_id}/stats"
+        try:
+            response = self.session.get(url, timeout=self._timeout('read'))
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Get user stats failed with status code: {response.status_code}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error getting user stats: {str(e)}")
+            return None
+
+    def get_tasks(self, user_id, completed=None, limit=None, cursor=None):
+        """Get tasks for a user.
+
+        Without `limit` the full list is returned. With `limit` a single page is
+        requested and a dict `{"tasks": [...], "next_cursor": ...}` is returned;
+        pass `next_cursor` back as `cursor` to fetch the following page.
+        """
+        url = f"{self.base_url}/api/tasks"
         params = {"user_id": user_id}
         if completed is not None:
-            params["completed"] = completed
+            params["completed"] = int(bool(completed))
+        if limit is not None:
+            params["limit"] = limit
+        if cursor:
+            params["cursor"] = cursor
+        def failed(error):
+            # Paged callers (the sync engine) need to tell "no tasks" from "request failed"
+            return [] if limit is None else {"tasks": [], "next_cursor": None, "error": error}
+
         try:
-            logger.info(f"Getting tasks for user ID: {user_id}, completed={completed}")
-            response = self.session.get(url, params=params, timeout=10)
+            logger.info(f"Getting tasks for user ID: {user_id}, completed={completed}, limit={limit}")
+            response = self.session.get(url, params=params, timeout=self._timeout('read'))
             
             if response.status_code == 200:
                 return response.json()
                 
             logger.warning(f"Get tasks failed: {response.status_code}, {response.text}")
-            return []
+            return failed(f"HTTP {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            return self._handle_connection_error(e, failed(str(e)))
+
+    def get_task_changes(self, user_id, since=None):
+        """Get tasks changed and ids deleted since the `next_since` of a previous call.
+
+        Returns {"tasks", "deleted", "full_resync", "next_since"}; with no `since`
+        (or one the server no longer has tombstones for) `full_resync` is true and
+        `tasks` is the user's complete list.
+        """
+        url = f"{self.base_url}/api/tasks/changes"
+        params = {"user_id": user_id}
+        if since:
+            params["since"] = since
+        try:
+            logger.info(f"Getting task changes for user ID: {user_id} since {since}")
+            response = self.session.get(url, params=params, timeout=self._timeout('sync'))
+
+            if response.status_code == 200:
+                return response.json()
+
+            logger.warning(f"Get task changes failed: {response.status_code}, {response.text}")
+            return {"error": f"HTTP {response.status_code}"}
         except requests.exceptions.RequestException as e:
-            return self._handle_connection_error(e, [])
+            return self._handle_connection_error(e)
 
     def add_task(self, task_data):
         """Add a new task"""
         url = f"{self.base_url}/api/tasks"
         try:
             logger.info(f"Adding task: {task_data.get('title', 'Unknown')}")
-            response = self.session.post(url, json=task_data, timeout=10)
+            response = self.session.post(url, json=task_data, timeout=self._timeout('write'))
             
             if response.status_code == 201:
                 logger.info("Task added successfully")
                 return response.json()
                 
             logger.warning(f"Add task failed: {response.status_code}, {response.text}")
-            return {"error": "Failed to add task"}
+            return self._write_failed(response, "Failed to add task")
         except requests.exceptions.RequestException as e:
             return self._handle_connection_error(e)
 
@@ -192,47 +259,87 @@ class ApiService:
         url = f"{self.base_url}/api/tasks/{task_id}"
         try:
             logger.info(f"Updating task ID: {task_id}")
-            response = self.session.put(url, json=task_data, timeout=10)
+            response = self.session.put(url, json=task_data, timeout=self._timeout('write'))
             
             if response.status_code == 200:
                 logger.info("Task updated successfully")
                 return response.json()
                 
             logger.warning(f"Update task failed: {response.status_code}, {response.text}")
-            return {"error": "Failed to update task"}
+            return self._write_failed(response, "Failed to update task")
         except requests.exceptions.RequestException as e:
             return self._handle_connection_error(e)
 
-    def delete_task(self, task_id):
-        """Delete a task"""
+    def delete_task(self, task_id, user_id=None):
+        """Delete a task, scoped to `user_id` when given.
+
+        True once the task is gone, including when it already was (404);
+        None when the server couldn't be reached or was unavailable, False
+        when it refused the delete.
+        """
         url = f"{self.base_url}/api/tasks/{task_id}"
+        params = {"user_id": user_id} if user_id is not None else None
         try:
             logger.info(f"Deleting task ID: {task_id}")
-            response = self.session.delete(url, timeout=10)
+            response = self.session.delete(url, params=params, timeout=self._timeout('write'))
             
             if response.status_code == 200:
                 logger.info("Task deleted successfully")
                 return True
-                
+            if response.status_code == 404:
+                logger.info(f"Task {task_id} was already deleted")
+                return True
+
             logger.warning(f"Delete task failed: {response.status_code}, {response.text}")
-            return False
+            return None if _retryable(response.status_code) else False
         except requests.exceptions.RequestException as e:
             logger.error(f"Network error while deleting task: {str(e)}")
-            return False
+            return None
 
-    def update_task_completion(self, task_id, completed):
-        """Update task completion status"""
+    def update_task_completion(self, task_id, completed, user_id=None):
+        """Update task completion status, scoped to `user_id` when given"""
         url = f"{self.base_url}/api/tasks/completion/{task_id}"
         data = {"completed": completed}
+        if user_id is not None:
+            data["user_id"] = user_id
         try:
             logger.info(f"Updating task completion for ID: {task_id} to {completed}")
-            response = self.session.patch(url, json=data, timeout=10)
+            response = self.session.patch(url, json=data, timeout=self._timeout('write'))
             
             if response.status_code == 200:
                 logger.info("Task completion updated successfully")
                 return response.json()
                 
             logger.warning(f"Update completion failed: {response.status_code}, {response.text}")
-            return {"error": "Failed to update completion"}
+            return self._write_failed(response, "Failed to update completion")
         except requests.exceptions.RequestException as e:
-            return self._handle_connection_error(e)
\ No newline at end of file
+            return self._handle_connection_error(e)
+
+    def _bulk_request(self, method, path, user_id, key, items, action):
+        """Send one /api/tasks/bulk request and return its per-item results"""
+        url = f"{self.base_url}{path}"
+        try:
+            logger.info(f"Bulk {action} of {len(items)} tasks for user ID: {user_id}")
+            response = self.session.request(
+                method, url, json={"user_id": user_id, key: items}, timeout=self._timeout('bulk')
+            )
+
+            if response.status_code == 200:
+                return response.json()["results"]
+
+            logger.warning(f"Bulk {action} failed: {response.status_code}, {response.text}")
+            return self._write_failed(response, f"Failed to {action} tasks")
+        except requests.exceptions.RequestException as e:
+            return self._handle_connection_error(e)
+
+    def add_tasks_bulk(self, user_id, tasks):
+        """Create several tasks in one request"""
+        return self._bulk_request("POST", "/api/tasks/bulk", user_id, "tasks", tasks, "create")
+
+    def update_tasks_completion_bulk(self, user_id, updates):
+        """Set completion for several tasks; `updates` is [{"id": .., "completed": ..}]"""
+        return self._bulk_request("PATCH", "/api/tasks/bulk/completion", user_id, "updates", updates, "update")
+
+    def delete_tasks_bulk(self, user_id, task_ids):
+        """Delete several tasks in one request"""
+        return self._bulk_request("DELETE", "/api/tasks/bulk", user_id, "ids", task_ids, "delete")
@@ -0,0 +1,208 @@
+import logging
+import httpx
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class _BearerAuth(httpx.Auth):
+    """Adds the service's current access token as each request is sent.
+
+    Runs on the loop thread, so the UI thread only ever swaps the token
+    string and never touches the client's headers while requests are in
+    flight. A request that sets its own Authorization header keeps it.
+    """
+
+    def __init__(self, service):
+        self._service = service
+
+    def auth_flow(self, request):
+        token = self._service.access_token
+        if token and 'Authorization' not in request.headers:
+            request.headers['Authorization'] = f"Bearer {token}"
+        yield request
+
+
+class AsyncApiService:
+    """asyncio counterpart of ApiService for the task and user endpoints.
+
+    Same method names and return shapes as the blocking service, but every
+    method is a coroutine running on one shared httpx.AsyncClient. With HTTP/2
+    the concurrent requests of a screen (say, profile stats plus both task
+    lists) share one connection instead of each taking an OS thread and a
+    socket. Run the coroutines with utils.async_bridge.AsyncioBridge.
+    """
+
+    def __init__(self, config=Config.API_CONFIG):
+        self.base_url = config['base_url']
+        self.config = config
+        self._client = None
+        self.access_token = None
+
+    @property
+    def client(self):
+        # Created on first use, inside the loop that will run it
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                # With an explicit transport the client's own limits and http2
+                # are ignored, so the transport gets them. httpx retries
+                # connection failures only, never a request the server saw
+                transport=httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=self.config.get('pool_maxsize', 8)),
+                    retries=self.config.get('retry_attempts', 3),
+                ),
+                headers={'Accept-Encoding': 'gzip'},
+                auth=_BearerAuth(self),
+            )
+        return self._client
+
+    def _timeout(self, kind):
+        read = self.config.get('timeouts', {}).get(kind, self.config.get('timeout', 30))
+        return httpx.Timeout(read, connect=self.config.get('connect_timeout', read))
+
+    def set_access_token(self, token):
+        """Send `token` as the bearer token from now on; None stops sending one"""
+        # A single attribute swap, safe from any thread; _BearerAuth reads it per request
+        self.access_token = token or None
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_user(self, user_id):
+        """Get user by ID"""
+        try:
+            response = await self.client.get(f"/api/users/{user_id}", timeout=self._timeout('read'))
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Get user failed with status code: {response.status_code}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"Error getting user: {str(e)}")
+            return None
+
+    async def refresh_session(self, refresh_token):
+        """New access token and profile for a saved refresh token.
+
+        Returns the server's payload, {"error": ..., "status": 401} when the
+        token was rejected, or {"error": ...} when the server was unreachable.
+        """
+        try:
+            response = await self.client.post(
+                "/api/session/refresh", json={"refresh_token": refresh_token}, timeout=self._timeout('auth')
+            )
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Session refresh failed with status code: {response.status_code}")
+            return {"error": "Session refresh failed", "status": response.status_code}
+        except httpx.HTTPError as e:
+            return self._handle_connection_error(e)
+
+    async def revoke_session(self, access_token, refresh_token):
+        """Revoke both tokens of a session on the server; True on success"""
+        try:
+            response = await self.client.request(
+                "DELETE", "/api/session", json={"refresh_token": refresh_token},
+                headers={"Authorization": f"Bearer {access_token}"}, timeout=self._timeout('auth')
+            )
+            return response.status_code == 200
+        except httpx.HTTPError as e:
+            logger.error(f"Network error while revoking session: {str(e)}")
+            return False
+
+    async def get_user_stats(self, user_id):
+        """Task totals, overdue count and per-priority breakdown; None on failure"""
+        try:
+            response = await self.client.get(f"/api/users/{user_id}/stats", timeout=self._timeout('read'))
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Get user stats failed with status code: {response.status_code}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"Error getting user stats: {str(e)}")
+            return None
+
+    async def get_tasks(self, user_id, completed=None, limit=None, cursor=None):
+        """Get tasks for a user; paged like ApiService.get_tasks when `limit` is given"""
+        params = {"user_id": user_id}
+        if completed is not None:
+            params["completed"] = int(bool(completed))
+        if limit is not None:
+            params["limit"] = limit
+        if cursor:
+            params["cursor"] = cursor
+
+        def failed(error):
+            return [] if limit is None else {"tasks": [], "next_cursor": None, "error": error}
+
+        try:
+            response = await self.client.get("/api/tasks", params=params, timeout=self._timeout('read'))
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Get tasks failed: {response.status_code}, {response.text}")
+            return failed(f"HTTP {response.status_code}")
+        except httpx.HTTPError as e:
+            logger.error(f"API connection error: {str(e)}")
+            return failed(str(e))
+
+    async def add_task(self, task_data):
+        """Add a new task"""
+        try:
+            response = await self.client.post("/api/tasks", json=task_data, timeout=self._timeout('write'))
+            if response.status_code == 201:
+                return response.json()
+            logger.warning(f"Add task failed: {response.status_code}, {response.text}")
+            return {"error": "Failed to add task"}
+        except httpx.HTTPError as e:
+            return self._handle_connection_error(e)
+
+    async def update_task(self, task_id, task_data):
+        """Update a task"""
+        try:
+            response = await self.client.put(
+                f"/api/tasks/{task_id}", json=task_data, timeout=self._timeout('write')
+            )
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Update task failed: {response.status_code}, {response.text}")
+            return {"error": "Failed to update task"}
+        except httpx.HTTPError as e:
+            return self._handle_connection_error(e)
+
+    async def update_task_completion(self, task_id, completed, user_id=None):
+        """Update task completion status, scoped to `user_id` when given"""
+        data = {"completed": completed}
+        if user_id is not None:
+            data["user_id"] = user_id
+        try:
+            response = await self.client.patch(
+                f"/api/tasks/completion/{task_id}", json=data, timeout=self._timeout('write')
+            )
+            if response.status_code == 200:
+                return response.json()
+            logger.warning(f"Update completion failed: {response.status_code}, {response.text}")
+            return {"error": "Failed to update completion"}
+        except httpx.HTTPError as e:
+            return self._handle_connection_error(e)
+
+    async def delete_task(self, task_id, user_id=None):
+        """Delete a task, scoped to `user_id` when given; returns True on success"""
+        params = {"user_id": user_id} if user_id is not None else None
+        try:
+            response = await self.client.delete(
+                f"/api/tasks/{task_id}", params=params, timeout=self._timeout('write')
+            )
+            if response.status_code == 200:
+                return True
+            logger.warning(f"Delete task failed: {response.status_code}, {response.text}")
+            return False
+        except httpx.HTTPError as e:
+            logger.error(f"Network error while deleting task: {str(e)}")
+            return False
+
+    def _handle_connection_error(self, e):
+        logger.error(f"API connection error: {str(e)}")
+        return {"error": f"Network error: {str(e)}"}
@@ -1,143 +1,138 @@
+"""Direct database access for server-side tooling (scripts, imports, workers).
+
+A thin layer over the API's repository, so tooling shares the API's schema,
+password hashing and per-user counters instead of keeping its own SQL.
+`Database` is thread-safe: every call checks a connection out of the pool,
+which replaces connections the server dropped and keeps each connection's
+prepared statements, so concurrent workers don't queue on one socket.
+
+Pass `repo=` to share an existing repository (e.g. the API's `app.repo`).
+"""
+import os
+import sys
+from datetime import date, timedelta
+
 import mysql.connector
-from datetime import datetime
-from models.task import Task
+
+# The API modules import each other as top-level modules
+API_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api')
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from models.task import Task  # noqa: E402
+from mysql_repository import MySQLRepository  # noqa: E402
+from passwords import hash_password, verify_password  # noqa: E402
+from task_stats import PRIORITIES  # noqa: E402
+
+# Same tombstone retention as the API
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+def _priority_name(priority):
+    """Accept the Task model's 0-3 priorities as well as the names the schema stores."""
+    if isinstance(priority, int):
+        return PRIORITIES[priority] if 0 <= priority < len(PRIORITIES) else 'Low'
+    return priority or 'Low'
 
 
 class Database:
-    def __init__(self, host='localhost', user='root', password='123AZE', database='todo_app'):
+    def __init__(self, host='localhost', user='root', password='123AZE', database='todo_app',
+                 port=3306, pool_size=5, repo=None):
         self.host = host
+        self.port = port
         self.user = user
         self.password = password
         self.database = database
-        self.conn = None
-        self.initialize()
+        self._owns_repo = repo is None
+        self.repo = repo or MySQLRepository.connect(
+            host, port, user, password, database, size=pool_size
+        )
+        if self._owns_repo:
+            self.initialize()
 
     def initialize(self):
         # First connect without specifying database to create it if needed
         temp_conn = mysql.connector.connect(
             host=self.host,
+            port=self.port,
             user=self.user,
             password=self.password
         )
         temp_cursor = temp_conn.cursor()
-
-        # Create database if it doesn't exist
         temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
         temp_conn.close()
 
-        # Connect to the newly created database
-        self.conn = mysql.connector.connect(
-            host=self.host,
-            user=self.user,
-            password=self.password,
-            database=self.database
-        )
-        cursor = self.conn.cursor()
-
-        # Create users table
-        cursor.execute('''CREATE TABLE IF NOT EXISTS users 
-                          (id INT AUTO_INCREMENT PRIMARY KEY, 
-                          username VARCHAR(255), 
-                          password VARCHAR(255), 
-                          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-
-        # Create tasks table
-        cursor.execute('''CREATE TABLE IF NOT EXISTS tasks
-                          (id INT AUTO_INCREMENT PRIMARY KEY, 
-                          user_id INT, 
-                          title VARCHAR(255),
-                          description TEXT,
-                          due_date VARCHAR(255),
-                          priority INT DEFAULT 0,
-                          completed BOOLEAN DEFAULT 0,
-                          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                          FOREIGN KEY (user_id) REFERENCES users(id))''')
-
-        self.conn.commit()
-
-    def create_user(self, username, password):
-        cursor = self.conn.cursor()
-        cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, password))
-        self.conn.commit()
-        return cursor.lastrowid
+        # Share the API's versioned schema instead of a divergent copy
+        self.repo.initialize(TOMBSTONE_RETENTION)
+
+    def create_user(self, username, password, email=None):
+        return self.repo.create_user(username, email, hash_password(password))
 
     def get_user_by_credentials(self, username, password):
-        cursor = self.conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE username = %s AND password = %s", (username, password))
-        return cursor.fetchone()
+        user = self.repo.find_login(username)
+        if not user or not verify_password(password, user['password']):
+            return None
+        return user
 
     def get_user_by_username(self, username):
-        cursor = self.conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-        return cursor.fetchone()
+        return self.repo.find_login(username)
 
     def get_user_by_id(self, id):
-        cursor = self.conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE id = %s", (id,))
-        return cursor.fetchone()
+        return self.repo.get_user(id)
 
     def create_task(self, title, description, due_date, priority, completed, user_id):
-        cursor = self.conn.cursor()
-        cursor.execute("""INSERT INTO tasks (title, description, due_date, priority, completed, user_id)
-                          VALUES (%s, %s, %s, %s, %s, %s)""",
-                       (title, description, due_date, priority, completed, user_id))
-        self.conn.commit()
-        return cursor.lastrowid
+        return self.add_task({
+            'title': title,
+            'description': description,
+            'due_date': due_date,
+            'priority': priority,
+            'completed': completed,
+            'user_id': user_id,
+        })
 
     def get_tasks_by_user(self, user_id, completed=None):
-        cursor = self.conn.cursor(dictionary=True)
-        if completed is None:
-            cursor.execute("SELECT * FROM tasks WHERE user_id = %s", (user_id,))
-        else:
-            cursor.execute("SELECT * FROM tasks WHERE user_id = %s AND completed = %s", (user_id, completed))
-        return cursor.fetchall()
+        return self.repo.list_tasks(user_id, None if completed is None else int(completed))
 
     def add_task(self, task_data: dict):
-        cursor = self.conn.cursor()
-        cursor.execute("""INSERT INTO tasks (title, description, due_date, priority, completed, user_id)
-                          VALUES (%s, %s, %s, %s, %s, %s)""",
-                       (
-                           task_data.get("title"),
-                           task_data.get("description"),
-                           task_data.get("due_date"),
-                           task_data.get("priority", 0),
-                           task_data.get("completed", 0),
-                           task_data.get("user_id")
-                       ))
-        self.conn.commit()
-        return cursor.lastrowid
+        task = self.repo.create_task(task_data.get("user_id"), {
+            'title': task_data.get("title"),
+            'description': task_data.get("description"),
+            'due_date': task_data.get("due_date") or None,
+            'priority': _priority_name(task_data.get("priority", "Low")),
+            'completed': int(bool(task_data.get("completed", 0))),
+        })
+        return task['id']
 
     def delete_task(self, task_id):
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM tasks WHERE id = %s", (task_id,))
-        self.conn.commit()
+        self.repo.delete_task(task_id, None)
 
     def get_task_by_id(self, task_id):
-        cursor = self.conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-        task_dict = cursor.fetchone()
-        if task_dict:
-            return Task.from_dict(task_dict)
-        return None
+        task_dict = self.repo.get_task(task_id)
+        if not task_dict:
+            return None
+        # The Task model predates the ENUM and DATE columns
+        due_date = task_dict['due_date']
+        return Task.from_dict({
+            **task_dict,
+            'priority': PRIORITIES.index(task_dict['priority']),
+            'due_date': due_date.isoformat() if isinstance(due_date, date) else due_date,
+        })
 
     def update_task(self, task_id, title, description, due_date, priority):
         try:
-            cursor = self.conn.cursor()
-            query = """UPDATE tasks 
-                       SET title = %s, description = %s, due_date = %s, priority = %s 
-                       WHERE id = %s"""
-            cursor.execute(query, (title, description, due_date, priority, task_id))
-            self.conn.commit()
+            self.repo.update_task(task_id, None, {
+                'title': title,
+                'description': description,
+                'due_date': due_date or None,
+                'priority': _priority_name(priority),
+            })
             print(f"Task {task_id} updated successfully in database")
-        except mysql.connector.Error as e:
+        except self.repo.errors + self.repo.busy_errors as e:
             print(f"Database error while updating task {task_id}: {e}")
-            self.conn.rollback()
 
     def update_task_completion(self, task_id, completed):
-        cursor = self.conn.cursor()
-        cursor.execute("UPDATE tasks SET completed = %s WHERE id = %s", (int(completed), task_id))
-        self.conn.commit()
+        self.repo.set_completion(task_id, None, int(completed))
 
     def close(self):
-        if self.conn:
-            self.conn.close()
+        if self._owns_repo:
+            self.repo.close()
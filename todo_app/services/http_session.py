@@ -0,0 +1,45 @@
+import random
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Safe to resend: repeating them leaves the server in the same state
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+# Transient gateway/overload answers; 503 is what the API sends when its DB pool is exhausted
+RETRY_STATUSES = (502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """Retry whose exponential backoff is spread by +/- `jitter`, so clients don't retry in lockstep"""
+    jitter = 0.0
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff * random.uniform(1 - self.jitter, 1 + self.jitter) if backoff else 0
+
+
+def build_session(config):
+    """requests.Session with a sized keep-alive pool and retries for idempotent calls only"""
+    retry_class = type('ApiRetry', (JitteredRetry,), {'jitter': config.get('retry_jitter', 0.0)})
+    retry = retry_class(
+        total=config.get('retry_attempts', 3),
+        backoff_factor=config.get('retry_backoff_factor', 0.5),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.get('pool_connections', 1),
+        pool_maxsize=config.get('pool_maxsize', 8),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip', 'Connection': 'keep-alive'})
+    logger.debug(f"HTTP session: pool_maxsize={adapter._pool_maxsize}, retries={retry.total}")
+    return session
@@ -0,0 +1,226 @@
+import json
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value):
+    """Sortable epoch seconds for a created_at value from the API or the store"""
+    if not value:
+        return time.time()
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+class LocalTaskStore:
+    """Durable on-device copy of the user's tasks plus a queue of unsynced changes.
+
+    Screens read from here so they never wait on the network. Tasks created
+    offline get negative ids until the sync engine learns their server id.
+    All access goes through one SQLite connection guarded by a lock, so the UI
+    thread and the sync thread can share the store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                created_ts REAL NOT NULL,
+                data TEXT NOT NULL
+            )''')
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_local_tasks_user ON tasks (user_id, completed, created_ts)"
+            )
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                op TEXT NOT NULL,
+                task_id INTEGER NOT NULL,
+                payload TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0
+            )''')
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        logger.info(f"Local task store opened at {path}")
+
+    # --- reads -------------------------------------------------------------
+
+    def get_tasks(self, user_id, completed=None, limit=None, offset=0):
+        query, params = "SELECT data FROM tasks WHERE user_id = ?", [user_id]
+        if completed is not None:
+            query += " AND completed = ?"
+            params.append(int(bool(completed)))
+        query += " ORDER BY created_ts, id"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def get_task(self, task_id):
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return json.loads(row['data']) if row else None
+
+    # --- writes ------------------------------------------------------------
+
+    def _upsert(self, task):
+        # Local tasks have no created_at yet; an update keeps the created_ts
+        # they were first stored under so they don't move to the end
+        self.conn.execute(
+            "INSERT INTO tasks (id, user_id, completed, created_ts, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET user_id = excluded.user_id, completed = excluded.completed, "
+            "data = excluded.data, created_ts = CASE WHEN ? THEN excluded.created_ts ELSE created_ts END",
+            (task['id'], task['user_id'], int(bool(task.get('completed'))),
+             _timestamp(task.get('created_at')), json.dumps(task, sort_keys=True),
+             bool(task.get('created_at')))
+        )
+
+    def upsert_task(self, task):
+        with self._lock, self.conn:
+            self._upsert(task)
+
+    def delete_task(self, task_id):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def next_local_id(self):
+        """Negative placeholder id for a task created before the server has seen it"""
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'next_local_id'").fetchone()
+            local_id = int(row['value']) if row else -1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_local_id', ?)", (str(local_id - 1),)
+            )
+        return local_id
+
+    def _current_data(self, user_id):
+        rows = self.conn.execute("SELECT id, data FROM tasks WHERE user_id = ?", (user_id,))
+        return {row['id']: row['data'] for row in rows}
+
+    def replace_tasks(self, user_id, tasks):
+        """Make the store match a full server snapshot, keeping tasks with unsynced changes.
+
+        Returns True if anything changed.
+        """
+        with self._lock, self.conn:
+            pending = self._pending_task_ids(user_id)
+            current = self._current_data(user_id)
+            changed = False
+            for task in tasks:
+                if task['id'] in pending:
+                    continue
+                if current.get(task['id']) != json.dumps(task, sort_keys=True):
+                    self._upsert(task)
+                    changed = True
+            server_ids = {task['id'] for task in tasks}
+            stale = [task_id for task_id in current
+                     if task_id not in server_ids and task_id not in pending and task_id > 0]
+            for task_id in stale:
+                self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            return changed or bool(stale)
+
+    def apply_changes(self, user_id, tasks, deleted_ids):
+        """Merge a server delta, skipping tasks with unsynced local changes.
+
+        Returns (tasks written, ids removed).
+        """
+        with self._lock, self.conn:
+            pending = self._pending_task_ids(user_id)
+            current = self._current_data(user_id)
+            # The overlap window resends recent rows; only count real changes
+            applied = [task for task in tasks
+                       if task['id'] not in pending and current.get(task['id']) != json.dumps(task, sort_keys=True)]
+            removed = [task_id for task_id in deleted_ids if task_id in current and task_id not in pending]
+            for task in applied:
+                self._upsert(task)
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in removed])
+        return applied, removed
+
+    def get_meta(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key, value):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # --- outbox ------------------------------------------------------------
+
+    def _pending_task_ids(self, user_id):
+        rows = self.conn.execute("SELECT DISTINCT task_id FROM outbox WHERE user_id = ?", (user_id,))
+        return {row['task_id'] for row in rows}
+
+    def enqueue(self, user_id, op, task_id, payload=None):
+        with self._lock, self.conn:
+            if op == 'delete' and task_id < 0:
+                # Never reached the server: drop the queued create instead of sending both
+                self.conn.execute("DELETE FROM outbox WHERE task_id = ?", (task_id,))
+                return
+            self.conn.execute(
+                "INSERT INTO outbox (user_id, op, task_id, payload) VALUES (?, ?, ?, ?)",
+                (user_id, op, task_id, json.dumps(payload) if payload is not None else None)
+            )
+
+    def pending_ops(self, user_id):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, op, task_id, payload, attempts FROM outbox WHERE user_id = ? ORDER BY seq",
+                (user_id,)
+            ).fetchall()
+        return [
+            {'seq': row['seq'], 'op': row['op'], 'task_id': row['task_id'],
+             'payload': json.loads(row['payload']) if row['payload'] else None, 'attempts': row['attempts']}
+            for row in rows
+        ]
+
+    def has_later_ops(self, task_id, seq):
+        """True if changes to this task were queued after operation `seq`"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM outbox WHERE task_id = ? AND seq > ? LIMIT 1", (task_id, seq)
+            ).fetchone()
+        return row is not None
+
+    def complete_ops(self, seqs):
+        with self._lock, self.conn:
+            self.conn.executemany("DELETE FROM outbox WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def discard_ops(self, task_id):
+        """Drop every queued operation for a task"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM outbox WHERE task_id = ?", (task_id,))
+
+    def fail_op(self, seq):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE outbox SET attempts = attempts + 1 WHERE seq = ?", (seq,))
+
+    def remap_task_id(self, local_id, task):
+        """Swap a local placeholder id for the server's row once its create is synced"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (local_id,))
+            self._upsert(task)
+            self.conn.execute("UPDATE outbox SET task_id = ? WHERE task_id = ?", (task['id'], local_id))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
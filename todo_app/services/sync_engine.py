@@ -0,0 +1,231 @@
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# What became of one pushed batch
+SENT, REJECTED, UNREACHABLE = 'sent', 'rejected', 'unreachable'
+
+
+def _outcome(result):
+    """SENT, REJECTED or UNREACHABLE for an ApiService write result"""
+    if not result:
+        # delete_task answers None when the server couldn't be reached
+        return UNREACHABLE if result is None else REJECTED
+    if isinstance(result, dict) and "error" in result:
+        return UNREACHABLE if result.get("retryable") else REJECTED
+    return SENT
+
+
+class SyncEngine:
+    """Background replication between the LocalTaskStore and the Flask API.
+
+    A daemon thread pushes queued local mutations in order, then pulls the
+    tasks that changed on the server since the last pull. Conflicts are resolved per task: a task
+    with unsynced local changes keeps the local version until those changes
+    are pushed, otherwise the server wins. Listeners registered with
+    `add_listener` are called from the sync thread whenever the store changes.
+    Task rows are written through the TaskCache so the screens' in-memory copy
+    stays current; the outbox is read from the store directly.
+    """
+
+    # Queued operations the server keeps rejecting are dropped after this many
+    # pushes. Pushes that never reached it don't count; the queue waits instead,
+    # RETRY_DELAY seconds at first and twice as long after each failure, up to
+    # the sync interval.
+    MAX_ATTEMPTS = 5
+    RETRY_DELAY = 2
+    # Consecutive queued operations of these kinds go out as one bulk request
+    BULK_OPS = ('completion', 'delete')
+
+    def __init__(self, api_service, store, cache, interval=60):
+        self.api = api_service
+        self.store = store
+        self.cache = cache
+        self.interval = interval
+        self.user_id = None
+        self._listeners = []
+        self._wakeup = threading.Event()
+        self._stopped = None
+        self._thread = None
+        self._backoff = 0
+        self._retry_at = 0
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def start(self, user_id):
+        self.stop()
+        self.user_id = user_id
+        self._backoff = self._retry_at = 0
+        # Each run gets its own stop flag so a restart can't revive the old thread
+        self._stopped = threading.Event()
+        self._wakeup.set()
+        self._thread = threading.Thread(
+            target=self._run, args=(user_id, self._stopped), name="task-sync", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Sync engine started for user ID: {user_id}")
+
+    def stop(self):
+        if self._thread:
+            self._stopped.set()
+            self._wakeup.set()
+            self._thread = None
+        self.user_id = None
+
+    def request_sync(self):
+        """Sync as soon as possible, e.g. right after a local mutation"""
+        self._wakeup.set()
+
+    def _run(self, user_id, stopped):
+        while not stopped.is_set():
+            timeout = self.interval
+            if self._backoff:
+                timeout = min(timeout, max(self._retry_at - time.monotonic(), 0))
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+            if stopped.is_set():
+                break
+            try:
+                self.sync_once(user_id)
+            except Exception as e:
+                logger.error(f"Sync failed: {e}", exc_info=True)
+
+    def sync_once(self, user_id):
+        changed = self.push(user_id)
+        changed = self.pull(user_id) or changed
+        if changed:
+            self._notify()
+
+    def _notify(self):
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Sync listener failed: {e}")
+
+    # --- push --------------------------------------------------------------
+
+    def push(self, user_id):
+        """Send queued mutations in order; stops at the first failure to keep ordering"""
+        changed = False
+        if time.monotonic() < self._retry_at:
+            return changed
+        # Server ids learned during this push, for later ops on the same new task
+        remapped = {}
+        ops = self.store.pending_ops(user_id)
+        while ops:
+            batch = self._take_batch(ops, remapped)
+            outcome = self._send(user_id, batch, remapped)
+            if outcome == SENT:
+                self.store.complete_ops([op['seq'] for op in batch])
+                changed = True
+                continue
+            if outcome == UNREACHABLE:
+                # Nothing was decided about these ops; keep the queue as it is
+                self._backoff = min(self._backoff * 2 or self.RETRY_DELAY, self.interval)
+                self._retry_at = time.monotonic() + self._backoff
+                logger.warning(f"Push paused for {self._backoff}s, server unreachable")
+                return changed
+
+            retry = [op for op in batch if op['attempts'] + 1 < self.MAX_ATTEMPTS]
+            dropped = [op for op in batch if op not in retry]
+            for op in dropped:
+                logger.error(f"Dropping {op['op']} of task {op['task_id']} after {self.MAX_ATTEMPTS} attempts")
+                if op['op'] == 'create':
+                    self._abandon_local_task(op['task_id'], ops)
+                    changed = True
+            self.store.complete_ops([op['seq'] for op in dropped])
+            for op in retry:
+                self.store.fail_op(op['seq'])
+            if retry:
+                break
+        self._backoff = 0
+        return changed
+
+    def _abandon_local_task(self, task_id, ops):
+        """Forget a task whose create the server never accepted.
+
+        Without this the placeholder row would stay on screen for good (a
+        pull only prunes server ids), with its later edits stuck in the queue.
+        """
+        self.cache.delete_task(task_id)
+        self.store.discard_ops(task_id)
+        ops[:] = [op for op in ops if op['task_id'] != task_id]
+
+    def _take_batch(self, ops, remapped):
+        """Pop the next op plus directly following ops it can share a bulk request with"""
+        batch = []
+        while ops:
+            op = ops[0]
+            op['task_id'] = remapped.get(op['task_id'], op['task_id'])
+            bulk = op['op'] in self.BULK_OPS and op['task_id'] > 0
+            if batch and not (bulk and op['op'] == batch[0]['op']):
+                break
+            batch.append(ops.pop(0))
+            if not bulk:
+                break
+        return batch
+
+    def _send(self, user_id, batch, remapped):
+        if len(batch) > 1:
+            return self._send_bulk(user_id, batch)
+
+        op = batch[0]
+        task_id, payload = op['task_id'], op['payload']
+        if op['op'] == 'create':
+            result = self.api.add_task(payload)
+            if _outcome(result) == SENT:
+                self.cache.remap_task_id(task_id, result)
+                remapped[task_id] = result['id']
+            return _outcome(result)
+        if task_id < 0:
+            # The create for this task was never accepted
+            return REJECTED
+        if op['op'] == 'update':
+            result = self.api.update_task(task_id, payload)
+            if _outcome(result) == SENT:
+                self._apply_result(op, result)
+            return _outcome(result)
+        if op['op'] == 'completion':
+            result = self.api.update_task_completion(task_id, payload['completed'], user_id=user_id)
+            if _outcome(result) == SENT:
+                self._apply_result(op, {'completed': int(bool(result['completed']))})
+            return _outcome(result)
+        if op['op'] == 'delete':
+            return _outcome(self.api.delete_task(task_id, user_id=user_id))
+        logger.error(f"Unknown sync operation: {op['op']}")
+        return SENT
+
+    def _apply_result(self, op, fields):
+        """Write the server's answer into the cache unless a newer local edit is queued"""
+        if not self.store.has_later_ops(op['task_id'], op['seq']):
+            self.cache.patch_task(op['task_id'], **fields)
+
+    def _send_bulk(self, user_id, batch):
+        # Tasks already gone on the server come back as not_found; nothing left to sync for them
+        if batch[0]['op'] == 'delete':
+            results = self.api.delete_tasks_bulk(user_id, [op['task_id'] for op in batch])
+        else:
+            updates = [{'id': op['task_id'], 'completed': op['payload']['completed']} for op in batch]
+            results = self.api.update_tasks_completion_bulk(user_id, updates)
+        return _outcome(results)
+
+    # --- pull --------------------------------------------------------------
+
+    def pull(self, user_id):
+        """Fetch what changed on the server since the last pull and merge it"""
+        since_key = f"sync_since:{user_id}"
+        changes = self.api.get_task_changes(user_id, self.store.get_meta(since_key))
+        if "error" in changes:
+            logger.warning(f"Pull skipped, server unavailable: {changes['error']}")
+            return False
+        if changes['full_resync']:
+            changed = self.cache.replace_tasks(user_id, changes['tasks'])
+        else:
+            changed = self.cache.apply_changes(user_id, changes['tasks'], changes['deleted'])
+        self.store.set_meta(since_key, changes['next_since'])
+        self.cache.mark_fresh(user_id)
+        return changed
@@ -0,0 +1,192 @@
+import bisect
+import threading
+import time
+import logging
+from services.local_store import _timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class _UserTasks:
+    """One user's cached tasks plus a sorted (created_ts, id) index per completion state"""
+
+    def __init__(self):
+        self.tasks = {}
+        self.keys = {}
+        self.index = {False: [], True: []}
+        self.fresh_at = None  # monotonic time of the last server refresh
+
+    def put(self, task):
+        previous = self.keys.get(task['id'])
+        self.remove(task['id'])
+        task = dict(task)
+        # Local tasks have no created_at yet; keep the key we sorted them under
+        if task.get('created_at') or previous is None:
+            key = (_timestamp(task.get('created_at')), task['id'])
+        else:
+            key = previous
+        self.tasks[task['id']] = task
+        self.keys[task['id']] = key
+        bisect.insort(self.index[bool(task.get('completed'))], key)
+
+    def remove(self, task_id):
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return False
+        keys = self.index[bool(task.get('completed'))]
+        del keys[bisect.bisect_left(keys, self.keys.pop(task_id))]
+        return True
+
+
+class TaskCache:
+    """Write-through in-memory cache in front of the LocalTaskStore.
+
+    Each user's tasks are loaded from SQLite once and then served from a dict
+    keyed by task id, with sorted indexes for completed and uncompleted tasks
+    so a page or a count never scans the whole list. Every write goes to the
+    store and the dict together, and the sync engine merges server deltas
+    through `apply_changes`, so refreshing a list never re-reads or
+    re-downloads tasks that did not change.
+
+    A user's entry counts as stale `ttl` seconds after the last successful
+    pull (`mark_fresh`); stale entries are still served while a sync runs.
+    `invalidate` drops entries outright, e.g. on logout.
+    """
+
+    def __init__(self, store, ttl=300):
+        self.store = store
+        self.ttl = ttl
+        self._users = {}  # user_id -> _UserTasks
+        self._owners = {}  # task_id -> user_id
+        self._lock = threading.RLock()
+
+    def _user_tasks(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                entry = self._users[user_id] = _UserTasks()
+                for task in self.store.get_tasks(user_id):
+                    self._put(entry, task)
+            return entry
+
+    def _put(self, entry, task):
+        entry.put(task)
+        self._owners[task['id']] = task['user_id']
+
+    def _remove(self, task_id):
+        user_id = self._owners.pop(task_id, None)
+        if user_id in self._users:
+            self._users[user_id].remove(task_id)
+
+    # --- reads -------------------------------------------------------------
+
+    def _keys(self, entry, completed):
+        if completed is None:
+            return sorted(entry.index[False] + entry.index[True])
+        return entry.index[bool(completed)]
+
+    def get_tasks(self, user_id, completed=None, limit=None):
+        with self._lock:
+            entry = self._user_tasks(user_id)
+            keys = self._keys(entry, completed)[:limit]
+            return [dict(entry.tasks[task_id]) for _, task_id in keys]
+
+    def get_page(self, user_id, completed=None, limit=10, after=None):
+        """(tasks, next_after): up to `limit` tasks listed after the `after` key.
+
+        Keys are (created_ts, id) pairs. Paging by key rather than offset
+        keeps the next page right after rows before it were removed or
+        moved to the other completion state. next_after is None on the last page.
+        """
+        with self._lock:
+            entry = self._user_tasks(user_id)
+            keys = self._keys(entry, completed)
+            start = bisect.bisect_right(keys, tuple(after)) if after is not None else 0
+            page = keys[start:start + limit]
+            next_after = page[-1] if start + limit < len(keys) else None
+            return [dict(entry.tasks[task_id]) for _, task_id in page], next_after
+
+    def get_task(self, task_id):
+        with self._lock:
+            user_id = self._owners.get(task_id)
+            if user_id is not None:
+                return dict(self._users[user_id].tasks[task_id])
+        return self.store.get_task(task_id)
+
+    def counts(self, user_id):
+        """{'total', 'completed', 'pending'} without copying any tasks"""
+        with self._lock:
+            entry = self._user_tasks(user_id)
+            completed, pending = len(entry.index[True]), len(entry.index[False])
+        return {'total': completed + pending, 'completed': completed, 'pending': pending}
+
+    # --- writes ------------------------------------------------------------
+
+    def upsert_task(self, task):
+        with self._lock:
+            self.store.upsert_task(task)
+            self._put(self._user_tasks(task['user_id']), task)
+
+    def patch_task(self, task_id, **fields):
+        """Update some fields of a task in place, e.g. from a mutation response"""
+        with self._lock:
+            task = self.get_task(task_id)
+            if not task:
+                return None
+            task.update(fields)
+            self.upsert_task(task)
+            return task
+
+    def delete_task(self, task_id):
+        with self._lock:
+            self.store.delete_task(task_id)
+            self._remove(task_id)
+
+    def remap_task_id(self, local_id, task):
+        with self._lock:
+            self.store.remap_task_id(local_id, task)
+            self._remove(local_id)
+            self._put(self._user_tasks(task['user_id']), task)
+
+    def replace_tasks(self, user_id, tasks):
+        """Apply a full server snapshot; returns True if anything changed"""
+        with self._lock:
+            changed = self.store.replace_tasks(user_id, tasks)
+            if changed:
+                # Reload from the store, which knows which tasks have pending local edits
+                fresh_at = self._users[user_id].fresh_at if user_id in self._users else None
+                self.invalidate(user_id)
+                self._user_tasks(user_id).fresh_at = fresh_at
+            return changed
+
+    def apply_changes(self, user_id, tasks, deleted_ids):
+        """Merge a server delta; returns True if anything changed"""
+        with self._lock:
+            applied, removed = self.store.apply_changes(user_id, tasks, deleted_ids)
+            entry = self._user_tasks(user_id)
+            for task in applied:
+                self._put(entry, task)
+            for task_id in removed:
+                self._remove(task_id)
+        logger.debug(f"Merged {len(applied)} changed and {len(removed)} deleted tasks for user {user_id}")
+        return bool(applied or removed)
+
+    # --- freshness ---------------------------------------------------------
+
+    def mark_fresh(self, user_id):
+        with self._lock:
+            self._user_tasks(user_id).fresh_at = time.monotonic()
+
+    def is_stale(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            return entry is None or entry.fresh_at is None or time.monotonic() - entry.fresh_at > self.ttl
+
+    def invalidate(self, user_id=None):
+        """Drop cached tasks (all users when user_id is None); the store is untouched"""
+        with self._lock:
+            user_ids = list(self._users) if user_id is None else [user_id]
+            for uid in user_ids:
+                entry = self._users.pop(uid, None)
+                for task_id in entry.tasks if entry else ():
+                    self._owners.pop(task_id, None)
@@ -1,4 +1,5 @@
 from datetime import datetime
+import csv
 import json
 from pathlib import Path
 from typing import List, Dict, Optional, Union
@@ -123,6 +124,19 @@ class TaskService:
             return output
         raise ValueError("Format must be 'json' or 'csv'")
 
+    def write_export(self, fp, format: str = 'json') -> None:
+        """Write the export to a text file object piece by piece instead of building one string"""
+        if format == 'json':
+            for chunk in json.JSONEncoder(indent=2).iterencode(self.tasks):
+                fp.write(chunk)
+        elif format == 'csv':
+            columns = ['id', 'title', 'description', 'due_date', 'priority', 'completed', 'created_at']
+            writer = csv.DictWriter(fp, fieldnames=columns, extrasaction='ignore', restval='')
+            writer.writeheader()
+            writer.writerows(self.tasks)
+        else:
+            raise ValueError("Format must be 'json' or 'csv'")
+
     def import_tasks(self, data: Union[str, List[Dict]], format: str = 'json') -> bool:
         try:
             if format == 'json':
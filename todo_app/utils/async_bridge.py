@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import logging
+from kivy.clock import Clock
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncioBridge:
+    """One asyncio event loop on a daemon thread, with results delivered through Kivy's Clock.
+
+    `submit` schedules a coroutine from any thread and calls `callback` with
+    its result on the Kivy main thread, so widgets can be touched directly.
+    All coroutines share the loop, and so the AsyncApiService's connections.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="asyncio-bridge", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro, callback=None, error_callback=None):
+        """Run `coro` on the loop; returns a concurrent.futures.Future"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def done(f):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                if error_callback:
+                    Clock.schedule_once(lambda dt: error_callback(error), 0)
+                else:
+                    logger.error(f"Async task failed: {error}")
+            elif callback:
+                Clock.schedule_once(lambda dt: callback(f.result()), 0)
+
+        future.add_done_callback(done)
+        return future
+
+    def gather(self, *coros, callback=None, error_callback=None):
+        """Run several coroutines concurrently; `callback` gets their results as a list"""
+        async def run_all():
+            return await asyncio.gather(*coros)
+        return self.submit(run_all(), callback, error_callback)
+
+    def stop(self, cleanup=None):
+        """Stop the loop, after awaiting the `cleanup` coroutine if given"""
+        if cleanup is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(cleanup, self.loop).result(timeout=5)
+            except Exception as e:
+                logger.warning(f"Async cleanup failed: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
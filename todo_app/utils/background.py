@@ -0,0 +1,79 @@
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundLoader:
+    """Small shared worker pool for screen loads, with coalescing and generations.
+
+    Every load belongs to a channel (one per screen). Submitting bumps the
+    channel's generation, and only a result whose generation is still the
+    latest is handed to its callback on the Kivy main thread; anything older
+    is dropped, and superseded work that hasn't started yet is cancelled. A
+    submission with the same channel and key as a load already in flight
+    reuses that load instead of starting another.
+    """
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-load")
+        self._lock = threading.Lock()
+        self._generations = {}  # channel -> latest generation
+        self._inflight = {}  # (channel, key) -> Future
+
+    def submit(self, channel, key, fn, callback, error_callback=None):
+        """Run `fn()` on the pool and pass its result to `callback` if still current"""
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+            future = self._inflight.get((channel, key))
+            if future is None:
+                for (other_channel, other_key), other in list(self._inflight.items()):
+                    if other_channel == channel and other.cancel():
+                        del self._inflight[(other_channel, other_key)]
+                future = self._executor.submit(fn)
+                self._inflight[(channel, key)] = future
+                future.add_done_callback(lambda f: self._forget(channel, key, f))
+            else:
+                logger.debug(f"Coalesced {channel} load {key!r} with the one in flight")
+        future.add_done_callback(
+            lambda f: self._deliver(channel, generation, f, callback, error_callback)
+        )
+        return generation
+
+    def cancel(self, channel):
+        """Drop whatever the channel has in flight, e.g. when a screen is left"""
+        with self._lock:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+
+    def is_current(self, channel, generation):
+        with self._lock:
+            return self._generations.get(channel) == generation
+
+    def _forget(self, channel, key, future):
+        with self._lock:
+            if self._inflight.get((channel, key)) is future:
+                del self._inflight[(channel, key)]
+
+    def _deliver(self, channel, generation, future, callback, error_callback):
+        if future.cancelled():
+            return
+        error = future.exception()
+
+        def dispatch(dt):
+            # Checked again on the main thread: a newer load may have started meanwhile
+            if not self.is_current(channel, generation):
+                return
+            if error is None:
+                callback(future.result())
+            elif error_callback:
+                error_callback(error)
+            else:
+                logger.error(f"Background load on {channel} failed: {error}")
+
+        Clock.schedule_once(dispatch, 0)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,35 @@
+import importlib
+import threading
+
+
+class LazyImport:
+    """Stand-in for `from module import name` that imports on first use.
+
+    Calling it or reading an attribute imports the module and forwards to the
+    real object, so call sites keep their usual `MDDialog(...)` form while the
+    import cost moves from module load to the first interaction that needs it.
+    """
+
+    def __init__(self, module_name, name):
+        self._module_name = module_name
+        self._name = name
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    self._target = getattr(module, self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyImport {self._module_name}.{self._name} ({state})>"
@@ -0,0 +1,52 @@
+def keyed_diff(old, new, key):
+    """Minimal edits turning list `old` into `new`, matching items by `key`.
+
+    Returns a list of operations to apply in order to a copy of `old`:
+    ('remove', index), ('insert', index, item), ('move', from_index, to_index)
+    and ('update', index, item). Items whose key is unchanged and whose value
+    is equal produce no operation at all.
+    """
+    ops = []
+    current = list(old)
+    new_keys = {item[key] for item in new}
+
+    for index in range(len(current) - 1, -1, -1):
+        if current[index][key] not in new_keys:
+            ops.append(('remove', index))
+            del current[index]
+
+    positions = {item[key]: index for index, item in enumerate(current)}
+    for index, item in enumerate(new):
+        item_key = item[key]
+        if index < len(current) and current[index][key] == item_key:
+            if current[index] != item:
+                ops.append(('update', index, item))
+                current[index] = item
+            continue
+
+        source = positions.get(item_key)
+        if source is None:
+            ops.append(('insert', index, item))
+            current.insert(index, item)
+        else:
+            ops.append(('move', source, index))
+            current.insert(index, current.pop(source))
+            if current[index] != item:
+                ops.append(('update', index, item))
+                current[index] = item
+        # Everything from here on shifted; only the tail needs new positions
+        positions.update((current[i][key], i) for i in range(index, len(current)))
+    return ops
+
+
+def apply_diff(target, ops):
+    """Apply `keyed_diff` operations to a mutable sequence in place"""
+    for op in ops:
+        if op[0] == 'remove':
+            del target[op[1]]
+        elif op[0] == 'insert':
+            target.insert(op[1], op[2])
+        elif op[0] == 'move':
+            target.insert(op[2], target.pop(op[1]))
+        else:
+            target[op[1]] = op[2]
@@ -0,0 +1,12 @@
+"""KivyMD widgets only needed on interaction, imported the first time they are used.
+
+Screens and widgets import these names from here instead of from kivymd, so
+opening the app doesn't pay for the picker, menu, dialog and toast modules.
+Check what a cold start still imports with benchmarks/import_time_report.py.
+"""
+from utils.lazy_import import LazyImport
+
+MDDatePicker = LazyImport("kivymd.uix.pickers", "MDDatePicker")
+MDDropdownMenu = LazyImport("kivymd.uix.menu", "MDDropdownMenu")
+MDDialog = LazyImport("kivymd.uix.dialog", "MDDialog")
+toast = LazyImport("kivymd.toast", "toast")
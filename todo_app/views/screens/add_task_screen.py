@@ -1,12 +1,8 @@
 from kivymd.uix.screen import MDScreen
 from kivy.lang import Builder
-from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.app import App
-from kivymd.toast import toast
-from kivymd.uix.pickers import MDDatePicker
-from kivymd.uix.menu import MDDropdownMenu
-from kivymd.uix.dialog import MDDialog
+from views.lazy_widgets import MDDatePicker, MDDropdownMenu, MDDialog, toast
 from kivymd.uix.button import MDFlatButton
 from kivymd.uix.textfield import MDTextField
 import os
@@ -23,7 +19,6 @@ class AddTaskView(MDScreen):
         self._due_date = None
         self.menu = None
         self.date_dialog = None
-        Clock.schedule_once(self.setup_priority_menu)
 
     def on_pre_enter(self):
         self._clear_fields()
@@ -120,8 +115,10 @@ class AddTaskView(MDScreen):
             self.menu.dismiss()
 
     def show_priority_menu(self):
-        if self.menu:
-            self.menu.open()
+        # Built on first use so the menu module isn't imported with the screen
+        if not self.menu:
+            self.setup_priority_menu()
+        self.menu.open()
 
 
     def save_task(self):
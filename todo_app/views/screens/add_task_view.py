@@ -1,7 +1,6 @@
 from kivy.uix.screenmanager import Screen
 from kivy.lang import Builder
-from kivymd.uix.pickers import MDDatePicker
-from kivymd.uix.menu import MDDropdownMenu
+from views.lazy_widgets import MDDatePicker, MDDropdownMenu
 from functools import partial
 import os
 
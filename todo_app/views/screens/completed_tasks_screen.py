@@ -1,10 +1,7 @@
 from kivy.uix.screenmanager import Screen
-from kivy.properties import ObjectProperty, BooleanProperty, NumericProperty, ListProperty
+from kivy.properties import ObjectProperty, BooleanProperty, NumericProperty, StringProperty
 from kivy.clock import Clock
 from kivy.app import App
-from threading import Thread
-from kivymd.uix.label import MDLabel
-from views.widgets.task_item import TaskItemView
 from views.widgets.loading_widget import LoadingWidget  # <-- ADDED
 
 import logging
@@ -15,8 +12,9 @@ class CompletedTasksView(Screen):
     tasks_per_page = NumericProperty(10)
     current_page = NumericProperty(0)
     loading_more = BooleanProperty(False)
-    tasks = ListProperty([])
     is_loading = BooleanProperty(False)
+    next_cursor = StringProperty(None, allownone=True)
+    has_more = BooleanProperty(True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -28,97 +26,101 @@ class CompletedTasksView(Screen):
 
     def on_pre_enter(self):
         if self.controller:
+            self.controller.refresh_if_stale()
             self.reset_and_load_tasks()
 
     def reset_and_load_tasks(self):
         logger.info("Resetting and loading completed tasks...")
         self.current_page = 0
-        self.tasks = []
+        self.next_cursor = None
+        self.has_more = True
         self.clear_tasks()
         self.is_loading = True
         self.main_loading.show()  # <-- ADDED
-        Thread(target=self._load_tasks_thread).start()
+        self._submit_load()
 
-    def _load_tasks_thread(self):
+    def _submit_load(self):
+        """Fetch the page after `next_cursor` on the controller's shared loader"""
         if not self.controller:
-            Clock.schedule_once(lambda dt: self._set_loading_complete(), 0)
+            self._set_loading_complete()
             return
 
-        try:
-            all_tasks = self.controller.get_tasks_sync(completed=True)
-            start = self.current_page * self.tasks_per_page
-            end = start + self.tasks_per_page
-            paginated_tasks = all_tasks[start:end]
+        cursor = self.next_cursor
+        self.controller.loader.submit(
+            self.name, ('page', cursor),
+            lambda: self.controller.get_tasks_page(
+                completed=True, limit=self.tasks_per_page, cursor=cursor
+            ),
+            lambda result: self._on_tasks_loaded(*result, first_page=cursor is None),
+            self._on_load_failed
+        )
 
-            if not paginated_tasks:
-                Clock.schedule_once(lambda dt: self._set_loading_complete(), 0)
-                Clock.schedule_once(lambda dt: self.show_empty_message(), 0.5)
-                return
+    def refresh_tasks(self):
+        """Re-read the rows already shown and apply only what changed"""
+        if not self.controller or not hasattr(self.ids, 'task_list'):
+            return
 
-            Clock.schedule_once(lambda dt: self._on_tasks_loaded(paginated_tasks), 0)
+        limit = max(len(self.ids.task_list.data), self.tasks_per_page)
+        self.controller.loader.submit(
+            self.name, ('refresh', limit),
+            lambda: self.controller.get_tasks_page(completed=True, limit=limit),
+            lambda result: self._on_tasks_refreshed(*result),
+            self._on_load_failed
+        )
 
-        except Exception as e:
-            logger.error(f"[Completed] Error loading tasks: {e}", exc_info=True)
-            Clock.schedule_once(lambda dt: self._set_loading_complete(), 0)
+    def _on_tasks_refreshed(self, tasks, next_cursor):
+        self.on_tasks_data_loaded(tasks)
+        self.next_cursor = next_cursor
+        self.has_more = next_cursor is not None
+        if not tasks:
+            self.show_empty_message()
 
-    def _on_tasks_loaded(self, paginated_tasks):
-        for task in paginated_tasks:
-            widget = self.create_task_widget(task)
-            self.add_task_widget(widget)
+    def _on_load_failed(self, error):
+        logger.error(f"Error during task loading: {error}")
+        self._set_loading_complete()
+
+    def _on_tasks_loaded(self, page, next_cursor, first_page=False):
+        if hasattr(self.ids, 'task_list'):
+            self.ids.task_list.append_tasks(page)
+        self.next_cursor = next_cursor
+        self.has_more = next_cursor is not None
         self.current_page += 1
         self._set_loading_complete()
+        if not page and first_page:
+            self.show_empty_message()
 
     def _set_loading_complete(self, *args):
         self.loading_more = False
         self.is_loading = False
         self.main_loading.hide()  # <-- ADDED
 
-    def create_task_widget(self, task):
-        widget = TaskItemView(
-            task_id=task['id'],
-            title=task['title'],
-            description=task.get('description', ''),
-            due_date=task.get('due_date', 'No due date'),
-            priority=task.get('priority', 'low'),
-            completed=True,  # These are completed tasks
-            controller=self.controller
-        )
-        return widget
-
     def clear_tasks(self):
+        if hasattr(self.ids, 'empty_label'):
+            self.ids.empty_label.opacity = 0
         if hasattr(self.ids, 'task_list'):
-            self.ids.task_list.clear_widgets()
-
-    def add_task_widget(self, widget):
-        if hasattr(self.ids, 'task_list'):
-            self.ids.task_list.add_widget(widget)
+            self.ids.task_list.clear()
 
     def on_scroll_move(self, scroll_y):
-        if scroll_y <= 0.1 and not self.loading_more:
+        if scroll_y <= 0.1 and not self.loading_more and self.has_more:
             Clock.schedule_once(lambda dt: self.load_more_tasks(), 0.1)
 
     def load_more_tasks(self, *args):
-        if not self.loading_more:
+        if not self.loading_more and self.has_more:
             self.loading_more = True
             self.is_loading = True
-            Thread(target=self._load_tasks_thread).start()
+            self._submit_load()
 
     def on_tasks_data_loaded(self, task_list):
-        self.clear_tasks()
-        self.tasks = task_list
-        widgets = [self.create_task_widget(task) for task in task_list]
-        for widget in widgets:
-            self.add_task_widget(widget)
+        if hasattr(self.ids, 'empty_label'):
+            self.ids.empty_label.opacity = 0
+        if hasattr(self.ids, 'task_list'):
+            self.ids.task_list.update_tasks(task_list)
+        self._set_loading_complete()
 
     def show_empty_message(self):
-        if hasattr(self.ids, 'task_list'):
-            self.ids.task_list.add_widget(MDLabel(
-                text="No completed tasks yet.",
-                halign="center",
-                theme_text_color="Hint",
-                padding="12dp",
-                adaptive_height=True
-            ))
+        if hasattr(self.ids, 'empty_label'):
+            self.ids.empty_label.text = "No completed tasks yet."
+            self.ids.empty_label.opacity = 1
 
     def on_back_press(self):
         self.manager.current = 'home'
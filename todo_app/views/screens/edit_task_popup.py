@@ -1,7 +1,7 @@
 # edit_task_popup.py
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivy.properties import NumericProperty, StringProperty, ObjectProperty
-from kivymd.uix.dialog import MDDialog
+from views.lazy_widgets import MDDialog
 from kivymd.uix.button import MDFlatButton, MDRaisedButton
 from kivy.clock import Clock
 
@@ -1,7 +1,6 @@
 from kivymd.uix.screen import MDScreen
-from kivymd.toast import toast
+from views.lazy_widgets import MDDatePicker, MDDropdownMenu, toast
 from kivy.properties import ObjectProperty
-from kivymd.uix.menu import MDDropdownMenu
 
 class EditTaskScreen(MDScreen):
     controller = ObjectProperty()
@@ -74,7 +73,6 @@ class EditTaskScreen(MDScreen):
         }.get(priority, (0.5, 0.5, 0.5, 1))  # Default gray
 
     def open_date_picker(self):
-        from kivymd.uix.pickers import MDDatePicker
         date_picker = MDDatePicker()
         date_picker.bind(on_save=self.on_date_chosen)
         date_picker.open()
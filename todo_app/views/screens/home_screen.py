@@ -1,12 +1,9 @@
 # Updated home_screen.py
 from kivy.uix.screenmanager import Screen
-from kivy.properties import ObjectProperty, BooleanProperty, NumericProperty, ListProperty
+from kivy.properties import ObjectProperty, BooleanProperty, NumericProperty, StringProperty
 from kivy.clock import Clock
 from kivy.app import App
-from threading import Thread
 import logging
-from kivymd.uix.label import MDLabel
-from views.widgets.task_item import TaskItemView
 from views.widgets.loading_widget import LoadingWidget, PulsingDotIndicator
 
 # Setup logger
@@ -19,8 +16,9 @@ class HomeView(Screen):
     tasks_per_page = NumericProperty(10)
     current_page = NumericProperty(0)
     loading_more = BooleanProperty(False)
-    tasks = ListProperty([])
     is_loading = BooleanProperty(False)
+    next_cursor = StringProperty(None, allownone=True)
+    has_more = BooleanProperty(True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -64,12 +62,8 @@ class HomeView(Screen):
         super().on_pre_enter()
         if self.controller:
             try:
-                if not hasattr(self.controller, 'prevent_double_loading') or not self.controller.prevent_double_loading:
-                    self.controller.invalidate_cache()
-                    Clock.schedule_once(lambda dt: self.reset_and_load_tasks(), 0.2)
-                else:
-                    self.controller.prevent_double_loading = False
-                    Clock.schedule_once(lambda dt: self.reset_and_load_tasks(), 0.2)
+                self.controller.refresh_if_stale()
+                Clock.schedule_once(lambda dt: self.reset_and_load_tasks(), 0.2)
             except Exception as e:
                 logger.error(f"Error in on_pre_enter: {e}")
 
@@ -99,43 +93,72 @@ class HomeView(Screen):
             return
             
         self.current_page = 0
-        self.tasks = []
+        self.next_cursor = None
+        self.has_more = True
         self.clear_tasks()
         self.is_loading = True
         
         # Show main loading indicator
         self.main_loading.show()
         
-        Thread(target=self._load_tasks_thread).start()
+        self._submit_load()
 
-    def _load_tasks_thread(self):
-        """Load only uncompleted tasks in a separate thread"""
+    def _submit_load(self):
+        """Fetch the page after `next_cursor` on the controller's shared loader"""
         if not self.controller:
-            Clock.schedule_once(lambda dt: self._set_loading_complete(), 0)
+            self._set_loading_complete()
             return
 
-        try:
-            all_tasks = self.controller.get_tasks_sync(completed=False)
-            start = self.current_page * self.tasks_per_page
-            end = start + self.tasks_per_page
-            paginated_tasks = all_tasks[start:end]
-
-            if not paginated_tasks:
-                Clock.schedule_once(lambda dt: self._set_loading_complete(), 0)
-                Clock.schedule_once(lambda dt: self.show_empty_message(), 0.5)
-                return
+        cursor = self.next_cursor
+        self.controller.loader.submit(
+            self.name, ('page', cursor),
+            lambda: self.controller.get_tasks_page(
+                completed=False, limit=self.tasks_per_page, cursor=cursor
+            ),
+            lambda result: self._on_tasks_loaded(*result, first_page=cursor is None),
+            self._on_load_failed
+        )
 
-            Clock.schedule_once(lambda dt: self.on_tasks_data_loaded(paginated_tasks), 0)
+    def refresh_tasks(self):
+        """Re-read the rows already shown and apply only what changed"""
+        if not self.controller or not hasattr(self.ids, 'task_list'):
+            return
 
-        except Exception as e:
-            logger.error(f"[THREAD] Error during task loading: {e}", exc_info=True)
-            Clock.schedule_once(lambda dt: self._set_loading_complete(), 0)
+        limit = max(len(self.ids.task_list.data), self.tasks_per_page)
+        self.controller.loader.submit(
+            self.name, ('refresh', limit),
+            lambda: self.controller.get_tasks_page(completed=False, limit=limit),
+            lambda result: self._on_tasks_refreshed(*result),
+            self._on_load_failed
+        )
+
+    def _on_tasks_refreshed(self, tasks, next_cursor):
+        self.on_tasks_data_loaded(tasks)
+        self.next_cursor = next_cursor
+        self.has_more = next_cursor is not None
+        if not tasks:
+            self.show_empty_message()
+
+    def _on_load_failed(self, error):
+        logger.error(f"Error during task loading: {error}")
+        self._set_loading_complete()
+
+    def _on_tasks_loaded(self, page, next_cursor, first_page=False):
+        """Append one page fetched by _submit_load"""
+        if hasattr(self.ids, 'task_list'):
+            self.ids.task_list.append_tasks(page)
+        self.next_cursor = next_cursor
+        self.has_more = next_cursor is not None
+        self.current_page += 1
+        self._set_loading_complete()
+        if not page and first_page:
+            self.show_empty_message()
 
     def on_tasks_data_loaded(self, task_list):
-        self.clear_tasks()
-        for task in task_list:
-            widget = self.create_task_widget(task)
-            self.add_task_widget(widget)
+        if hasattr(self.ids, 'empty_label'):
+            self.ids.empty_label.opacity = 0
+        if hasattr(self.ids, 'task_list'):
+            self.ids.task_list.update_tasks(task_list)
         self._set_loading_complete()
 
     def _set_loading_complete(self, *args):
@@ -146,64 +169,34 @@ class HomeView(Screen):
         self.main_loading.hide()
         self.more_loading.hide()
 
-    def create_task_widget(self, task):
-        widget = TaskItemView(
-            task_id=task['id'],
-            title=task['title'],
-            description=task.get('description', ''),
-            due_date=task.get('due_date', 'No due date'),
-            priority=task.get('priority', 'low'),
-            completed=False,
-            controller=self.controller
-        )
-        widget.bind(completed=self.on_task_completion_changed)
-        return widget
-
-    def on_task_completion_changed(self, instance, value):
-        if value:
-            Clock.schedule_once(lambda dt: self.reset_and_load_tasks(), 0.3)
-            
-            app = App.get_running_app()
-            if hasattr(app, 'task_controller') and app.task_controller.completed_tasks_screen:
-                Clock.schedule_once(lambda dt: app.task_controller.load_completed_tasks(), 0.5)
-
     def clear_tasks(self):
+        if hasattr(self.ids, 'empty_label'):
+            self.ids.empty_label.opacity = 0
         if hasattr(self.ids, 'task_list'):
             logger.debug("Clearing tasks container")
-            self.ids.task_list.clear_widgets()
-        else:
-            logger.warning("task_list not found in ids")
-
-    def add_task_widget(self, task_widget):
-        if hasattr(self.ids, 'task_list'):
-            self.ids.task_list.add_widget(task_widget)
+            self.ids.task_list.clear()
         else:
             logger.warning("task_list not found in ids")
 
     def load_more_tasks(self, *args):
-        if not self.loading_more:
+        if not self.loading_more and self.has_more:
             self.loading_more = True
             self.is_loading = True
             
             # Show minimal loading indicator for "load more"
             self.more_loading.show()
             
-            Thread(target=self._load_tasks_thread).start()
+            self._submit_load()
 
     def on_scroll_move(self, scroll_y):
-        if scroll_y <= 0.1 and not self.loading_more:
+        if scroll_y <= 0.1 and not self.loading_more and self.has_more:
             logger.debug("Near bottom of scroll, loading more tasks")
             Clock.schedule_once(lambda dt: self.load_more_tasks(), 0.1)
 
     def show_empty_message(self):
-        if hasattr(self.ids, 'task_list'):
-            self.ids.task_list.add_widget(MDLabel(
-                text="No tasks to do! Create a new task to get started.",
-                halign="center",
-                theme_text_color="Hint",
-                padding="12dp",
-                adaptive_height=True
-            ))
+        if hasattr(self.ids, 'empty_label'):
+            self.ids.empty_label.text = "No tasks to do! Create a new task to get started."
+            self.ids.empty_label.opacity = 1
 
     # ... rest of your existing methods remain the same ...
     def toggle_sidebar(self):
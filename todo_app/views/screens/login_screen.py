@@ -1,7 +1,7 @@
 import logging
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.button import MDRaisedButton
-from kivymd.uix.dialog import MDDialog
+from views.lazy_widgets import MDDialog
 from kivy.properties import StringProperty, ObjectProperty
 
 # Setup logger for this module
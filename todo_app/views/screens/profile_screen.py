@@ -2,7 +2,7 @@ from kivy.uix.screenmanager import Screen
 from kivy.properties import StringProperty, ObjectProperty
 from kivy.app import App
 from kivy.storage.jsonstore import JsonStore
-from kivymd.uix.dialog import MDDialog
+from views.lazy_widgets import MDDialog
 from kivymd.uix.button import MDFlatButton
 from kivymd.uix.spinner import MDSpinner
 from kivy.metrics import dp
@@ -18,6 +18,9 @@ class ProfileScreen(Screen):
     completed_tasks = StringProperty("0")
     pending_tasks = StringProperty("0")
     total_tasks = StringProperty("0")
+    overdue_tasks = StringProperty("-")
+    # Pending tasks per priority, e.g. "Low 3  Medium 1  High 0  Urgent 2"
+    priority_breakdown = StringProperty("")
     profile_image = StringProperty("assets/images/default_profile.png")
     task_completion_rate = StringProperty("0%")
     model = ObjectProperty(None)
@@ -33,31 +36,18 @@ class ProfileScreen(Screen):
     def on_enter(self, *args):
         app = App.get_running_app()
         if app and app.current_user:
-            self.load_user_stats()
             self.show_loading()
             try:
                 user = app.current_user
                 self.username = user.username
                 self.email = user.email
                 self.join_date = self._format_date(user.created_at)
-
-
-                if 'completion_rate_label' in self.ids:
-                    self.ids.completion_rate_label.text = f"Task Completion Rate: {self.task_completion_rate}"
-
-                if 'completion_bar' in self.ids:
-                    try:
-                        rate = int(self.task_completion_rate.strip('%'))
-                        self.ids.completion_bar.value = rate
-                    except ValueError:
-                        self.ids.completion_bar.value = 0
-
-                
             except Exception as e:
                 logger.error(f"Failed to load user data: {e}")
                 # self.show_error_dialog("Could not load user profile.")
             finally:
                 self.hide_loading()
+            self.load_user_stats()
 
     def _format_date(self, date_str):
         if not date_str:
@@ -72,36 +62,54 @@ class ProfileScreen(Screen):
 
 
     def load_user_stats(self):
+        """Show the cached counts at once, then the server's stats when they arrive.
+
+        The server payload adds the overdue count and the per-priority
+        breakdown; it is fetched on the app's asyncio loop so entering the
+        screen never waits on the network.
+        """
         app = App.get_running_app()
         try:
             if not hasattr(app, 'task_controller'):
                 raise AttributeError("App has no task_controller.")
-            
-            tasks = app.task_controller.get_all_tasks()
-            print("screen, loading user stats...",tasks)
-
-            total = len(tasks)
-            completed = sum(1 for t in tasks if t.get("completed"))
-            pending = total - completed
-            completion_rate = f"{(completed / total) * 100:.0f}%" if total > 0 else "0%"
-
-            self.total_tasks = str(total)
-            self.completed_tasks = str(completed)
-            self.pending_tasks = str(pending)
-            self.task_completion_rate = completion_rate
-
-
-            self.ids.total_tasks_label.text = self.total_tasks
-            self.ids.completed_tasks_label.text = self.completed_tasks
-            self.ids.pending_tasks_label.text = self.pending_tasks
-            self.ids.completion_rate_label.text = f"Task Completion Rate: {self.task_completion_rate}"
-
-            
+            self._show_stats(app.task_controller.get_task_counts())
         except Exception as e:
             logger.error(f"Failed to load task stats: {e}")
             self.total_tasks = self.completed_tasks = self.pending_tasks = "0"
             self.task_completion_rate = "0%"
 
+        user_id = app.current_user.id
+        app.async_bridge.submit(
+            app.async_api.get_user_stats(user_id),
+            callback=lambda stats: self._on_stats_loaded(user_id, stats),
+        )
+
+    def _on_stats_loaded(self, user_id, stats):
+        app = App.get_running_app()
+        if not stats or not app.current_user or app.current_user.id != user_id:
+            return
+        self._show_stats(stats)
+
+    def _show_stats(self, stats):
+        total = stats['total']
+        completed = stats['completed']
+        self.total_tasks = str(total)
+        self.completed_tasks = str(completed)
+        self.pending_tasks = str(stats['pending'])
+        self.task_completion_rate = f"{(completed / total) * 100:.0f}%" if total > 0 else "0%"
+        if 'overdue' in stats:
+            self.overdue_tasks = str(stats['overdue'])
+        if 'by_priority' in stats:
+            self.priority_breakdown = "  ".join(
+                f"{priority} {counts['pending']}" for priority, counts in stats['by_priority'].items()
+            )
+
+        self.ids.total_tasks_label.text = self.total_tasks
+        self.ids.completed_tasks_label.text = self.completed_tasks
+        self.ids.pending_tasks_label.text = self.pending_tasks
+        self.ids.completion_rate_label.text = f"Task Completion Rate: {self.task_completion_rate}"
+        self.ids.completion_bar.value = int(self.task_completion_rate.strip('%'))
+
     def show_loading(self):
         if not self.spinner:
             self.spinner = MDSpinner(
@@ -1,5 +1,5 @@
 from kivymd.uix.screen import MDScreen
-from kivymd.uix.dialog import MDDialog
+from views.lazy_widgets import MDDialog
 from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.textfield import MDTextField
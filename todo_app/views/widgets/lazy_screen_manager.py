@@ -0,0 +1,50 @@
+from kivy.uix.screenmanager import ScreenManager
+from kivy.lang import Builder
+import importlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+KV_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', 'kv')
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager that imports, loads KV for and builds each screen on first use.
+
+    Screens are registered by name with a "module:Class" path, the KV files
+    their rules live in and an optional setup callback that wires controllers.
+    Nothing is imported or instantiated until the screen is navigated to or
+    looked up with `get_screen`, so startup only pays for the first screen.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._registry = {}
+
+    def register(self, name, class_path, kv_files=(), setup=None):
+        self._registry[name] = (class_path, kv_files, setup)
+
+    def has_screen(self, name):
+        return name in self._registry or super().has_screen(name)
+
+    def get_screen(self, name):
+        if not super().has_screen(name) and name in self._registry:
+            self._build(name)
+        return super().get_screen(name)
+
+    def _build(self, name):
+        class_path, kv_files, setup = self._registry[name]
+        for kv_file in kv_files:
+            kv_path = os.path.abspath(os.path.join(KV_DIRECTORY, kv_file))
+            if kv_path not in Builder.files:
+                Builder.load_file(kv_path)
+
+        module_name, class_name = class_path.split(':')
+        screen_class = getattr(importlib.import_module(module_name), class_name)
+        screen = screen_class(name=name)
+        self.add_widget(screen)
+        logger.info(f"Built screen '{name}' on first use")
+        if setup:
+            setup(screen)
+        return screen
@@ -0,0 +1,64 @@
+from kivy.uix.recycleview import RecycleView
+from kivy.properties import ObjectProperty
+from views.widgets.task_item import TaskItemView
+from utils.list_diff import keyed_diff, apply_diff
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskListView(RecycleView):
+    """Virtualized task list: only the rows on screen exist as TaskItemView widgets.
+
+    Screens hand it task dicts; each becomes one entry in `data`, and the
+    RecycleView rebinds a small pool of rows to whichever entries are visible.
+    """
+    controller = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.viewclass = TaskItemView
+
+    def _row(self, task):
+        return {
+            'task_id': task['id'],
+            'title': task.get('title') or '',
+            'description': task.get('description') or '',
+            'due_date': task.get('due_date') or '',
+            'priority': task.get('priority') or 'Low',
+            'completed': bool(task.get('completed')),
+            'controller': self.controller,
+        }
+
+    @property
+    def task_ids(self):
+        return [row['task_id'] for row in self.data]
+
+    def set_tasks(self, tasks):
+        self.data = [self._row(task) for task in tasks]
+
+    def update_tasks(self, tasks):
+        """Reconcile the rows with `tasks` by id, touching only rows that changed"""
+        ops = keyed_diff(self.data, [self._row(task) for task in tasks], 'task_id')
+        if len(ops) > len(self.data) // 2:
+            # Mostly new content: one reset is cheaper than many shifting edits
+            self.set_tasks(tasks)
+        else:
+            apply_diff(self.data, ops)
+        logger.debug(f"Task list reconciled with {len(ops)} edits")
+        return ops
+
+    def append_tasks(self, tasks):
+        self.data.extend(self._row(task) for task in tasks)
+
+    def remove_task(self, task_id):
+        for index, row in enumerate(self.data):
+            if row['task_id'] == task_id:
+                # Only the rows from here down are rebound
+                del self.data[index]
+                return True
+        return False
+
+    def clear(self):
+        self.data = []
+        self.scroll_y = 1